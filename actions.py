@@ -1,15 +1,36 @@
 from typing import Dict, Callable, Any
-from nlp import NLPProcessor
-from system_actions import SystemController
-from web_search import WebSearcher
+from datetime import datetime
+from nlp import NLPProcessor, HELP_TEXT
+from executor import ActionExecutor
+from prediction import Speculator, TransitionModel
+from config import PREDICTION_ENABLED
+from tracing import get_tracer
 import random
-import psutil
+import threading
+
+# Local, deterministic intents answered inline on the dispatch thread,
+# without a trip through the worker pool
+FAST_INTENTS = {'time', 'date', 'greeting', 'help', 'weather', 'stop_listening', 'volume_control'}
 
 class ActionHandler:
     def __init__(self):
         self.nlp = NLPProcessor()
-        self.system = SystemController()
-        self.web_searcher = WebSearcher()
+        # Controllers pull in heavy dependencies, so they are built on first use
+        self._system = None
+        self._web_searcher = None
+        self._init_lock = threading.Lock()
+        self.executor = ActionExecutor()
+        self.fast_intents = set(FAST_INTENTS)
+        
+        # Warmers for the commands that tend to follow each other
+        self.speculator = Speculator(TransitionModel(), {
+            'wikipedia': self._warm_wikipedia,
+            'open_app': self._warm_open_app,
+            'spotify_control': self._warm_media,
+            'volume_control': self._warm_volume,
+            'web_search': self._warm_search,
+            'general_query': self._warm_search
+        }) if PREDICTION_ENABLED else None
         
         self.action_registry = {
             'web_search': self._handle_web_search,
@@ -38,9 +59,35 @@ class ActionHandler:
             "Hello! I'm here and ready to assist."
         ]
     
+    @property
+    def system(self):
+        # Speculative warmers may get here first from another thread
+        with self._init_lock:
+            if self._system is None:
+                from system_actions import SystemController
+                self._system = SystemController()
+        return self._system
+    
+    @property
+    def web_searcher(self):
+        with self._init_lock:
+            if self._web_searcher is None:
+                from web_search import WebSearcher
+                self._web_searcher = WebSearcher()
+        return self._web_searcher
+    
+    def cache_stats(self) -> Dict:
+        # No searches yet means no cache worth opening just to report on
+        return self._web_searcher.cache_stats() if self._web_searcher is not None else {}
+    
+    def transport_stats(self) -> Dict:
+        return self._web_searcher.transport_stats() if self._web_searcher is not None else {}
+    
     def process_command(self, text: str) -> Dict:
         try:
-            intent, entities = self.nlp.extract_intent(text)
+            with get_tracer().span('intent') as span:
+                intent, entities = self.nlp.extract_intent(text)
+                span.set(intent=intent)
             
             if self.nlp.requires_confirmation(intent, entities):
                 return {
@@ -53,7 +100,15 @@ class ActionHandler:
                 }
             
             if intent in self.action_registry:
-                return self.action_registry[intent](entities)
+                if self.speculator is None:
+                    return self.execute(intent, entities)
+                
+                self.speculator.command(intent, entities)
+                result = self.execute(intent, entities)
+                if self.speculator.warms_after(intent):
+                    # The next command is being captured meanwhile; get ready for the likely one
+                    self.speculator.speculate(intent, entities)
+                return result
             else:
                 return {
                     'success': False,
@@ -67,8 +122,61 @@ class ActionHandler:
                 'summary': "I encountered an error processing your command."
             }
     
+    def execute(self, intent: str, entities: Dict) -> Dict:
+        """Run a registered intent's handler, inline if it is cheap and local, else with its deadline"""
+        handler = self.action_registry[intent]
+        fast = intent in self.fast_intents and self._is_fast(intent)
+        with get_tracer().span('handler', intent=intent, inline=fast) as span:
+            result = handler(entities) if fast else self.executor.run(intent, handler, entities)
+            span.set(success=bool(result.get('success')))
+            return result
+    
+    def _is_fast(self, intent: str) -> bool:
+        if intent == 'volume_control':
+            # Only once the native interface is open; the first command may load it or fall back to a subprocess
+            return self._system is not None and self._system.volume_is_native
+        return True
+    
+    def cancel(self):
+        """Stop waiting on whatever command is still running"""
+        self.executor.cancel()
+    
+    def shutdown(self):
+        self.executor.shutdown()
+        if self.speculator is not None:
+            # Let a save already under way finish before writing the final history
+            self.speculator.wait_idle(1.0)
+            self.speculator.stop()
+            self.speculator.model.save()
+    
+    def _warm_wikipedia(self, entities: Dict):
+        # "search for X" is often followed by "wikipedia X"; put X's article in the cache
+        query = entities.get('query')
+        if not query or self.web_searcher.cache is None:
+            return False
+        self.web_searcher.wikipedia.lookup(query, sentences=3)
+        return query.lower().strip()
+    
+    def _warm_open_app(self, entities: Dict):
+        app_name = self.speculator.model.usual_subject('open_app')
+        if not app_name or not self.system.prepare_application(app_name):
+            return False
+        return app_name
+    
+    def _warm_media(self, entities: Dict):
+        return None if self.system.prepare_media() else False
+    
+    def _warm_volume(self, entities: Dict):
+        return None if self.system.prepare_volume() else False
+    
+    def _warm_search(self, entities: Dict):
+        self.web_searcher.transport.warmup()
+        return None
+    
     def register_action(self, intent: str, handler: Callable[[Dict], Dict]):
         self.action_registry[intent] = handler
+        # Nothing is known about a custom handler's cost
+        self.fast_intents.discard(intent)
     
     def _handle_web_search(self, entities: Dict) -> Dict:
         query = entities.get('query', '')
@@ -127,16 +235,12 @@ class ActionHandler:
         return self.system.control_volume(action, level)
     
     def _handle_time(self, entities: Dict) -> Dict:
-        result = self.system.get_current_time()
-        if result['success']:
-            result['summary'] = f"The current time is {result['time']}."
-        return result
+        current_time = datetime.now().strftime("%I:%M %p")
+        return {'success': True, 'time': current_time, 'summary': f"The current time is {current_time}."}
     
     def _handle_date(self, entities: Dict) -> Dict:
-        result = self.system.get_current_time()
-        if result['success']:
-            result['summary'] = f"Today is {result['date']}."
-        return result
+        current_date = datetime.now().strftime("%A, %B %d, %Y")
+        return {'success': True, 'date': current_date, 'summary': f"Today is {current_date}."}
     
     def _handle_weather(self, entities: Dict) -> Dict:
         location = entities.get('location', 'your area')
@@ -148,7 +252,7 @@ class ActionHandler:
     def _handle_help(self, entities: Dict) -> Dict:
         return {
             'success': True,
-            'summary': self.nlp.get_help_text()
+            'summary': HELP_TEXT
         }
     
     def _handle_greeting(self, entities: Dict) -> Dict:
@@ -191,36 +295,7 @@ class ActionHandler:
         return self.list_running_processes()
     
     def list_running_processes(self) -> Dict:
-        try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    processes.append({
-                        'name': proc.info['name'],
-                        'pid': proc.info['pid'],
-                        'exe': proc.info['exe'] if proc.info['exe'] else 'N/A'
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            processes.sort(key=lambda x: x['name'].lower())
-            
-            process_names = [p['name'] for p in processes]
-            summary = f"Found {len(processes)} running processes. Some common ones: " + \
-                     ", ".join(process_names[:10]) + "..."
-            
-            return {
-                'success': True,
-                'processes': processes,
-                'summary': summary
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'summary': "Couldn't list running processes."
-            }
+        return self.system.list_running_processes()
 
 
 def example_custom_action(entities: Dict) -> Dict:
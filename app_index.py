@@ -0,0 +1,253 @@
+import difflib
+import os
+import re
+import shlex
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from config import APP_INDEX_REFRESH, APP_MATCH_CUTOFF, APP_BLOCKED_EXECUTABLES
+
+class AppEntry:
+    def __init__(self, name: str, command: List[str], source: str, shell: bool = False):
+        self.name = name
+        self.command = command
+        self.source = source
+        self.shell = shell
+
+    def __repr__(self):
+        return f"AppEntry({self.name!r}, {self.command!r}, source={self.source!r})"
+
+def normalize(name: str) -> str:
+    return re.sub(r'\s+', ' ', name.lower().replace('-', ' ').replace('_', ' ')).strip()
+
+def desktop_dirs() -> List[str]:
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    return [os.path.join(d, 'applications') for d in [data_home] + data_dirs.split(os.pathsep) if d]
+
+def parse_desktop_file(path: str) -> Optional[Dict[str, str]]:
+    """Read the [Desktop Entry] group of a .desktop file, or None if it is not a visible application"""
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('['):
+                    if in_entry:
+                        break
+                    in_entry = line == '[Desktop Entry]'
+                elif in_entry and '=' in line and not line.startswith('#'):
+                    key, value = line.split('=', 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+
+    if fields.get('Type', 'Application') != 'Application' or 'Exec' not in fields:
+        return None
+    if fields.get('NoDisplay') == 'true' or fields.get('Hidden') == 'true':
+        return None
+    return fields
+
+def exec_command(exec_line: str) -> List[str]:
+    # Field codes such as %U and %f are filled in by launchers with files to open; we pass none
+    try:
+        args = shlex.split(exec_line)
+    except ValueError:
+        return []
+    return [arg.replace('%%', '%') for arg in args if not re.fullmatch(r'%[a-zA-Z]', arg)]
+
+class AppIndex:
+    """Spoken name to launch command, built from PATH and XDG .desktop files.
+
+    Each directory is rescanned only when its mtime changes, and unchanged
+    .desktop files keep their parsed entry. Aliases win over .desktop names,
+    which win over bare executables. Bare executables only match by exact
+    name; anything else goes through a cached fuzzy match against aliases
+    and .desktop names, so a misheard phrase never lands on some binary in
+    /usr/sbin. Power-control executables are never resolved.
+    """
+
+    # difflib only scores the names sharing the most trigrams with the query
+    FUZZY_CANDIDATES = 50
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, path_dirs: Optional[List[str]] = None,
+                 application_dirs: Optional[List[str]] = None, windows: bool = os.name == 'nt',
+                 min_refresh_interval: float = APP_INDEX_REFRESH, cutoff: float = APP_MATCH_CUTOFF):
+        self.aliases = {normalize(name): command for name, command in (aliases or {}).items()}
+        self.path_dirs = path_dirs if path_dirs is not None else \
+            [d for d in os.environ.get('PATH', '').split(os.pathsep) if d]
+        self.application_dirs = application_dirs if application_dirs is not None else \
+            ([] if windows else desktop_dirs())
+        self.windows = windows
+        self.min_refresh_interval = min_refresh_interval
+        self.cutoff = cutoff
+        self.blocked = {name.lower() for name in APP_BLOCKED_EXECUTABLES}
+
+        self._dir_mtimes: Dict[str, Optional[float]] = {}
+        self._dir_entries: Dict[str, Dict[str, AppEntry]] = {}
+        self._desktop_files: Dict[str, tuple] = {}
+        self.executables: Dict[str, str] = {}
+        self._names: Dict[str, AppEntry] = {}
+        self._keys: List[str] = []
+        self._trigrams: Dict[str, List[str]] = {}
+        self._fuzzy_cache: Dict[str, Optional[str]] = {}
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _mtime(self, directory: str) -> Optional[float]:
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return None
+
+    def _scan_path_dir(self, directory: str) -> Dict[str, AppEntry]:
+        extensions = [ext.lower() for ext in os.environ.get('PATHEXT', '.EXE;.BAT;.CMD').split(';')] \
+            if self.windows else None
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if not item.is_file():
+                            continue
+                        if extensions is not None:
+                            stem, ext = os.path.splitext(item.name)
+                            if ext.lower() not in extensions:
+                                continue
+                        elif not item.stat().st_mode & 0o111:
+                            continue
+                        else:
+                            stem = item.name
+                    except OSError:
+                        continue
+                    entries[stem.lower()] = AppEntry(stem, [item.path], 'path')
+        except OSError:
+            pass
+        return entries
+
+    def _scan_application_dir(self, directory: str) -> Dict[str, AppEntry]:
+        entries = {}
+        try:
+            paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.desktop')]
+        except OSError:
+            return entries
+
+        for path in paths:
+            mtime = self._mtime(path)
+            cached = self._desktop_files.get(path)
+            if cached is not None and cached[0] == mtime:
+                fields = cached[1]
+            else:
+                fields = parse_desktop_file(path)
+                self._desktop_files[path] = (mtime, fields)
+            if fields is None:
+                continue
+
+            command = exec_command(fields['Exec'])
+            if not command:
+                continue
+            entry = AppEntry(fields.get('Name', command[0]), command, 'desktop')
+
+            file_id = os.path.basename(path)[:-len('.desktop')]
+            executable = os.path.basename(command[0])
+            for name in (fields.get('Name'), fields.get('GenericName'), file_id, file_id.split('.')[-1],
+                         executable if executable not in ('env', 'flatpak', 'sh') else None):
+                if name:
+                    entries.setdefault(normalize(name), entry)
+        return entries
+
+    def refresh(self, force: bool = False):
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.min_refresh_interval:
+                return
+
+            changed = False
+            for directory, scan in [(d, self._scan_path_dir) for d in self.path_dirs] + \
+                                   [(d, self._scan_application_dir) for d in self.application_dirs]:
+                mtime = self._mtime(directory)
+                if directory in self._dir_mtimes and self._dir_mtimes[directory] == mtime:
+                    continue
+                self._dir_mtimes[directory] = mtime
+                self._dir_entries[directory] = scan(directory) if mtime is not None else {}
+                changed = True
+
+            if changed:
+                self._rebuild()
+            self._refreshed_at = time.monotonic()
+
+    def _rebuild(self):
+        executables, names = {}, {}
+        # Earlier PATH entries shadow later ones, like the shell
+        for directory in reversed(self.path_dirs):
+            for key, entry in self._dir_entries.get(directory, {}).items():
+                executables[key] = entry.command[0]
+                names[normalize(key)] = entry
+        for directory in reversed(self.application_dirs):
+            names.update(self._dir_entries.get(directory, {}))
+
+        self.executables = executables
+        self._names = names
+        self._keys = [key for key, entry in names.items() if entry.source != 'path'] + list(self.aliases)
+        self._trigrams: Dict[str, List[str]] = {}
+        for key in self._keys:
+            for gram in self._grams(key):
+                self._trigrams.setdefault(gram, []).append(key)
+        self._fuzzy_cache = {}
+
+    def _grams(self, key: str) -> set:
+        padded = f" {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _candidates(self, key: str) -> List[str]:
+        counts = Counter()
+        for gram in self._grams(key):
+            counts.update(self._trigrams.get(gram, ()))
+        return [candidate for candidate, _ in counts.most_common(self.FUZZY_CANDIDATES)]
+
+    def _alias_entry(self, key: str) -> Optional[AppEntry]:
+        command = self.aliases.get(key)
+        if command is None:
+            return None
+        if self.windows:
+            # 'start <app>' is resolved by the shell through App Paths, which PATH does not cover
+            return AppEntry(key, [command], 'alias', shell=True)
+
+        argv = shlex.split(command)
+        executable = argv[0] if os.path.isabs(argv[0]) else self.executables.get(argv[0].lower())
+        if executable is None:
+            return None
+        return AppEntry(key, [executable] + argv[1:], 'alias')
+
+    def _is_blocked(self, entry: AppEntry) -> bool:
+        programs = entry.command[0].split() if entry.shell else entry.command[:1]
+        return any(os.path.splitext(os.path.basename(program))[0].lower() in self.blocked
+                   for program in programs)
+
+    def _exact(self, key: str) -> Optional[AppEntry]:
+        entry = self._alias_entry(key) or self._names.get(key)
+        if entry is None or self._is_blocked(entry):
+            return None
+        return entry
+
+    def resolve(self, name: str) -> Optional[AppEntry]:
+        """Best launch entry for a spoken application name, or None if nothing plausible is installed"""
+        self.refresh()
+        key = normalize(name)
+        if not key:
+            return None
+
+        with self._lock:
+            entry = self._exact(key)
+            if entry is not None:
+                return entry
+
+            if key not in self._fuzzy_cache:
+                matches = difflib.get_close_matches(key, self._candidates(key), n=3, cutoff=self.cutoff)
+                self._fuzzy_cache[key] = next((m for m in matches if self._exact(m) is not None), None)
+            match = self._fuzzy_cache[key]
+            return self._exact(match) if match is not None else None
+
+    def __len__(self) -> int:
+        return len(self._names)
@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Optional, Tuple
+from config import ASSISTANT_NAME, VOLUME_STEP, AUDIO_SINK_CACHE_SECONDS
+
+class PulseVolumeController:
+    """Volume control through one persistent PulseAudio connection.
+
+    Works with PulseAudio and with PipeWire's pulse server. The default sink
+    is cached for AUDIO_SINK_CACHE_SECONDS and looked up again when the
+    cached one disappears, so a change costs one or two in-process round
+    trips instead of spawning pactl.
+    """
+
+    def __init__(self, server: Optional[str] = None, client=None,
+                 sink_cache_seconds: float = AUDIO_SINK_CACHE_SECONDS):
+        self.server = server
+        self.sink_cache_seconds = sink_cache_seconds
+        self._pulse = client
+        self._sink_index: Optional[int] = None
+        self._sink_resolved_at = 0.0
+        self._lock = threading.Lock()
+
+    def _client(self):
+        if self._pulse is None:
+            import pulsectl
+
+            self._pulse = pulsectl.Pulse(f"{ASSISTANT_NAME} volume", server=self.server)
+        return self._pulse
+
+    def _default_sink(self):
+        pulse = self._client()
+        if self._sink_index is not None and time.monotonic() - self._sink_resolved_at < self.sink_cache_seconds:
+            try:
+                return pulse.sink_info(self._sink_index)
+            except Exception:
+                # The cached sink went away (device unplugged, server restart); look it up again
+                self._sink_index = None
+
+        sink = pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+        self._sink_index = sink.index
+        self._sink_resolved_at = time.monotonic()
+        return sink
+
+    def _run(self, operation):
+        """Run operation(pulse, sink), reconnecting once if the connection has dropped"""
+        with self._lock:
+            try:
+                return operation(self._client(), self._default_sink())
+            except Exception:
+                if self._pulse is None or getattr(self._pulse, 'connected', True):
+                    raise
+                self.close()
+                return operation(self._client(), self._default_sink())
+
+    def close(self):
+        if self._pulse is not None and hasattr(self._pulse, 'close'):
+            self._pulse.close()
+        self._pulse = None
+        self._sink_index = None
+
+    def get_volume(self) -> Tuple[int, bool]:
+        """Current default-sink volume in percent and whether it is muted"""
+        return self._run(lambda pulse, sink: (round(sink.volume.value_flat * 100), bool(sink.mute)))
+
+    def set_volume(self, level: int) -> int:
+        level = max(0, min(100, level))
+
+        def apply(pulse, sink):
+            sink.volume.value_flat = level / 100.0
+            pulse.sink_volume_set(sink.index, sink.volume)
+            return level
+
+        return self._run(apply)
+
+    def change_volume(self, delta: int = VOLUME_STEP) -> int:
+        def apply(pulse, sink):
+            level = max(0, min(100, round(sink.volume.value_flat * 100) + delta))
+            sink.volume.value_flat = level / 100.0
+            pulse.sink_volume_set(sink.index, sink.volume)
+            return level
+
+        return self._run(apply)
+
+    def set_mute(self, muted: Optional[bool] = None) -> bool:
+        """Mute or unmute the default sink; None toggles. Returns the new state."""
+        def apply(pulse, sink):
+            state = not sink.mute if muted is None else muted
+            pulse.sink_mute(sink.index, state)
+            return state
+
+        return self._run(apply)
@@ -0,0 +1,2454 @@
+import os
+import re
+import sys
+import json
+import subprocess
+import time
+import random
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+UTTERANCE_TEMPLATES = [
+    "search for {topic}",
+    "search the web for {topic}",
+    "look up {topic}",
+    "what is {topic}",
+    "who is {person}",
+    "tell me about {topic}",
+    "open {app}",
+    "launch {app}",
+    "close {app}",
+    "kill {app}",
+    "system information",
+    "cpu usage",
+    "take a screenshot",
+    "set volume to {level}",
+    "volume up",
+    "lower the volume",
+    "mute",
+    "what time is it",
+    "what's the date",
+    "what day is it",
+    "weather in {city}",
+    "wikipedia {topic}",
+    "summary of {topic}",
+    "play spotify",
+    "pause spotify",
+    "next song",
+    "play {song} on spotify",
+    "help",
+    "what can you do",
+    "hello",
+    "good morning",
+    "list processes",
+    "goodbye",
+    "how tall is {person}",
+    "remind me to {chore} tomorrow",
+    "{chore} later please",
+]
+
+TOPICS = ["python programming", "black holes", "the roman empire", "machine learning", "coffee", "jazz"]
+PEOPLE = ["ada lovelace", "alan turing", "marie curie", "nikola tesla"]
+APPS = ["chrome", "spotify", "notepad", "calculator", "vs code", "terminal"]
+CITIES = ["london", "paris", "tokyo", "new york"]
+SONGS = ["some jazz music", "bohemian rhapsody", "lo-fi beats"]
+CHORES = ["water the plants", "call mom", "buy milk", "backup the laptop"]
+
+
+def build_corpus(size: int, seed: int = 42) -> List[str]:
+    """Generate a reproducible corpus of spoken-style commands"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        template = rng.choice(UTTERANCE_TEMPLATES)
+        corpus.append(template.format(
+            topic=rng.choice(TOPICS),
+            person=rng.choice(PEOPLE),
+            app=rng.choice(APPS),
+            level=rng.randint(0, 100),
+            city=rng.choice(CITIES),
+            song=rng.choice(SONGS),
+            chore=rng.choice(CHORES),
+        ))
+    return corpus
+
+
+def legacy_match(intent_patterns: Dict[str, List[str]], text: str) -> Tuple[str, Tuple]:
+    """The original per-pattern re.search loop, kept as the baseline"""
+    text = text.lower().strip()
+    for intent, patterns in intent_patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return intent, match.groups()
+    return 'general_query', ()
+
+
+def _time_per_call(func, corpus: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus)
+
+
+def bench_intents(size: int = 5000, repeat: int = 5) -> Dict:
+    from nlp import NLPProcessor
+
+    nlp = NLPProcessor()
+    corpus = build_corpus(size)
+
+    mismatches = [text for text in corpus
+                  if legacy_match(nlp.intent_patterns, text)[0] != nlp.extract_intent(text)[0]]
+
+    legacy = _time_per_call(lambda text: legacy_match(nlp.intent_patterns, text), corpus, repeat)
+    compiled = _time_per_call(nlp.extract_intent, corpus, repeat)
+
+    print(f"🧪 Intent matching over {size} utterances (best of {repeat})")
+    print(f"   Legacy re.search loop: {legacy * 1e6:8.1f} µs/utterance")
+    print(f"   Prefix-indexed match:  {compiled * 1e6:8.1f} µs/utterance")
+    print(f"   Speedup: {legacy / compiled:.1f}x, intent mismatches: {len(mismatches)}")
+
+    return {'legacy_us': legacy * 1e6, 'compiled_us': compiled * 1e6, 'mismatches': len(mismatches)}
+
+
+def load_fixtures(directory: str) -> List[Dict]:
+    """Recorded utterances: each name.wav has its expected transcript in name.txt,
+    and optionally its expected intent on the second line"""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith('.wav'):
+            continue
+
+        path = os.path.join(directory, name)
+        transcript_path = os.path.splitext(path)[0] + '.txt'
+        transcript = intent = ''
+        if os.path.exists(transcript_path):
+            with open(transcript_path, encoding='utf-8') as f:
+                transcript = f.readline().strip().lower()
+                intent = f.readline().strip()
+
+        fixtures.append({'path': path, 'name': name, 'transcript': transcript, 'intent': intent})
+    return fixtures
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref = reference.split()
+    hyp = hypothesis.split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))]
+
+
+def bench_recognizers(fixtures_dir: str, backends: List[str]) -> Dict:
+    import speech_recognition as sr
+    from recognizers import create_recognizer
+
+    fixtures = [f for f in load_fixtures(fixtures_dir) if f['transcript']]
+    if not fixtures:
+        print(f"❌ No WAV fixtures with transcripts found in {fixtures_dir}")
+        return {}
+
+    recognizer = sr.Recognizer()
+    audio = {}
+    for fixture in fixtures:
+        with sr.AudioFile(fixture['path']) as source:
+            audio[fixture['path']] = recognizer.record(source)
+
+    print(f"🧪 Recognition over {len(fixtures)} fixtures from {fixtures_dir}")
+    results = {}
+    for name in backends:
+        backend = create_recognizer(name, recognizer)
+        latencies, errors, exact = [], [], 0
+
+        # Warm up once so lazy model loading isn't counted as recognition latency
+        try:
+            backend.recognize(audio[fixtures[0]['path']])
+        except (sr.UnknownValueError, sr.RequestError):
+            pass
+
+        for fixture in fixtures:
+            start = time.perf_counter()
+            try:
+                text = backend.recognize(audio[fixture['path']]).text.lower()
+            except (sr.UnknownValueError, sr.RequestError):
+                text = ''
+            latencies.append(time.perf_counter() - start)
+
+            wer = word_error_rate(fixture['transcript'], text)
+            errors.append(wer)
+            exact += wer == 0.0
+
+        results[name] = {
+            'p50_ms': _percentile(latencies, 50) * 1000,
+            'p95_ms': _percentile(latencies, 95) * 1000,
+            'wer': sum(errors) / len(errors),
+            'exact': exact / len(fixtures)
+        }
+        print(f"   {name:<14} p50={results[name]['p50_ms']:7.1f} ms  p95={results[name]['p95_ms']:7.1f} ms  "
+              f"WER={results[name]['wer']:.1%}  exact={results[name]['exact']:.0%}")
+
+    return results
+
+
+def _load_pcm(path: str) -> Tuple[bytes, int]:
+    """Read a WAV fixture as 16-bit mono PCM"""
+    import speech_recognition as sr
+
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+    return audio.get_raw_data(convert_width=2), audio.sample_rate
+
+
+def _room_noise(seconds: float, sample_rate: int, level: float = 60.0, seed: int = 0) -> bytes:
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return (rng.normal(0, level, int(seconds * sample_rate))).astype(np.int16).tobytes()
+
+
+def synthetic_utterance(sample_rate: int = 16000, seconds: float = 1.2, seed: int = 0) -> bytes:
+    """A voiced, speech-like burst used when no recorded fixtures are available"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    signal = 3000 * voiced * envelope + rng.normal(0, 60, t.size)
+    return signal.astype(np.int16).tobytes()
+
+
+def bench_vad(fixtures_dir: Optional[str] = None, pause_threshold: float = 3.0) -> Dict:
+    from vad import Endpointer, split_frames
+
+    if fixtures_dir:
+        clips = [(f['name'], *_load_pcm(f['path'])) for f in load_fixtures(fixtures_dir)]
+    else:
+        clips = [(f"synthetic-{i}", synthetic_utterance(16000, 0.8 + 0.3 * i, seed=i), 16000) for i in range(5)]
+
+    if not clips:
+        print(f"❌ No WAV fixtures found in {fixtures_dir}")
+        return {}
+
+    # A stream that briefly delivers digital silence must not throw off the noise floor
+    dropout = _room_noise(0.5, 16000, seed=1) + bytes(2 * 1600) + _room_noise(0.5, 16000, seed=3)
+    clips.append(('digital-silence-dropout', synthetic_utterance(16000, 1.0, seed=9), 16000, dropout))
+
+    print(f"🧪 Endpointing over {len(clips)} utterances (fixed pause {pause_threshold:.1f}s)")
+    savings = []
+    late = 0
+    for name, pcm, rate, *lead in clips:
+        lead = lead[0] if lead else _room_noise(1.0, rate, seed=1)
+        padded = lead + pcm + _room_noise(pause_threshold + 1.5, rate, seed=2)
+        speech_end = (len(lead) + len(pcm)) / (2 * rate)
+
+        endpointer = Endpointer(rate)
+        vad_end = float('nan')
+        for frame in split_frames(padded, rate):
+            if endpointer.process(frame) == 'end':
+                vad_end = endpointer.elapsed
+                break
+
+        # A fixed-pause recognizer can't stop before pause_threshold of silence has passed
+        saved = speech_end + pause_threshold - vad_end
+        savings.append(saved)
+        # Ending an utterance much past the hangover means room noise was taken for speech
+        late += not vad_end - speech_end <= endpointer.hangover + 0.3
+        print(f"   {name:<24} speech ends {speech_end:5.2f}s  VAD ends {vad_end - speech_end:+.2f}s later  "
+              f"saved {saved:.2f}s")
+
+    valid = [s for s in savings if s == s]
+    mean_saved = sum(valid) / len(valid) if valid else float('nan')
+    print(f"   Mean latency saved per utterance: {mean_saved:.2f}s ({len(savings) - len(valid)} undetected, "
+          f"{late} ended late)")
+    return {'mean_saved_s': mean_saved, 'undetected': len(savings) - len(valid), 'late': late}
+
+
+def bench_tts(seconds_per_char: float = 0.002) -> Dict:
+    """Sentence chunking, queue order, time to first sentence and barge-in, on the fake engine"""
+    import threading
+    from tts import FakeTTSEngine, SpeechOutput
+
+    answer = ("Python is a programming language. It was created by Guido van Rossum! "
+              "Is it popular? Very.\n=====\nSee python.org for more.")
+    engine = FakeTTSEngine(seconds_per_char)
+    output = SpeechOutput(engine)
+    checks = {}
+
+    checks['chunking'] = output.split_sentences(answer) == [
+        "Python is a programming language.", "It was created by Guido van Rossum!",
+        "Is it popular?", "Very.", "See python.org for more."]
+
+    # The first sentence starts playing as soon as it is queued, not after the whole answer is prepared
+    delays = []
+    output.on_speech_start = delays.append
+    start = time.perf_counter()
+    output.say(answer, block=True)
+    whole = time.perf_counter() - start
+    first = delays[0] if delays else float('nan')
+
+    engine.spoken.clear()
+    output.say("First one. First two.")
+    output.say("Second one. Second two.", block=True)
+    checks['order'] = engine.spoken == ["First one.", "First two.", "Second one.", "Second two."]
+
+    # Barge-in: a new command cuts the answer off mid-sentence and wakes anyone waiting on it
+    engine.spoken.clear()
+    waiter_woken = threading.Event()
+    threading.Thread(target=lambda: (output.say(answer, block=True), waiter_woken.set()), daemon=True).start()
+    time.sleep(len("Python is a programming language.") * seconds_per_char / 2)
+    start = time.perf_counter()
+    output.interrupt()
+    stopped = output.wait_until_done(1.0)
+    barge_in = time.perf_counter() - start
+    checks['barge_in'] = stopped and waiter_woken.wait(1.0) and engine.spoken == ["Python is a programming language."]
+    output.say("Next answer.", block=True)
+    checks['after_barge_in'] = engine.spoken[-1] == "Next answer."
+
+    # Barge-in that lands after the worker has picked a sentence but before the engine starts it
+    engine.spoken.clear()
+    output.on_speech_start = lambda delay: output.interrupt()
+    output.say(answer, block=True)
+    output.on_speech_start = None
+    checks['barge_in_at_start'] = output.wait_until_done(1.0) and engine.spoken == []
+    output.say("Next answer.", block=True)
+    checks['after_barge_in_at_start'] = engine.spoken == ["Next answer."]
+
+    print(f"🧪 Speech output on the fake engine ({seconds_per_char * 1000:.1f}ms per character)")
+    print(f"   first sentence started after {first * 1000:.2f}ms; whole answer took {whole * 1000:.0f}ms")
+    print(f"   barge-in silenced the answer in {barge_in * 1000:.2f}ms")
+    for name, ok in checks.items():
+        print(f"   {name.replace('_', ' '):<24} {'ok' if ok else 'FAILED'}")
+    return {'first_sentence': first, 'whole': whole, 'barge_in': barge_in, 'checks': checks}
+
+
+def _spot(spotter, pcm: bytes, rate: int) -> Optional[str]:
+    """Run the idle-listening loop (VAD + spotter) over one recording"""
+    from vad import Endpointer, split_frames
+
+    endpointer = Endpointer(rate)
+    session = None
+    for frame in split_frames(pcm, rate):
+        event = endpointer.process(frame)
+        if event == 'start' and spotter is not None:
+            session = spotter.start(rate)
+            for buffered in endpointer.frames:
+                session.accept(buffered)
+        elif event == 'end' and session is not None:
+            wake_word = session.finish()
+            if wake_word:
+                return wake_word
+            endpointer.reset()
+            session = None
+        elif session is not None:
+            session.accept(frame)
+
+    return session.finish() if session is not None else None
+
+
+class _ScriptedMicrophone:
+    """Microphone stand-in whose stream yields silence, one 100ms chunk per read"""
+
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    CHUNK = 1600
+
+    def __init__(self):
+        self.stream = self
+
+    def read(self, frames: int) -> bytes:
+        return bytes(frames * self.SAMPLE_WIDTH)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _ScriptedSession:
+    """Streaming session that reveals one more word of a transcript per chunk and never endpoints"""
+
+    def __init__(self, transcript: str):
+        self.words = transcript.split()
+        self.heard = 0
+        self.finished = False
+
+    def accept(self, frame: bytes) -> str:
+        self.heard = min(self.heard + 1, len(self.words))
+        return ' '.join(self.words[:self.heard])
+
+    def is_endpoint(self) -> bool:
+        return False
+
+    def finish(self):
+        from recognizers import RecognitionResult
+
+        self.finished = True
+        return RecognitionResult(' '.join(self.words), 1.0, 'scripted')
+
+
+def _streaming_gate() -> Dict:
+    """With the wake word required, streamed transcripts must pass the same gate as recorded ones,
+    and a whole command after the wake word must still be dispatched before the utterance ends"""
+    import speech
+    from nlp import NLPProcessor
+    from tts import FakeTTSEngine
+
+    handler = speech.SpeechHandler(tts_engine=FakeTTSEngine(), use_microphone=False)
+    source = speech.StreamingSource(handler, lambda text: True)
+    saved = speech.WAKE_WORD_REQUIRED
+    speech.WAKE_WORD_REQUIRED = True
+    try:
+        heard = {}
+        for transcript in ("what time is it", "hey aethera what time is it"):
+            handler.listen_streaming = lambda is_complete, transcript=transcript: transcript
+            heard[transcript] = source.capture()
+        del handler.listen_streaming
+
+        handler.microphone = _ScriptedMicrophone()
+        handler.use_vad = False
+        is_complete = NLPProcessor().is_complete_command
+        early = {}
+        for transcript in ("hey aethera what time is it", "what time is it"):
+            session = _ScriptedSession(transcript)
+            handler.backend.start_stream = lambda sample_rate, session=session: session
+            text = handler.listen_streaming(is_complete)
+            early[transcript] = text if not session.finished else None
+    finally:
+        speech.WAKE_WORD_REQUIRED = saved
+    gated = heard == {"what time is it": None, "hey aethera what time is it": "what time is it"}
+    return {'gated': gated, 'early': early == {"hey aethera what time is it": "hey aethera what time is it",
+                                               "what time is it": None}}
+
+
+def bench_wakeword(fixtures_dir: Optional[str] = None, idle_seconds: float = 60.0, max_idle_cpu: float = 0.05,
+                   max_false_accept: float = 0.05, max_false_reject: float = 0.1) -> Dict:
+    import speech_recognition as sr
+    from config import WAKE_WORDS
+    from wakeword import WakeWordSpotter
+
+    spotter = WakeWordSpotter()
+    try:
+        spotter.check_available()
+    except sr.RequestError as e:
+        print(f"⚠️ Spotter unavailable ({e}); measuring VAD gating only")
+        spotter = None
+
+    rate = 16000
+    noise = _room_noise(idle_seconds, rate, seed=3)
+    cpu_start = time.process_time()
+    _spot(spotter, noise, rate)
+    cpu_used = time.process_time() - cpu_start
+
+    print(f"🧪 Idle listening over {idle_seconds:.0f}s of room noise")
+    print(f"   CPU: {cpu_used:.3f}s ({cpu_used / idle_seconds:.2%} of one core)")
+    result = {'idle_cpu_ratio': cpu_used / idle_seconds}
+    failures = []
+    if result['idle_cpu_ratio'] > max_idle_cpu:
+        failures.append(f"idle CPU above {max_idle_cpu:.0%}")
+
+    streaming = _streaming_gate()
+    result['streaming_gated'] = streaming['gated']
+    result['streaming_early'] = streaming['early']
+    print(f"   streaming transcripts without the wake word dropped: {'yes' if streaming['gated'] else 'no'}")
+    print(f"   early dispatch after the wake word: {'yes' if streaming['early'] else 'no'}")
+    if not streaming['gated']:
+        failures.append("streaming bypasses the wake word")
+    if not streaming['early']:
+        failures.append("streamed commands after the wake word are never dispatched early")
+
+    if fixtures_dir and spotter is not None:
+        fixtures = [f for f in load_fixtures(fixtures_dir) if f['transcript']]
+        false_accepts = false_rejects = positives = 0
+        for fixture in fixtures:
+            pcm, fixture_rate = _load_pcm(fixture['path'])
+            padded = _room_noise(0.5, fixture_rate) + pcm + _room_noise(1.0, fixture_rate)
+            expected = any(fixture['transcript'].startswith(w) for w in WAKE_WORDS)
+            detected = _spot(spotter, padded, fixture_rate) is not None
+
+            positives += expected
+            false_accepts += detected and not expected
+            false_rejects += expected and not detected
+
+        negatives = len(fixtures) - positives
+        result['false_accept_rate'] = false_accepts / negatives if negatives else 0.0
+        result['false_reject_rate'] = false_rejects / positives if positives else 0.0
+        print(f"   {len(fixtures)} fixtures ({positives} with a wake word): "
+              f"false accepts {result['false_accept_rate']:.1%}, false rejects {result['false_reject_rate']:.1%}")
+        if result['false_accept_rate'] > max_false_accept:
+            failures.append(f"false accepts above {max_false_accept:.0%}")
+        if result['false_reject_rate'] > max_false_reject:
+            failures.append(f"false rejects above {max_false_reject:.0%}")
+
+    result['failures'] = failures
+    if failures:
+        print(f"   ❌ {', '.join(failures)}")
+    return result
+
+
+def bench_telemetry(answers: int = 200) -> Dict:
+    """Latency of answering "system info" from the sampler, against the blocking one-second measurement it replaced"""
+    import platform
+    import threading
+    import psutil
+    from system_actions import SystemController
+    from telemetry import get_sampler
+
+    start = time.perf_counter()
+    psutil.cpu_percent(interval=1)
+    psutil.virtual_memory()
+    psutil.disk_usage('/')
+    platform.processor()
+    legacy = time.perf_counter() - start
+
+    sampler = get_sampler()
+    ready = sampler.wait_ready(5.0)
+    system = SystemController()
+
+    # Count psutil calls made on this thread while answering; the sampler's own thread doesn't count
+    foreground = {'calls': 0}
+    caller = threading.current_thread()
+    originals = {name: getattr(psutil, name) for name in
+                 ('cpu_percent', 'virtual_memory', 'disk_usage', 'net_io_counters', 'cpu_count')}
+
+    def counted(function):
+        def call(*args, **kwargs):
+            if threading.current_thread() is caller:
+                foreground['calls'] += 1
+            return function(*args, **kwargs)
+        return call
+
+    samples = []
+    try:
+        for name, function in originals.items():
+            setattr(psutil, name, counted(function))
+        for _ in range(answers):
+            start = time.perf_counter()
+            result = system.get_system_info()
+            samples.append(time.perf_counter() - start)
+    finally:
+        for name, function in originals.items():
+            setattr(psutil, name, function)
+
+    answered = ready and result.get('success', False)
+    print(f"🧪 System info answers ({answers} from the sampler)")
+    print(f"   blocking measurement: {legacy * 1000:.0f}ms")
+    print(f"   from the ring buffer: p50 {_percentile(samples, 50) * 1e6:.0f}µs  p99 {_percentile(samples, 99) * 1e6:.0f}µs")
+    print(f"   psutil calls on the answering thread: {foreground['calls']}; answered: {'yes' if answered else 'no'}")
+    return {'legacy': legacy, 'p50': _percentile(samples, 50), 'p99': _percentile(samples, 99),
+            'foreground_calls': foreground['calls'], 'answered': answered}
+
+
+PROCESS_NAMES = ['chrome', 'firefox', 'code', 'python3', 'bash', 'systemd', 'kworker', 'spotify',
+                 'discord', 'slack', 'zoom', 'node', 'java', 'postgres', 'nginx', 'sshd', 'Xorg', 'pulseaudio']
+
+
+def bench_processes(size: int = 5000, lookups: int = 200, seed: int = 42) -> Dict:
+    from process_index import ProcessEntry, ProcessIndex
+
+    rng = random.Random(seed)
+    names = [f"{rng.choice(PROCESS_NAMES)}{rng.choice(['', '-helper', '-worker', str(rng.randint(1, 40))])}"
+             for _ in range(size)]
+
+    index = ProcessIndex()
+    for pid, name in enumerate(names, start=1):
+        index._add(ProcessEntry(pid, name, None, 0.0))
+    keywords = [rng.choice(PROCESS_NAMES).lower() for _ in range(lookups)]
+
+    # The old code lower-cased every process name on every command
+    start = time.perf_counter()
+    for keyword in keywords:
+        legacy = [name for name in names if keyword in name.lower()]
+    legacy_time = (time.perf_counter() - start) / lookups
+
+    start = time.perf_counter()
+    for keyword in keywords:
+        with index._lock:
+            indexed = [pid for name, pids in index._by_name.items() if keyword in name for pid in pids]
+    index_time = (time.perf_counter() - start) / lookups
+
+    print(f"🧪 Process lookup over {size} synthetic processes ({len(index._by_name)} distinct names)")
+    print(f"   full scan: {legacy_time * 1e6:8.1f}µs/lookup")
+    print(f"   index:     {index_time * 1e6:8.1f}µs/lookup ({legacy_time / index_time:.1f}x)")
+    result = {'legacy': legacy_time, 'indexed': index_time, 'mismatch': len(legacy) != len(indexed)}
+
+    try:
+        import psutil
+    except ImportError:
+        return result
+
+    # On this host: psutil scan as close_application used to do it vs a warm index
+    start = time.perf_counter()
+    for proc in psutil.process_iter():
+        try:
+            'spotify' in proc.name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    scan_time = time.perf_counter() - start
+
+    live = ProcessIndex(min_refresh_interval=0.0)
+    live.refresh()
+    start = time.perf_counter()
+    live.find('spotify')
+    find_time = time.perf_counter() - start
+
+    # A PID that now belongs to a different process than the one indexed
+    pid = os.getpid()
+    live._remove(pid)
+    live._add(ProcessEntry(pid, 'recycled-pid', None, 0.0))
+    live.refresh()
+    found = live.find('recycled-pid')
+    reused = live._entries.get(pid)
+    replaced = not found and reused is not None and reused.name != 'recycled-pid'
+
+    print(f"🧪 This host ({len(live)} processes)")
+    print(f"   process_iter scan:          {scan_time * 1000:7.2f}ms")
+    print(f"   incremental refresh + find: {find_time * 1000:7.2f}ms")
+    print(f"   reused PID re-read on lookup: {'yes' if replaced else 'no'}")
+    result.update({'host_scan': scan_time, 'host_find': find_time, 'reuse_detected': replaced})
+    return result
+
+
+class FakeMprisPlayer:
+    """Minimal MPRIS player on a private bus, answering playback calls like Spotify would"""
+
+    def __init__(self, address: str, name: str = 'org.mpris.MediaPlayer2.spotify'):
+        import threading
+        from queue import Queue
+        from jeepney import MatchRule, message_bus
+        from jeepney.io.threading import DBusRouter, Proxy, open_dbus_connection
+
+        self.status = 'Paused'
+        self.calls = 0
+        self._router = DBusRouter(open_dbus_connection(address))
+        Proxy(message_bus, self._router).RequestName(name)
+        self._calls = Queue()
+        self._filter = self._router.filter(MatchRule(type='method_call', path='/org/mpris/MediaPlayer2'),
+                                           queue=self._calls)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _properties(self) -> Dict:
+        return {'PlaybackStatus': ('s', self.status),
+                'Metadata': ('a{sv}', {'xesam:title': ('s', 'Test Track'), 'xesam:artist': ('as', ['Fixture'])})}
+
+    def _serve(self):
+        from jeepney import DBusAddress, HeaderFields, new_method_return, new_signal
+
+        player = DBusAddress('/org/mpris/MediaPlayer2', interface='org.freedesktop.DBus.Properties')
+        transitions = {'Play': 'Playing', 'Pause': 'Paused', 'PlayPause': None, 'Stop': 'Stopped'}
+        while True:
+            message = self._calls.get()
+            member = message.header.fields.get(HeaderFields.member)
+            self.calls += 1
+            if member == 'GetAll':
+                self._router.send(new_method_return(message, 'a{sv}', (self._properties(),)))
+                continue
+
+            self._router.send(new_method_return(message))
+            if member in transitions:
+                self.status = transitions[member] or ('Paused' if self.status == 'Playing' else 'Playing')
+                self._router.send(new_signal(player, 'PropertiesChanged', 'sa{sv}as', (
+                    'org.mpris.MediaPlayer2.Player', {'PlaybackStatus': ('s', self.status)}, [])))
+
+    def close(self):
+        self._filter.close()
+        self._router.close()
+        self._router.conn.close()
+
+
+def bench_media(commands: int = 50) -> Dict:
+    import shutil
+    from media_control import MprisController
+
+    if not shutil.which('dbus-daemon'):
+        print("⚠️ dbus-daemon not found; skipping")
+        return {}
+
+    daemon = subprocess.Popen(['dbus-daemon', '--session', '--nofork', '--print-address'],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        address = daemon.stdout.readline().strip()
+        player = FakeMprisPlayer(address)
+        actions = ['play', 'pause', 'next', 'previous']
+
+        controller = MprisController(bus=address)
+        start = time.perf_counter()
+        controller.status()
+        connect_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(commands):
+            controller.send(actions[i % len(actions)])
+        persistent = (time.perf_counter() - start) / commands
+
+        controller.send('play')
+        deadline = time.time() + 1.0
+        while controller.playback_status != 'Playing' and time.time() < deadline:
+            time.sleep(0.01)
+        tracked = controller.playback_status == 'Playing'
+
+        result = {'connect': connect_time, 'persistent': persistent, 'state_tracked': tracked}
+        print(f"🧪 MPRIS commands against a fake player on a private bus ({commands} commands)")
+        print(f"   first use (connect + subscribe + GetAll): {connect_time * 1000:.2f}ms")
+        print(f"   persistent connection: {persistent * 1000:.3f}ms/command")
+        print(f"   PlaybackStatus tracked from signals: {'yes' if tracked else 'no'} "
+              f"({controller.current_track()})")
+
+        if shutil.which('dbus-send'):
+            start = time.perf_counter()
+            for i in range(commands):
+                method = MprisController.COMMANDS[actions[i % len(actions)]]
+                subprocess.run(['dbus-send', f'--bus={address}', '--print-reply', '--dest=org.mpris.MediaPlayer2.spotify',
+                                '/org/mpris/MediaPlayer2', f'org.mpris.MediaPlayer2.Player.{method}'],
+                               capture_output=True, check=True)
+            spawned = (time.perf_counter() - start) / commands
+            result['dbus_send'] = spawned
+            print(f"   dbus-send per command: {spawned * 1000:.3f}ms ({spawned / persistent:.0f}x slower)")
+
+        controller.close()
+        player.close()
+        return result
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+class _FakeVolume:
+    def __init__(self, channels: List[float]):
+        self.values = channels
+
+    @property
+    def value_flat(self) -> float:
+        return sum(self.values) / len(self.values)
+
+    @value_flat.setter
+    def value_flat(self, value: float):
+        self.values = [value] * len(self.values)
+
+
+
+class _FakeSink:
+    def __init__(self, index: int, name: str, volume: float = 0.5, channels: int = 2):
+        self.index = index
+        self.name = name
+        self.volume = _FakeVolume([volume] * channels)
+        self.mute = False
+
+
+
+class FakePulseServer:
+    """In-memory stand-in for a pulsectl.Pulse client, for the volume and fast-path benchmarks"""
+
+    connected = True
+
+    def __init__(self, sinks: Optional[List[str]] = None, latency: float = 0.0):
+        names = sinks or ['alsa_output.fake-stereo']
+        self.sinks = {index: _FakeSink(index, name) for index, name in enumerate(names)}
+        self.default_sink_name = names[0]
+        self.latency = latency
+        self.requests = 0
+
+    def _request(self):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def server_info(self):
+        self._request()
+        return type('ServerInfo', (), {'default_sink_name': self.default_sink_name})()
+
+    def get_sink_by_name(self, name: str) -> _FakeSink:
+        self._request()
+        for sink in self.sinks.values():
+            if sink.name == name:
+                return self._copy(sink)
+        raise LookupError(f"No sink named {name}")
+
+    def sink_info(self, index: int) -> _FakeSink:
+        self._request()
+        if index not in self.sinks:
+            raise LookupError(f"No sink with index {index}")
+        return self._copy(self.sinks[index])
+
+    def sink_volume_set(self, index: int, volume: _FakeVolume):
+        self._request()
+        self.sinks[index].volume = _FakeVolume(list(volume.values))
+
+    def sink_mute(self, index: int, mute: bool):
+        self._request()
+        self.sinks[index].mute = bool(mute)
+
+    def _copy(self, sink: _FakeSink) -> _FakeSink:
+        # Like libpulse, every query returns a fresh snapshot rather than shared state
+        copy = _FakeSink(sink.index, sink.name)
+        copy.volume = _FakeVolume(list(sink.volume.values))
+        copy.mute = sink.mute
+        return copy
+
+
+def bench_volume(commands: int = 200, server: Optional[str] = None) -> Dict:
+    import shutil
+    from audio_control import PulseVolumeController
+
+    if server:
+        controller = PulseVolumeController(server=server)
+        label = f"pulse server {server}"
+    else:
+        fake = FakePulseServer()
+        controller = PulseVolumeController(client=fake)
+        label = "fake pulse server"
+
+    original, _ = controller.get_volume()
+    operations = [lambda: controller.change_volume(10), lambda: controller.change_volume(-10),
+                  lambda: controller.set_mute(True), lambda: controller.set_mute(False),
+                  lambda: controller.set_volume(original)]
+    start = time.perf_counter()
+    for i in range(commands):
+        operations[i % len(operations)]()
+    native = (time.perf_counter() - start) / commands
+
+    print(f"🧪 Volume changes against the {label} ({commands} commands)")
+    print(f"   persistent connection: {native * 1e6:.1f}µs/command")
+    if not server:
+        print(f"   round trips: {fake.requests / commands:.1f}/command")
+    result = {'native': native}
+
+    # The old path forked pactl (and amixer after a failure) for every command
+    command = ['pactl', 'get-sink-volume', '@DEFAULT_SINK@'] if shutil.which('pactl') else ['true']
+    start = time.perf_counter()
+    for _ in range(min(commands, 50)):
+        subprocess.run(command, capture_output=True)
+    spawned = (time.perf_counter() - start) / min(commands, 50)
+    result['subprocess'] = spawned
+    print(f"   spawning {command[0]}: {spawned * 1e6:.1f}µs/command ({spawned / native:.0f}x slower)")
+    return result
+
+
+APP_WORDS = ['office', 'studio', 'player', 'editor', 'viewer', 'manager', 'terminal', 'browser', 'mail',
+             'chat', 'music', 'photo', 'video', 'code', 'notes', 'calc', 'draw', 'paint', 'sync', 'backup']
+
+APP_DANGEROUS = ['shutdown', 'poweroff', 'reboot', 'halt']
+APP_MISHEARD = ['power off', 'shut down', 'reboots', 'halts', 'shutdown', 'poweroff']
+
+
+def bench_apps(executables: int = 4000, desktop_files: int = 1500, lookups: int = 500, seed: int = 42) -> Dict:
+    import tempfile
+    from app_index import AppIndex
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as root:
+        bin_dir = os.path.join(root, 'bin')
+        app_dir = os.path.join(root, 'applications')
+        os.makedirs(bin_dir)
+        os.makedirs(app_dir)
+
+        names = set()
+        while len(names) < executables:
+            names.add(f"{rng.choice(APP_WORDS)}-{rng.choice(APP_WORDS)}{rng.randint(0, 99)}")
+        names = sorted(names)
+        for name in names:
+            path = os.path.join(bin_dir, name)
+            with open(path, 'w') as f:
+                f.write('#!/bin/sh\n')
+            os.chmod(path, 0o755)
+        for name in APP_DANGEROUS:
+            path = os.path.join(bin_dir, name)
+            with open(path, 'w') as f:
+                f.write('#!/bin/sh\n')
+            os.chmod(path, 0o755)
+        for i, name in enumerate(names[:desktop_files]):
+            with open(os.path.join(app_dir, f"org.example.App{i}.desktop"), 'w') as f:
+                f.write(f"[Desktop Entry]\nType=Application\nName={name.replace('-', ' ').title()} App\n"
+                        f"Exec={name} %U\n")
+
+        index = AppIndex(path_dirs=[bin_dir], application_dirs=[app_dir], windows=False, min_refresh_interval=0.0)
+        start = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.refresh()
+        unchanged = time.perf_counter() - start
+
+        def typo(name: str) -> str:
+            position = rng.randrange(len(name))
+            return name[:position] + name[position + 1:]
+
+        exact = [rng.choice(names) for _ in range(lookups)]
+        # Only .desktop names are matched fuzzily; bare executables need their exact name
+        fuzzy = [typo(rng.choice(names[:desktop_files])) for _ in range(lookups)]
+        unknown = [f"zz{rng.randint(0, 10 ** 6)}qq" for _ in range(lookups)]
+
+        timings = {}
+        for label, queries in (('exact', exact), ('fuzzy (first)', fuzzy), ('fuzzy (cached)', fuzzy),
+                               ('unknown', unknown)):
+            start = time.perf_counter()
+            resolved = sum(index.resolve(query) is not None for query in queries)
+            timings[label] = ((time.perf_counter() - start) / lookups, resolved / lookups)
+
+        unsafe = {phrase: index.resolve(phrase) for phrase in APP_MISHEARD}
+        unsafe = {phrase: entry.command[0] for phrase, entry in unsafe.items() if entry is not None}
+
+    print(f"🧪 App index over {executables} executables and {desktop_files} .desktop files")
+    print(f"   build: {build * 1000:.1f}ms, unchanged refresh: {unchanged * 1000:.2f}ms")
+    for label, (seconds, rate) in timings.items():
+        print(f"   {label:<15} {seconds * 1e6:9.1f}µs/lookup, resolved {rate:.0%}")
+    print(f"   power-control phrases resolved: {len(unsafe)}/{len(APP_MISHEARD)}")
+    for phrase, command in unsafe.items():
+        print(f"   ❌ '{phrase}' -> {command}")
+    return {'build': build, 'refresh': unchanged, 'lookups': timings, 'unsafe': unsafe}
+
+
+def synthetic_screenshot(width: int = 3840, height: int = 2160, seed: int = 0):
+    """Desktop-like test image: flat background, windows with text-like rows and one photo region"""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), (32, 36, 48), dtype=np.uint8)
+    for _ in range(6):
+        x, y = int(rng.integers(0, width * 3 // 4)), int(rng.integers(0, height * 3 // 4))
+        w, h = int(rng.integers(width // 6, width // 2)), int(rng.integers(height // 6, height // 2))
+        pixels[y:y + h, x:x + w] = (235, 235, 235)
+        pixels[y:y + 40, x:x + w] = (60, 90, 160)
+        for row in range(y + 60, min(y + h, height) - 20, 28):
+            length = int(rng.integers(w // 4, w - 40))
+            text = rng.integers(0, 2, size=(14, length), dtype=np.uint8) * 200
+            pixels[row:row + 14, x + 20:x + 20 + length] = 235 - text[:, :min(length, width - x - 20), None]
+    photo_h, photo_w = height // 3, width // 3
+    gradient = np.linspace(0, 255, photo_w, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 25, size=(photo_h, photo_w, 3))
+    pixels[:photo_h, -photo_w:] = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, 'RGB')
+
+
+def bench_screenshots(width: int = 3840, height: int = 2160, repeat: int = 3) -> Dict:
+    import tempfile
+    from screenshots import ScreenshotEncoder
+
+    image = synthetic_screenshot(width, height)
+    settings = [
+        ('png level 6 (old default)', {'image_format': 'png', 'png_level': 6}),
+        ('png level 1', {'image_format': 'png', 'png_level': 1}),
+        ('jpeg q85', {'image_format': 'jpeg', 'quality': 85}),
+        ('webp q80', {'image_format': 'webp', 'quality': 80}),
+        ('png level 1, 50% scale', {'image_format': 'png', 'png_level': 1, 'scale': 0.5}),
+    ]
+
+    results = {}
+    print(f"🧪 Screenshot encoding of a synthetic {width}x{height} desktop (best of {repeat})")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, options in settings:
+            encoder = ScreenshotEncoder(**options)
+            path = os.path.join(directory, f"shot.{encoder.extension}")
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                encoder.encode(image, path)
+                best = min(best, time.perf_counter() - start)
+            size = os.path.getsize(path)
+            results[label] = {'seconds': best, 'bytes': size}
+            print(f"   {label:<26} {best * 1000:7.1f}ms {size / 1024:8.0f} KB")
+
+        # What the voice thread waits for: a synchronous save vs handing off to the worker
+        encoder = ScreenshotEncoder(image_format='png', png_level=6)
+        start = time.perf_counter()
+        encoder.submit(image, os.path.join(directory, 'async.png'))
+        handoff = time.perf_counter() - start
+        encoder.wait()
+    print(f"   command blocked for {results['png level 6 (old default)']['seconds'] * 1000:.1f}ms before, "
+          f"{handoff * 1000:.3f}ms with the background encoder")
+    results['handoff'] = handoff
+    return results
+
+
+def synthetic_results_page(engine: str, results: int = 10, seed: int = 0) -> bytes:
+    """A results page shaped like the real ones: a large head of inline CSS/JS, then the results"""
+    rng = random.Random(seed)
+    words = ['python', 'speech', 'assistant', 'search', 'result', 'page', 'voice', 'open', 'source', 'fast']
+    sentence = lambda n: ' '.join(rng.choice(words) for _ in range(n))
+    head = ''.join(f"<style>.c{i}{{color:#{i:06x};margin:{i % 9}px}}</style>" for i in range(2000)) + \
+        ''.join(f"<script>var v{i}='{sentence(12)}';function f{i}(){{return v{i}}}</script>" for i in range(800))
+
+    if engine == 'bing':
+        items = ''.join(f'<li class="b_algo"><div class="b_title"><h2><a href="#">{sentence(6)}</a></h2></div>'
+                        f'<div class="b_caption"><p>{sentence(30)}.</p></div></li>' for _ in range(results))
+        body = (f'<header id="b_header">{sentence(20)}</header><main id="b_content"><ol id="b_results">{items}</ol>'
+                f'<aside id="b_context"><div class="b_rs"><h2>Related</h2><ul>'
+                + ''.join(f'<li>{sentence(3)}</li>' for _ in range(8)) + '</ul></div></aside></main>')
+    else:
+        items = ''.join(f'<div class="g"><div><span class="BNeawe">{sentence(6)}</span></div>'
+                        f'<div class="VwiC3b">{sentence(30)}.</div></div>' for _ in range(results))
+        body = f'<div id="searchform">{sentence(20)}</div><div id="main"><div id="rso">{items}</div></div>'
+
+    return (f'<!doctype html><html><head><meta charset="utf-8"><title>{sentence(3)}</title>{head}</head>'
+            f'<body>{body}<script>{sentence(500)}</script></body></html>').encode('utf-8')
+
+
+def legacy_extract(engine: str, content: bytes) -> List[Tuple[str, str]]:
+    """The BeautifulSoup html.parser extraction WebSearcher used before"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    if engine == 'bing':
+        found = []
+        for result in soup.find_all('li', class_='b_algo'):
+            title, snippet = result.find('h2'), result.find('p')
+            if title and snippet:
+                found.append((title.get_text().strip(), snippet.get_text().strip()))
+        answer = soup.find('div', class_='b_rs')
+        return found + ([('answer', answer.get_text().strip())] if answer else [])
+
+    featured = soup.find('div', {'data-attrid': 'wa:/description'}) or soup.find('span', {'data-tts': 'answers'})
+    found = [('featured', featured.get_text().strip())] if featured else []
+    return found + [('result', elem.get_text().strip())
+                    for elem in soup.find_all(['div', 'span'], class_=['BNeawe', 'VwiC3b'])]
+
+
+def fast_extract(engine: str, content: bytes) -> List[Tuple[str, str]]:
+    from html_extract import parse_page
+
+    page = parse_page(engine, content)
+    if engine == 'bing':
+        found = []
+        for result in page.nodes('results'):
+            title, snippet = page.text('title', result), page.text('snippet', result)
+            if title is not None and snippet is not None:
+                found.append((title, snippet))
+        answer = page.text('answer')
+        return found + ([('answer', answer)] if answer is not None else [])
+
+    featured = page.text('featured')
+    found = [('featured', featured)] if featured is not None else []
+    return found + [('result', page.node_text(elem)) for elem in page.nodes('results')]
+
+
+def bench_html(fixtures_dir: Optional[str] = None, repeat: int = 5) -> Dict:
+    pages = []
+    if fixtures_dir:
+        for name in sorted(os.listdir(fixtures_dir)):
+            engine = next((e for e in ('bing', 'google') if name.startswith(e)), None)
+            if engine and name.endswith('.html'):
+                with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                    pages.append((name, engine, f.read()))
+    else:
+        pages = [(f"synthetic-{engine}", engine, synthetic_results_page(engine)) for engine in ('bing', 'google')]
+
+    if not pages:
+        print("⚠️ No bing*.html or google*.html fixtures found")
+        return {}
+
+    print(f"🧪 Results-page extraction (best of {repeat})")
+    mismatches = 0
+    results = {}
+    for name, engine, content in pages:
+        timings = {}
+        for label, extract in (('bs4 html.parser', legacy_extract), ('lxml + region', fast_extract)):
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                extracted = extract(engine, content)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = (best, extracted)
+
+        (old_time, old_items), (new_time, new_items) = timings.values()
+        mismatches += old_items != new_items
+        results[name] = {'legacy': old_time, 'fast': new_time}
+        print(f"   {name:<24} {len(content) / 1024:6.0f} KB  bs4 {old_time * 1000:7.1f}ms  "
+              f"lxml {new_time * 1000:6.2f}ms ({old_time / new_time:.0f}x)"
+              f"{'' if old_items == new_items else '  ⚠️ different results'}")
+
+    results['mismatches'] = mismatches
+    return results
+
+
+def bench_cache(lookups: int = 300, topics: int = 60, fetch_ms: float = 20.0, seed: int = 42) -> Dict:
+    """Answer cache hit/miss accounting, latency saved and isolation of returned answers"""
+    import tempfile
+    import sqlite3
+    from cache import ResultCache
+
+    rng = random.Random(seed)
+    # Popular questions come back often, in varying case and punctuation
+    weights = [1 / (rank + 1) for rank in range(topics)]
+    stream = []
+    for _ in range(lookups):
+        topic = rng.choices(range(topics), weights)[0]
+        stream.append(rng.choice([f"what is topic {topic}", f"What is topic {topic}?", f"what is  TOPIC {topic}!"]))
+    distinct = len({' '.join(query.lower().replace('?', '').replace('!', '').split()) for query in stream})
+
+    def fetch(query: str) -> Dict:
+        time.sleep(fetch_ms / 1000)
+        return {'success': True, 'query': query, 'summary': f"About {query}.", 'sources': [{'title': query}]}
+
+    def answer(cache, query: str) -> Dict:
+        result = cache.get('web', query)
+        if result is None:
+            result = fetch(query)
+            cache.put('web', query, result)
+        return result
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'answers.db')
+        cache = ResultCache(db_path=path)
+        start = time.perf_counter()
+        for query in stream:
+            answer(cache, query)
+        cached_time = time.perf_counter() - start
+        stats = cache.stats()
+
+        # Editing a returned answer must not change what the next caller gets
+        answer(cache, stream[0])['sources'].append({'title': 'edited by a caller'})
+        isolated = len(answer(cache, stream[0])['sources']) == 1
+        cache.close()
+
+        # A restart serves everything from disk, without a commit per hit
+        restarted = ResultCache(db_path=path)
+        commits = []
+        restarted._db.set_trace_callback(lambda sql: commits.append(sql) if sql.upper().startswith('COMMIT') else None)
+        start = time.perf_counter()
+        for query in stream:
+            restarted.get('web', query)
+        disk_time = time.perf_counter() - start
+        disk_stats = restarted.stats()
+        restarted.close()
+        batched = len(commits) <= disk_stats['disk_hits'] // ResultCache.TOUCH_BATCH + 1
+
+        # Punctuation that changes the question must not share an answer
+        keys = {cache.normalize(query) for query in ('c++', 'c#', 'c', 'C++?')}
+        distinct_keys = keys == {'c++', 'c#', 'c'}
+
+        # A damaged store is a miss rather than an exception in the search path
+        damaged = ResultCache(db_path=path)
+        other = sqlite3.connect(path)
+        other.execute("DROP TABLE answers")
+        other.commit()
+        other.close()
+        try:
+            survived = damaged.get('web', 'never asked before') is None
+        except sqlite3.Error:
+            survived = False
+        damaged.close()
+
+    uncached_time = lookups * fetch_ms / 1000
+    counted = stats['misses'] == distinct and stats['memory_hits'] == lookups - distinct and stats['stores'] == distinct
+    print(f"🧪 Answer cache over {lookups} lookups of {distinct} distinct questions ({fetch_ms:.0f}ms per fetch)")
+    print(f"   hits {stats['memory_hits']} (memory) + {stats['disk_hits']} (disk), misses {stats['misses']}, "
+          f"hit rate {stats['hit_rate']:.0%}; expected {lookups - distinct} hits and {distinct} misses: "
+          f"{'ok' if counted else 'MISMATCH'}")
+    print(f"   time: {cached_time:.2f}s cached vs {uncached_time:.2f}s uncached "
+          f"({uncached_time - cached_time:.2f}s saved)")
+    print(f"   after restart: {disk_stats['disk_hits']} disk hits, {disk_stats['memory_hits']} memory hits, "
+          f"{disk_time / lookups * 1e6:.0f}µs/lookup")
+    print(f"   commits while serving them: {len(commits)} ({'batched' if batched else 'one per hit'})")
+    print(f"   returned answers isolated from the cache: {'yes' if isolated else 'no'}")
+    print(f"   'c++', 'c#' and 'c' kept apart: {'yes' if distinct_keys else 'no'}")
+    print(f"   damaged store treated as a miss: {'yes' if survived else 'no'}")
+    return {'counted': counted, 'isolated': isolated, 'saved': uncached_time - cached_time,
+            'disk_hits': disk_stats['disk_hits'], 'distinct': distinct, 'batched': batched,
+            'distinct_keys': distinct_keys, 'survived': survived}
+
+
+def _local_http_server(handshake: float):
+    """Keep-alive HTTP/1.1 server on localhost serving gzipped JSON.
+
+    /flaky fails once with a 503, /slow answers after half a second and
+    /limited always answers 429 with a long Retry-After. Requests per path
+    are counted in server.hits.
+
+    New connections wait `handshake` seconds before being served, standing in
+    for the DNS, TCP and TLS setup a reused connection avoids.
+    """
+    import gzip
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    body = gzip.compress(json.dumps({'results': ['x' * 40] * 50}).encode())
+    failed_once = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self, send_body: bool = True):
+            path = self.path.split('?')[0]
+            self.server.hits[path] = self.server.hits.get(path, 0) + 1
+            if path == '/slow':
+                time.sleep(0.5)
+            if path == '/limited':
+                self.send_response(429)
+                self.send_header('Retry-After', '30')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if self.path.startswith('/flaky') and self.path not in failed_once:
+                failed_once.add(self.path)
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self.do_GET(send_body=False)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        connections = 0
+        hits: Dict[str, int] = {}
+
+        def get_request(self):
+            request = super().get_request()
+            self.connections += 1
+            time.sleep(handshake)
+            return request
+
+        def handle_error(self, request, client_address):
+            # Clients that drop their connection after each request are expected here
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_transport(requests_count: int = 100, handshake_ms: float = 30.0) -> Dict:
+    import requests
+    from transport import HttpTransport
+
+    server = _local_http_server(handshake_ms / 1000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        start = time.perf_counter()
+        for i in range(requests_count):
+            requests.get(f"{base}/search?q={i}", timeout=5).json()
+        fresh = (time.perf_counter() - start) / requests_count
+        fresh_connections = server.connections
+
+        transport = HttpTransport(backoff=0)
+        server.connections = 0
+        start = time.perf_counter()
+        transport.warmup([base + '/'])
+        warmup_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(requests_count):
+            transport.get(f"{base}/search?q={i}").json()
+        pooled = (time.perf_counter() - start) / requests_count
+
+        retried = transport.get(f"{base}/flaky").status_code == 200
+        stats = transport.stats()
+        accepted = server.connections
+        transport.close()
+
+        # Neither a read timeout nor a 429 may be retried: both would blow the search deadline
+        transport = HttpTransport(backoff=0, timeout=0.2)
+        start = time.perf_counter()
+        try:
+            transport.get(f"{base}/slow")
+        except requests.exceptions.RequestException:
+            pass
+        slow = time.perf_counter() - start
+        start = time.perf_counter()
+        limited_status = transport.get(f"{base}/limited").status_code
+        limited = time.perf_counter() - start
+        transport.close()
+        bounded = (server.hits.get('/slow') == 1 and slow < 0.4
+                   and limited_status == 429 and server.hits.get('/limited') == 1 and limited < 1.0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"🧪 Local keep-alive server, {requests_count} gzipped GETs, {handshake_ms:.0f}ms connection setup")
+    print(f"   new connection per request: {fresh * 1000:.2f}ms/request ({fresh_connections} connections)")
+    print(f"   pooled transport: {pooled * 1000:.2f}ms/request ({fresh / pooled:.1f}x faster) "
+          f"after a {warmup_time * 1000:.0f}ms warmup")
+    print(f"   reuse: {stats['requests']} requests over {stats['connections']} connection(s), "
+          f"{stats['reuse_rate']:.0%} reused, {accepted} accepted by the server")
+    print(f"   503 retried to success: {'yes' if retried else 'no'}")
+    print(f"   read timeout: gave up after {slow * 1000:.0f}ms and {server.hits.get('/slow', 0)} request(s); "
+          f"429: returned after {limited * 1000:.0f}ms and {server.hits.get('/limited', 0)} request(s)")
+    return {'fresh': fresh, 'pooled': pooled, 'warmup': warmup_time, 'retried': retried, 'stats': stats,
+            'bounded': bounded}
+
+
+WIKI_FIXTURE = [
+    ('Mercury', 'Mercury may refer to:', True),
+    ('Mercury (planet)', 'Mercury is the first planet from the Sun. It is the smallest planet in the Solar System.', False),
+    ('Mercury (element)', 'Mercury is a chemical element with the symbol Hg. It is a heavy, silvery metal.', False),
+    ('Python (programming language)', 'Python is a high-level programming language. Its design emphasizes readability.', False),
+    ('Ada Lovelace', 'Ada Lovelace was an English mathematician. She is often regarded as the first programmer.', False),
+]
+
+
+def _mediawiki_stub(rtt: float):
+    """Local stand-in for the MediaWiki API over WIKI_FIXTURE that counts requests and waits rtt per call"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qs
+
+    def search(text: str, limit: int) -> List[int]:
+        words = text.lower().split()
+        return [i for i, (title, _, _) in enumerate(WIKI_FIXTURE) if all(w in title.lower() for w in words)][:limit]
+
+    def page(i: int, rank: Optional[int] = None) -> Dict:
+        title, extract, disambiguation = WIKI_FIXTURE[i]
+        entry = {'pageid': i + 1, 'title': title, 'extract': extract,
+                 'fullurl': f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"}
+        if disambiguation:
+            entry['pageprops'] = {'disambiguation': ''}
+        if rank is not None:
+            entry['index'] = rank + 1
+        return entry
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.server.requests += 1
+            time.sleep(rtt)
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            if params.get('generator') == 'search':
+                hits = search(params['gsrsearch'], int(params.get('gsrlimit', 10)))
+                # Like the real API, generator pages are not in rank order
+                data = {'query': {'pages': sorted((page(i, rank) for rank, i in enumerate(hits)),
+                                                  key=lambda p: p['pageid'], reverse=True)}} if hits else {}
+            elif params.get('list') == 'search':
+                hits = search(params['srsearch'], int(params.get('srlimit', 10)))
+                data = {'query': {'search': [{'title': WIKI_FIXTURE[i][0]} for i in hits]}}
+            else:
+                titles = params.get('titles', '').split('|')
+                data = {'query': {'pages': [page(i) for i, fixture in enumerate(WIKI_FIXTURE) if fixture[0] in titles]}}
+
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_wikipedia_lookup(transport, api_url: str, query: str) -> Optional[str]:
+    """The request sequence of wikipedia.summary() followed by wikipedia.page(), retried on disambiguation"""
+    def call(**params):
+        return transport.get(api_url, params=dict(params, action='query', format='json')).json().get('query', {})
+
+    def resolve(title: str) -> Optional[Dict]:
+        hits = call(list='search', srsearch=title, srlimit=1).get('search', [])
+        if not hits:
+            return None
+        # summary() and page() each load the page info before fetching anything else
+        return next(iter(call(titles=hits[0]['title'], prop='info|pageprops').get('pages', [])), None)
+
+    # summary(query): search + page info, then the extract
+    info = resolve(query)
+    if info is None:
+        return None
+    if 'disambiguation' in info.get('pageprops', {}):
+        # DisambiguationError fetches the option list; the old code retried with the first option
+        options = [p['title'] for p in call(list='search', srsearch=query, srlimit=10).get('search', [])]
+        query = next((title for title in options if title != info['title']), None)
+        info = resolve(query) if query is not None else None
+        if info is None:
+            return None
+    pages = call(titles=info['title'], prop='extracts', exintro=1, explaintext=1).get('pages', [])
+    # page(query): search + page info again, for the URL
+    resolve(query)
+    return pages[0]['title'] if pages else None
+
+def bench_wikipedia(rtt_ms: float = 40.0) -> Dict:
+    from transport import HttpTransport
+    from cache import ResultCache
+    from wikipedia_client import WikipediaClient
+
+    server = _mediawiki_stub(rtt_ms / 1000)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+    transport = HttpTransport(backoff=0)
+    queries = {'python programming language': 'Python (programming language)',
+               'mercury': 'Mercury (planet)', 'ada lovelace': 'Ada Lovelace'}
+    print(f"🧪 Wikipedia lookups against a local MediaWiki stub ({rtt_ms:.0f}ms per request)")
+    results = {'wrong': 0}
+    try:
+        client = WikipediaClient(transport, ResultCache(db_path=None), api_url=api_url)
+        for query, expected in queries.items():
+            server.requests = 0
+            start = time.perf_counter()
+            legacy_title = legacy_wikipedia_lookup(transport, api_url, query)
+            legacy_time, legacy_requests = time.perf_counter() - start, server.requests
+
+            server.requests = 0
+            start = time.perf_counter()
+            article = client.lookup(query)
+            new_time, new_requests = time.perf_counter() - start, server.requests
+
+            server.requests = 0
+            client.lookup(query)
+            cached_requests = server.requests
+
+            title = article['title'] if article else None
+            results['wrong'] += title != expected or legacy_title != expected
+            results[query] = {'legacy_requests': legacy_requests, 'requests': new_requests, 'cached': cached_requests}
+            print(f"   {query!r:<32} old {legacy_requests} requests {legacy_time * 1000:5.0f}ms  "
+                  f"new {new_requests} request {new_time * 1000:4.0f}ms  cached {cached_requests}  -> {title}"
+                  f"{'' if title == expected else '  ⚠️ expected ' + expected}")
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+SEARCH_HOSTS = {'bing': 'www.bing.com', 'duckduckgo': 'api.duckduckgo.com',
+                'google': 'www.google.com', 'wikipedia': 'en.wikipedia.org'}
+
+SEARCH_SCENARIOS = [
+    # (description, behaviour per backend, backend expected to answer or None, bounded by the deadline)
+    ("all backends answer", {}, 'bing', False),
+    ("bing hangs", {'bing': 'hang'}, 'duckduckgo', True),
+    ("bing fails", {'bing': 'fail'}, 'duckduckgo', False),
+    ("only wikipedia answers", {'bing': 'fail', 'duckduckgo': 'fail', 'google': 'fail'}, 'wikipedia', False),
+    ("every backend fails", {name: 'fail' for name in SEARCH_HOSTS}, None, False),
+    ("every backend hangs", {name: 'hang' for name in SEARCH_HOSTS}, None, True),
+]
+
+
+def _search_stub(hang: float):
+    """One local server standing in for every search backend; /<host>/... is served as that host.
+
+    server.behaviour maps a backend name to 'hang' (answer after `hang`
+    seconds) or 'fail' (HTTP 500); any other backend answers at once.
+    Queries containing "stall" hang on every backend.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    backends = {host: name for name, host in SEARCH_HOSTS.items()}
+    bodies = {
+        'bing': (synthetic_results_page('bing', 3), 'text/html'),
+        'google': (synthetic_results_page('google', 3, seed=1), 'text/html'),
+        'duckduckgo': (json.dumps({'AbstractText': "Answer from duckduckgo."}).encode(), 'application/json'),
+        'wikipedia': (json.dumps({'query': {'pages': [{'title': 'Stub', 'index': 1, 'extract': "Answer from wikipedia.",
+                                                       'fullurl': 'https://en.wikipedia.org/wiki/Stub'}]}}).encode(),
+                      'application/json')
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            backend = backends.get(self.path.split('/')[1], '')
+            behaviour = self.server.behaviour.get(backend)
+            if behaviour == 'hang' or 'stall' in self.path:
+                time.sleep(hang)
+            if behaviour == 'fail' or backend not in bodies:
+                self.send_response(500)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body, content_type = bodies[backend]
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        behaviour: Dict[str, str] = {}
+
+        def handle_error(self, request, client_address):
+            # Abandoned backends close their connection mid-answer
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _RoutedTransport:
+    """Sends every request to the local search stub instead of the real host"""
+
+    def __init__(self, transport, base: str):
+        self.transport = transport
+        self.base = base
+
+    def get(self, url: str, **kwargs):
+        from urllib.parse import urlparse
+
+        parts = urlparse(url)
+        return self.transport.get(f"{self.base}/{parts.netloc}{parts.path}", **kwargs)
+
+
+def bench_search(deadline: float = 1.0, hang: float = 2.0, stalls: int = 3) -> Dict:
+    """Concurrent search against stub backends that answer, fail or hang"""
+    import threading
+    import web_search
+    from transport import HttpTransport
+
+    server = _search_stub(hang)
+    # A hanging backend has to be cut off by the search deadline, not by the HTTP timeout
+    transport = _RoutedTransport(HttpTransport(timeout=hang + 1), f"http://127.0.0.1:{server.server_address[1]}")
+    saved = (web_search.SEARCH_DEADLINE, web_search.CACHE_ENABLED)
+    web_search.SEARCH_DEADLINE, web_search.CACHE_ENABLED = deadline, False
+    try:
+        searcher = web_search.WebSearcher()
+        searcher.transport = searcher.wikipedia.transport = transport
+
+        print(f"🧪 Concurrent search over stub backends, {deadline:.1f}s deadline, hanging backends take {hang:.1f}s")
+        results = []
+        for description, behaviour, expected, bounded in SEARCH_SCENARIOS:
+            server.behaviour = behaviour
+            start = time.perf_counter()
+            result = searcher._search_web_concurrent(f"stub query {len(results)}")
+            elapsed = time.perf_counter() - start
+
+            summary = result.get('summary', '')
+            answered = None
+            if result.get('success'):
+                answered = next((name for name in ('duckduckgo', 'wikipedia') if f"from {name}" in summary), 'bing')
+            # Waiting on a hung backend may use the whole deadline, but no more; otherwise answer well inside it
+            limit = deadline + 0.25 if bounded else deadline / 2
+            ok = answered == expected and elapsed <= limit
+            results.append({'scenario': description, 'answered': answered, 'seconds': elapsed, 'ok': ok})
+            verdict = 'ok' if ok else f"expected {expected or 'no answer'} within {limit * 1000:.0f}ms"
+            print(f"   {description:<24} {answered or 'no answer':<12} {elapsed * 1000:7.0f}ms  {verdict}")
+
+        # Searches stalled on every backend must leave workers for the next one
+        server.behaviour = {}
+        stalled = [threading.Thread(target=searcher._search_web_concurrent, args=(f"stall {i}",), daemon=True)
+                   for i in range(stalls)]
+        for thread in stalled:
+            thread.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        answered = searcher._search_web_concurrent("fresh query").get('success', False)
+        elapsed = time.perf_counter() - start
+        for thread in stalled:
+            thread.join()
+        ok = answered and elapsed <= deadline / 2
+        results.append({'scenario': f"{stalls} stalled searches", 'answered': answered, 'seconds': elapsed, 'ok': ok})
+        verdict = 'ok' if ok else f"expected an answer within {deadline / 2 * 1000:.0f}ms"
+        print(f"   {f'next to {stalls} stalled':<24} {'bing' if answered else 'no answer':<12} "
+              f"{elapsed * 1000:7.0f}ms  {verdict}")
+
+        workers = sum(1 for thread in threading.enumerate() if thread.name.startswith('search'))
+        print(f"   search worker threads: {workers} (pool of {web_search.SEARCH_WORKERS})")
+    finally:
+        web_search.SEARCH_DEADLINE, web_search.CACHE_ENABLED = saved
+        server.shutdown()
+        server.server_close()
+
+    return {'scenarios': results, 'failed': sum(not r['ok'] for r in results), 'workers': workers,
+            'pool': web_search.SEARCH_WORKERS}
+
+
+def synthetic_feed(items: int = 60, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    words = ['market', 'launch', 'climate', 'robot', 'election', 'vaccine', 'chip', 'satellite', 'merger', 'storm']
+    entries = "".join(
+        f"<item><title>{' '.join(rng.choice(words) for _ in range(6)).capitalize()} {i}</title>"
+        f"<description><![CDATA[{' '.join(rng.choice(words) for _ in range(40))}]]></description>"
+        f"<link>https://example.com/news/{i}</link><guid>https://example.com/news/{i}</guid>"
+        f"<pubDate>Mon, 01 Jan 2024 00:{i % 60:02d}:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">'
+            f"<channel><title>Example News</title><link>https://example.com</link>{entries}</channel></rss>").encode()
+
+
+def _feed_server(feeds: Dict[str, bytes]):
+    """Local server for RSS fixtures that honours If-None-Match / If-Modified-Since and counts body bytes"""
+    import hashlib
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    last_modified = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            body = feeds.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            self.server.requests += 1
+            if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == last_modified:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+                self.server.bytes_sent += len(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading after the items it needed
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        requests = 0
+        bytes_sent = 0
+
+        def handle_error(self, request, client_address):
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_news(items: int = 60, repeat: int = 20) -> Dict:
+    import requests
+    from news_feed import NewsFeeds
+    from transport import HttpTransport
+
+    feed = synthetic_feed(items)
+    server = _feed_server({'/technology.xml': feed})
+    url = f"http://127.0.0.1:{server.server_address[1]}/technology.xml"
+    transport = HttpTransport(backoff=0)
+    try:
+        legacy_titles, legacy_time = None, float('inf')
+        try:
+            from bs4 import BeautifulSoup
+
+            for _ in range(repeat):
+                start = time.perf_counter()
+                soup = BeautifulSoup(requests.get(url, timeout=5).content, 'xml')
+                legacy_titles = [item.title.text for item in soup.find_all('item')[:5]]
+                legacy_time = min(legacy_time, time.perf_counter() - start)
+        except ImportError:
+            print("⚠️ BeautifulSoup not installed; skipping the old fetcher")
+
+        first_time = float('inf')
+        for _ in range(repeat):
+            news = NewsFeeds({'technology': url}, transport=transport, items=5)
+            start = time.perf_counter()
+            news.refresh('technology')
+            first_time = min(first_time, time.perf_counter() - start)
+        titles = [item['title'] for item in news.headlines('technology')]
+
+        server.requests = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            news.refresh('technology')
+        conditional_time = (time.perf_counter() - start) / repeat
+        not_modified = news.counters['not_modified']
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            news.headlines('technology')
+        memory_time = (time.perf_counter() - start) / repeat
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+    expected = legacy_titles or titles
+    print(f"🧪 RSS headlines from a local feed server ({len(feed) / 1024:.0f} KB, {items} items, best of {repeat})")
+    if legacy_titles:
+        print(f"   full download + BeautifulSoup: {legacy_time * 1000:.2f}ms")
+    print(f"   first fetch, iterparse of 5 items: {first_time * 1000:.2f}ms")
+    print(f"   conditional recheck: {conditional_time * 1000:.2f}ms ({not_modified}/{repeat} answered 304)")
+    print(f"   answered from memory: {memory_time * 1000000:.1f}µs")
+    print(f"   same headlines: {'yes' if titles == expected else 'no'}")
+    return {'legacy': legacy_time, 'first': first_time, 'conditional': conditional_time,
+            'memory': memory_time, 'not_modified': not_modified, 'match': titles == expected}
+
+
+FAST_COMMANDS = ["what time is it", "what's the date", "hello", "help", "what can you do",
+                 "volume up", "set volume to 40", "mute", "what day is it", "good morning"]
+
+
+def _private_history(actions):
+    """Give the speculator an in-memory history, so synthetic commands never reach the user's"""
+    from prediction import TransitionModel
+
+    if actions.speculator is not None:
+        actions.speculator.model = TransitionModel(path=None)
+        actions.speculator._leads.clear()
+
+
+def bench_fastpath(repeat: int = 500) -> Dict:
+    from actions import ActionHandler
+    from audio_control import PulseVolumeController
+    from system_actions import SystemController
+
+    actions = ActionHandler()
+    _private_history(actions)
+    actions._system = SystemController()
+    # Volume answers inline once a native interface is open; use the in-memory Pulse server
+    actions._system.os_type = 'linux'
+    actions._system._audio_controller = PulseVolumeController(client=FakePulseServer())
+
+    def timed(dispatch) -> List[float]:
+        samples = []
+        for i in range(repeat):
+            command = FAST_COMMANDS[i % len(FAST_COMMANDS)]
+            start = time.perf_counter()
+            dispatch(command)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    def pooled(command: str) -> Dict:
+        intent, entities = actions.nlp.extract_intent(command)
+        return actions.executor.run(intent, actions.action_registry[intent], entities)
+
+    inline = timed(actions.process_command)
+    via_pool = timed(pooled)
+    untouched = actions._web_searcher is None
+    actions.executor.shutdown()
+
+    result = {}
+    print(f"🧪 Local intents, {repeat} commands")
+    for label, samples in (('fast path', inline), ('worker pool', via_pool)):
+        result[label] = {'p50': _percentile(samples, 50), 'p99': _percentile(samples, 99)}
+        print(f"   {label:<12} p50 {result[label]['p50'] * 1000000:7.1f}µs  p99 {result[label]['p99'] * 1000000:7.1f}µs")
+    result['network_untouched'] = untouched
+    print(f"   web searcher created: {'no' if untouched else 'yes'}")
+    # Inline dispatch only pays off while it is well clear of a pool round trip
+    result['faster'] = result['fast path']['p50'] * 2 <= result['worker pool']['p50']
+    print(f"   fast path at least twice as fast as the pool: {'yes' if result['faster'] else 'no'}")
+    return result
+
+
+def synthetic_session(commands: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """A repetitive command stream: (intent, subject) pairs with habitual follow-ups and some noise"""
+    rng = random.Random(seed)
+    topics = ['python', 'mercury', 'jazz', 'ada lovelace', 'black holes', 'rust']
+    session = []
+    while len(session) < commands:
+        roll = rng.random()
+        if roll < 0.35:
+            topic = rng.choice(topics)
+            session.append(('web_search', topic))
+            if rng.random() < 0.7:
+                session.append(('wikipedia', topic))
+        elif roll < 0.6:
+            session.append(('open_app', 'spotify'))
+            if rng.random() < 0.8:
+                session.append(('spotify_control', 'play'))
+        elif roll < 0.8:
+            session.append(('time', None))
+        else:
+            session.append(('volume_control', rng.choice(['up', 'down'])))
+    return session[:commands]
+
+
+def bench_prediction(commands: int = 400, cost_ms: float = 50.0) -> Dict:
+    """Replay a synthetic session through the Speculator with warmers that make the next command free"""
+    from prediction import Speculator, TransitionModel
+
+    cost = cost_ms / 1000
+    warm = set()
+
+    def warmer(intent: str, subject_from_entities: bool):
+        def run(entities: Dict):
+            time.sleep(cost)
+            subject = entities.get('query') if subject_from_entities else None
+            warm.add((intent, subject))
+            return subject
+        return run
+
+    warmers = {'wikipedia': warmer('wikipedia', True), 'spotify_control': warmer('spotify_control', False),
+               'volume_control': warmer('volume_control', False), 'web_search': warmer('web_search', False)}
+    speculator = Speculator(TransitionModel(path=None), warmers)
+
+    cold = warm_hits = 0
+    for intent, subject in synthetic_session(commands):
+        entities = {'query': subject} if subject else {}
+        speculator.command(intent, entities)
+        key = (intent, subject if intent == 'wikipedia' else None)
+        if intent in warmers:
+            if key in warm:
+                warm_hits += 1
+            else:
+                cold += 1
+        warm.clear()
+        speculator.speculate(intent, entities)
+        # The user takes a moment to say the next command
+        speculator.wait_idle(0.5)
+
+    speculator.wait_idle(0.5)
+    speculator.stop()
+    stats = speculator.stats()
+    print(f"🧪 Speculative warming over a synthetic {commands}-command session ({cost_ms:.0f}ms per warm-up)")
+    print(f"   warmable commands found ready: {warm_hits}/{warm_hits + cold}")
+    print(f"   speculations: {stats['speculated']} ({stats['used']} used, {stats['wasted']} wasted, "
+          f"{stats['skipped']} skipped while suppressed)")
+    print(f"   time spent on wasted warm-ups: {stats['wasted_seconds']:.2f}s")
+    stats['ready'] = warm_hits
+    stats['cold'] = cold
+    return stats
+
+
+TRACED_COMMANDS = ["what time is it", "what's the date", "hello", "help"]
+
+
+class _ListSource:
+    """Pipeline source that yields already recognized commands"""
+
+    realtime = False
+    produces_text = True
+
+    def __init__(self, commands: List[str]):
+        self._commands = list(commands)
+        self.exhausted = not self._commands
+
+    def capture(self) -> Optional[str]:
+        command = self._commands.pop(0) if self._commands else None
+        self.exhausted = not self._commands
+        return command
+
+
+def bench_tracing(commands: int = 200) -> Dict:
+    """Run local commands through the pipeline, dispatcher and speech output with tracing off and on"""
+    import tempfile
+    from actions import ActionHandler
+    from pipeline import Pipeline
+    from tracing import JsonlExporter, WaterfallPrinter, get_tracer, otlp_payload
+    from tts import FakeTTSEngine, SpeechOutput
+
+    actions = ActionHandler()
+    _private_history(actions)
+    # Send one intent through the worker pool to check spans follow the command across threads
+    actions.fast_intents.discard('time')
+    output = SpeechOutput(FakeTTSEngine())
+    stream = [TRACED_COMMANDS[i % len(TRACED_COMMANDS)] for i in range(commands)]
+
+    def run() -> float:
+        pipeline = Pipeline(_ListSource(stream), None,
+                            lambda text: output.say(actions.process_command(text)['summary']))
+        start = time.perf_counter()
+        pipeline.start()
+        while not pipeline.is_drained():
+            time.sleep(0.001)
+        output.wait_until_done()
+        elapsed = time.perf_counter() - start
+        pipeline.stop()
+        return elapsed
+
+    class Collector:
+        def __init__(self):
+            self.traces = []
+
+        def export(self, trace):
+            self.traces.append(trace)
+
+    tracer = get_tracer()
+    saved = list(tracer.exporters)
+    collector = Collector()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'traces.jsonl')
+        try:
+            tracer.exporters[:] = []
+            untraced = run()
+            tracer.exporters[:] = [collector, JsonlExporter(path)]
+            traced = run()
+        finally:
+            tracer.exporters[:] = saved
+            actions.executor.shutdown()
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+
+    expected = {'command', 'capture', 'intent', 'handler', 'tts'}
+    incomplete = [t for t in collector.traces if not expected <= {span.name for span in t.spans}]
+    pooled = [t for t in collector.traces if t.root.attributes.get('text') == 'what time is it']
+    # The pooled handler's spans must still hang off the command that submitted it
+    detached = [t for t in pooled if any(span.parent_id not in {s.span_id for s in t.spans}
+                                         for span in t.spans if span is not t.root)]
+    payload = otlp_payload(collector.traces[0]) if collector.traces else {}
+    otlp_spans = sum(len(scope['spans']) for resource in payload.get('resourceSpans', [])
+                     for scope in resource['scopeSpans'])
+
+    print(f"🧪 Tracing over {commands} local commands, pipeline to speech output")
+    if pooled:
+        print(WaterfallPrinter().format(pooled[0]))
+    print(f"   traces exported: {len(collector.traces)}/{commands}, {len(lines)} JSONL spans, "
+          f"{otlp_spans} spans in the first OTLP payload")
+    print(f"   missing a stage: {len(incomplete)}, detached spans: {len(detached)}")
+    print(f"   per command: {untraced / commands * 1000:.3f}ms untraced, {traced / commands * 1000:.3f}ms traced")
+    return {'traces': len(collector.traces), 'spans': len(lines), 'incomplete': len(incomplete),
+            'detached': len(detached), 'untraced': untraced / commands, 'traced': traced / commands}
+
+
+REPLAY_COMMANDS = [
+    ("what time is it", 'time'), ("what's the date", 'date'), ("hello", 'greeting'),
+    ("what can you do", 'help'), ("open spotify", 'open_app'), ("pause spotify", 'spotify_control'),
+    ("next song", 'spotify_control'), ("close notepad", 'close_app'), ("volume up", 'volume_control'),
+    ("search for python tutorials", 'web_search'), ("tell me about black holes", 'web_search'),
+    ("wikipedia ada lovelace", 'wikipedia'), ("search for the latest science news", 'web_search'),
+    ("system info", 'system_info'), ("take a screenshot", 'screenshot'), ("list processes", 'list_processes')
+]
+
+
+def synthetic_corpus(directory: str) -> List[Dict]:
+    """One synthetic WAV per REPLAY_COMMANDS entry, laid out like recorded fixtures"""
+    import wave
+
+    for index, (text, intent) in enumerate(REPLAY_COMMANDS):
+        base = os.path.join(directory, f"{index:02d}")
+        with wave.open(base + '.wav', 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(synthetic_utterance(seed=index))
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(f"{text}\n{intent}\n")
+    return load_fixtures(directory)
+
+
+class _TranscriptRecognizer:
+    """Stands in for a speech recognizer: answers each fixture with its expected transcript"""
+
+    name = 'transcripts'
+    supports_streaming = False
+
+    def __init__(self, fixtures: List[Dict], latency: float = 0.0):
+        import hashlib
+        import speech_recognition as sr
+
+        self._sr = sr
+        self._hash = hashlib.sha1
+        self.latency = latency
+        recognizer = sr.Recognizer()
+        self.transcripts = {}
+        for fixture in fixtures:
+            with sr.AudioFile(fixture['path']) as source:
+                audio = recognizer.record(source)
+            self.transcripts[self._hash(audio.get_raw_data()).hexdigest()] = fixture['transcript']
+
+    def recognize(self, audio):
+        from recognizers import RecognitionResult
+
+        time.sleep(self.latency)
+        transcript = self.transcripts.get(self._hash(audio.get_raw_data()).hexdigest())
+        if not transcript:
+            raise self._sr.UnknownValueError()
+        return RecognitionResult(transcript, 1.0, self.name)
+
+
+class _MockBackend:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def _reply(self, summary: str) -> Dict:
+        self.calls += 1
+        time.sleep(self.latency)
+        return {'success': True, 'summary': summary}
+
+
+class _MockSystem(_MockBackend):
+    """SystemController stand-in: no processes, windows, audio or screenshots are touched"""
+
+    volume_is_native = False
+
+    def open_application(self, app_name: str) -> Dict:
+        return self._reply(f"Opening {app_name}.")
+
+    def close_application(self, app_name: str) -> Dict:
+        return self._reply(f"Closed {app_name}.")
+
+    def get_system_info(self) -> Dict:
+        return self._reply("CPU usage is 12 percent. Memory usage is 40 percent.")
+
+    def take_screenshot(self) -> Dict:
+        return self._reply("Screenshot saved.")
+
+    def control_volume(self, action: str, level=None) -> Dict:
+        return self._reply(f"Volume {action}.")
+
+    def control_spotify(self, action: str, query: str = "") -> Dict:
+        return self._reply(f"Spotify {action}.")
+
+    def list_running_processes(self) -> Dict:
+        return self._reply("There are 120 processes running.")
+
+    def prepare_application(self, app_name: str) -> bool:
+        return True
+
+    def prepare_media(self) -> bool:
+        return True
+
+    def prepare_volume(self) -> bool:
+        return True
+
+
+class _MockWebSearcher(_MockBackend):
+    """WebSearcher stand-in that answers without the network"""
+
+    cache = None
+
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self.transport = self
+
+    def warmup(self, hosts=None):
+        pass
+
+    def search_web(self, query: str) -> Dict:
+        return self._reply(f"Here is what I found about {query}. It is a well known topic.")
+
+    def search_wikipedia(self, query: str) -> Dict:
+        return self._reply(f"According to Wikipedia, {query} is notable. More in the article.")
+
+    def get_news_headlines(self, topic: str = 'technology') -> Dict:
+        return self._reply(f"Here are the latest {topic} headlines. First. Second. Third.")
+
+    def cache_stats(self) -> Dict:
+        return {}
+
+    def transport_stats(self) -> Dict:
+        return {}
+
+
+def _replay_stats(samples: List[float]) -> Dict:
+    return {'p50': _percentile(samples, 50), 'p95': _percentile(samples, 95), 'p99': _percentile(samples, 99)}
+
+
+def bench_replay(fixtures_dir: Optional[str] = None, repeat: int = 5, recognizer: str = 'transcripts',
+                 recognition_ms: float = 0.0, backend_ms: float = 0.0, baseline: Optional[str] = None,
+                 save: Optional[str] = None, tolerance: float = 0.2, verbose: bool = False) -> Dict:
+    """Replay recorded utterances through AetheraAssistant with fake TTS and mocked system and network backends.
+
+    End-to-end latency runs from the end of capture until the answer has been
+    spoken, so it includes any wait behind earlier utterances in the queues.
+    """
+    import contextlib
+    import io
+    import tempfile
+    import main as assistant_main
+    from prediction import TransitionModel
+    from recognizers import create_recognizer
+    from tracing import get_tracer
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = load_fixtures(fixtures_dir) if fixtures_dir else synthetic_corpus(directory)
+        fixtures = [f for f in fixtures if f['transcript']]
+        if not fixtures:
+            print(f"❌ No WAV fixtures with transcripts found in {fixtures_dir}")
+            return {}
+        replayed = [fixture for _ in range(repeat) for fixture in fixtures]
+        expected = {fixture['transcript']: fixture['intent'] for fixture in fixtures}
+
+        # Nothing may reach the network in the background either
+        assistant_main.HTTP_WARMUP = False
+        assistant_main.NEWS_BACKGROUND_REFRESH = False
+
+        class Collector:
+            def __init__(self):
+                self.traces = []
+
+            def export(self, trace):
+                self.traces.append(trace)
+
+        tracer = get_tracer()
+        saved_exporters = list(tracer.exporters)
+        collector = Collector()
+        log = io.StringIO()
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(log)
+        try:
+            with output:
+                assistant = assistant_main.AetheraAssistant(audio_files=[f['path'] for f in replayed])
+                assistant.speech.backend = (_TranscriptRecognizer(fixtures, recognition_ms / 1000)
+                                            if recognizer == 'transcripts'
+                                            else create_recognizer(recognizer, assistant.speech.recognizer))
+                assistant.actions._system = _MockSystem(backend_ms / 1000)
+                assistant.actions._web_searcher = _MockWebSearcher(backend_ms / 1000)
+                # Learn transitions from this run only, and keep them out of the user's history
+                assistant.actions.speculator.model = TransitionModel(path=None)
+
+                tracer.exporters[:] = [collector]
+                start = time.perf_counter()
+                try:
+                    assistant.run()
+                except SystemExit:
+                    pass
+                wall = time.perf_counter() - start
+        finally:
+            tracer.exporters[:] = saved_exporters
+
+    latencies, stages, correct, errors = [], {}, 0, []
+    for trace in collector.traces:
+        spans = {span.name: span for span in trace.spans}
+        finish = max(span.end_ns for span in trace.spans)
+        latencies.append((finish - spans['capture'].end_ns) / 1e9)
+        for name in ('recognition', 'intent', 'handler', 'tts'):
+            if name in spans:
+                stages.setdefault(name, []).append(spans[name].duration)
+
+        text = trace.root.attributes.get('text', '')
+        reference = min(expected, key=lambda transcript: word_error_rate(transcript, text))
+        errors.append(word_error_rate(reference, text))
+        intent = spans['intent'].attributes.get('intent') if 'intent' in spans else None
+        correct += intent == expected[reference]
+
+    commands = len(replayed)
+    result = _replay_stats(latencies)
+    result['throughput'] = commands / wall
+    result['completed'] = len(collector.traces)
+    result['intent_accuracy'] = correct / commands
+    result['wer'] = sum(errors) / len(errors) if errors else 1.0
+
+    print(f"🧪 Replayed {commands} utterances ({len(fixtures)} distinct, {recognizer} recognizer, "
+          f"{backend_ms:.0f}ms mocked backends)")
+    print(f"   end-to-end   p50={result['p50'] * 1000:7.1f}ms  p95={result['p95'] * 1000:7.1f}ms  "
+          f"p99={result['p99'] * 1000:7.1f}ms")
+    for name, samples in stages.items():
+        summary = _replay_stats(samples)
+        print(f"   {name:<12} p50={summary['p50'] * 1000:7.1f}ms  p95={summary['p95'] * 1000:7.1f}ms  "
+              f"p99={summary['p99'] * 1000:7.1f}ms")
+    print(f"   throughput: {result['throughput']:.1f} commands/s, completed {result['completed']}/{commands}")
+    print(f"   intent accuracy: {result['intent_accuracy']:.1%}, WER {result['wer']:.1%}")
+
+    if save:
+        with open(save, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+        result['regressed'] = []
+        for key in ('p50', 'p95', 'p99'):
+            change = (result[key] - previous[key]) / previous[key] if previous.get(key) else 0.0
+            print(f"   {key}: {change:+.0%} vs baseline")
+            if change > tolerance:
+                result['regressed'].append(key)
+        change = (result['throughput'] - previous['throughput']) / previous['throughput'] if previous.get('throughput') else 0.0
+        print(f"   throughput: {change:+.0%} vs baseline")
+        if change < -tolerance:
+            result['regressed'].append('throughput')
+        print(f"   intent accuracy: {result['intent_accuracy'] - previous.get('intent_accuracy', 0.0):+.1%} vs baseline")
+        if result['intent_accuracy'] < previous.get('intent_accuracy', 0.0):
+            result['regressed'].append('intent_accuracy')
+
+    return result
+
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from main import AetheraAssistant
+imported = time.perf_counter()
+AetheraAssistant(audio_files=[])
+print('STARTUP', imported - start, time.perf_counter() - start)
+"""
+
+
+def import_times(module: str = 'main') -> List[Tuple[str, float, float]]:
+    """Parse `python -X importtime` into (module, self seconds, cumulative seconds)"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = []
+    for line in completed.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        if match:
+            times.append((match.group(4), int(match.group(1)) / 1e6, int(match.group(2)) / 1e6))
+    return times
+
+
+def _measure_startup() -> Dict:
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall = time.perf_counter() - start
+
+    for line in completed.stdout.splitlines():
+        if line.startswith('STARTUP'):
+            _, imported, ready = line.split()
+            return {'import': float(imported), 'ready': float(ready), 'process': wall}
+    raise RuntimeError(f"Startup run failed:\n{completed.stdout}{completed.stderr}")
+
+
+def bench_startup(runs: int = 5, top: int = 10, baseline: Optional[str] = None,
+                  save: Optional[str] = None, tolerance: float = 0.2) -> Dict:
+    samples = [_measure_startup() for _ in range(runs)]
+    result = {key: _percentile([sample[key] for sample in samples], 50) for key in ('import', 'ready', 'process')}
+
+    print(f"🧪 Startup over {runs} runs (median, headless)")
+    print(f"   import main: {result['import'] * 1000:.0f}ms")
+    print(f"   ready:       {result['ready'] * 1000:.0f}ms")
+    print(f"   process:     {result['process'] * 1000:.0f}ms (including interpreter start)")
+
+    times = import_times('main')
+    print(f"   Slowest imports by self time:")
+    for name, own, cumulative in sorted(times, key=lambda t: t[1], reverse=True)[:top]:
+        print(f"     {name:<40} self={own * 1000:6.1f}ms cumulative={cumulative * 1000:6.1f}ms")
+    result['modules'] = len(times)
+
+    if save:
+        with open(save, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+        result['regressed'] = []
+        for key in ('import', 'ready'):
+            change = (result[key] - previous[key]) / previous[key] if previous.get(key) else 0.0
+            print(f"   {key}: {change:+.0%} vs baseline")
+            if change > tolerance:
+                result['regressed'].append(key)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aethera performance benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    intents = subparsers.add_parser('intents', help="Compare legacy and prefix-indexed intent matching")
+    intents.add_argument('--size', type=int, default=5000)
+    intents.add_argument('--repeat', type=int, default=5)
+
+    recognition = subparsers.add_parser('recognizers', help="Compare recognizer latency and accuracy on WAV fixtures")
+    recognition.add_argument('--fixtures', required=True, help="Directory of name.wav + name.txt pairs")
+    recognition.add_argument('--backends', nargs='+', default=['google', 'vosk', 'vosk+google'])
+
+    endpointing = subparsers.add_parser('vad', help="Measure how much sooner the VAD ends utterances than a fixed pause")
+    endpointing.add_argument('--fixtures', help="Directory of WAV recordings (synthetic speech if omitted)")
+    endpointing.add_argument('--pause', type=float, default=3.0)
+
+    tts = subparsers.add_parser('tts', help="Sentence chunking, queue order and barge-in of speech output")
+    tts.add_argument('--ms-per-char', type=float, default=2.0)
+
+    wakeword = subparsers.add_parser('wakeword', help="Idle CPU cost and false accept/reject rates of wake word spotting")
+    wakeword.add_argument('--fixtures', help="WAV fixtures; transcripts starting with a wake word are positives")
+    wakeword.add_argument('--idle-seconds', type=float, default=60.0)
+    wakeword.add_argument('--max-idle-cpu', type=float, default=0.05, help="Highest idle CPU share of one core")
+    wakeword.add_argument('--max-false-accept', type=float, default=0.05)
+    wakeword.add_argument('--max-false-reject', type=float, default=0.1)
+
+    startup = subparsers.add_parser('startup', help="Import-time breakdown and wall-clock time until the assistant is ready")
+    startup.add_argument('--runs', type=int, default=5)
+    startup.add_argument('--top', type=int, default=10)
+    startup.add_argument('--baseline', help="JSON from an earlier --save run; fails on a regression")
+    startup.add_argument('--save', help="Write the results to this JSON file")
+    startup.add_argument('--tolerance', type=float, default=0.2, help="Allowed slowdown vs the baseline")
+
+    telemetry = subparsers.add_parser('telemetry', help="System info answer latency from the background sampler")
+    telemetry.add_argument('--answers', type=int, default=200)
+
+    processes = subparsers.add_parser('processes', help="Compare full process scans with the process index")
+    processes.add_argument('--size', type=int, default=5000)
+    processes.add_argument('--lookups', type=int, default=200)
+
+    media = subparsers.add_parser('media', help="Persistent MPRIS connection vs dbus-send, on a private bus")
+    media.add_argument('--commands', type=int, default=50)
+
+    volume = subparsers.add_parser('volume', help="Native PulseAudio volume control vs spawning pactl")
+    volume.add_argument('--commands', type=int, default=200)
+    volume.add_argument('--server', help="Pulse server address to test against instead of the fake server")
+
+    apps = subparsers.add_parser('apps', help="Application index build, refresh and lookup latency")
+    apps.add_argument('--executables', type=int, default=4000)
+    apps.add_argument('--desktop-files', type=int, default=1500)
+    apps.add_argument('--lookups', type=int, default=500)
+
+    screenshots = subparsers.add_parser('screenshots', help="Encode time and file size per screenshot format")
+    screenshots.add_argument('--width', type=int, default=3840)
+    screenshots.add_argument('--height', type=int, default=2160)
+    screenshots.add_argument('--repeat', type=int, default=3)
+
+    html = subparsers.add_parser('html', help="Parse time per results page, BeautifulSoup vs lxml selectors")
+    html.add_argument('--fixtures', help="Directory of saved bing*.html / google*.html pages (synthetic if omitted)")
+    html.add_argument('--repeat', type=int, default=5)
+
+    cache = subparsers.add_parser('cache', help="Answer cache hit accounting, latency saved and answer isolation")
+    cache.add_argument('--lookups', type=int, default=300)
+    cache.add_argument('--fetch-ms', type=float, default=20.0)
+
+    transport = subparsers.add_parser('transport', help="Pooled keep-alive transport vs a connection per request")
+    transport.add_argument('--requests', type=int, default=100)
+    transport.add_argument('--handshake-ms', type=float, default=30.0,
+                           help="Simulated connection setup cost on the local server")
+
+    wiki = subparsers.add_parser('wikipedia', help="Requests and latency per Wikipedia lookup, on a local API stub")
+    wiki.add_argument('--rtt-ms', type=float, default=40.0, help="Simulated server round trip per request")
+
+    search = subparsers.add_parser('search', help="Concurrent search deadline and fallthrough, on stub backends")
+    search.add_argument('--deadline', type=float, default=1.0)
+    search.add_argument('--hang', type=float, default=2.0)
+
+    news = subparsers.add_parser('news', help="Conditional, incremental RSS fetching vs full download and parse")
+    news.add_argument('--items', type=int, default=60)
+    news.add_argument('--repeat', type=int, default=20)
+
+    fastpath = subparsers.add_parser('fastpath', help="Dispatch latency of local intents, inline vs the worker pool")
+    fastpath.add_argument('--repeat', type=int, default=500)
+
+    prediction = subparsers.add_parser('prediction', help="Hit rate and waste of speculative warming on a synthetic session")
+    prediction.add_argument('--commands', type=int, default=400)
+    prediction.add_argument('--cost-ms', type=float, default=50.0)
+
+    tracing = subparsers.add_parser('tracing', help="Check every command stage is traced, and what tracing costs")
+    tracing.add_argument('--commands', type=int, default=200)
+
+    replay = subparsers.add_parser('replay', help="End-to-end latency, throughput and intent accuracy replaying "
+                                                   "recorded utterances through the assistant")
+    replay.add_argument('--fixtures', help="Directory of name.wav + name.txt (transcript, then intent); "
+                                           "synthetic commands if omitted")
+    replay.add_argument('--repeat', type=int, default=5)
+    replay.add_argument('--recognizer', default='transcripts',
+                        help="'transcripts' answers with the expected text; or a real backend such as 'vosk'")
+    replay.add_argument('--recognition-ms', type=float, default=0.0, help="Latency of the transcripts recognizer")
+    replay.add_argument('--backend-ms', type=float, default=0.0, help="Latency of the mocked system and web backends")
+    replay.add_argument('--baseline', help="Compare against results saved with --save")
+    replay.add_argument('--save', help="Write results to this JSON file")
+    replay.add_argument('--tolerance', type=float, default=0.2)
+    replay.add_argument('--verbose', action='store_true', help="Show the assistant's own output")
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'intents':
+        result = bench_intents(args.size, args.repeat)
+        return 1 if result['mismatches'] else 0
+
+    if args.benchmark == 'recognizers':
+        return 0 if bench_recognizers(args.fixtures, args.backends) else 1
+
+    if args.benchmark == 'vad':
+        result = bench_vad(args.fixtures, args.pause)
+        return 0 if result and not result['undetected'] and not result['late'] else 1
+
+    if args.benchmark == 'tts':
+        result = bench_tts(args.ms_per_char / 1000)
+        return 0 if all(result['checks'].values()) else 1
+
+    if args.benchmark == 'wakeword':
+        result = bench_wakeword(args.fixtures, args.idle_seconds, args.max_idle_cpu,
+                                args.max_false_accept, args.max_false_reject)
+        return 1 if result['failures'] else 0
+
+    if args.benchmark == 'telemetry':
+        result = bench_telemetry(args.answers)
+        return 0 if result['answered'] and not result['foreground_calls'] and result['p99'] < 0.01 else 1
+
+    if args.benchmark == 'processes':
+        result = bench_processes(args.size, args.lookups)
+        return 1 if result['mismatch'] or not result.get('reuse_detected', True) else 0
+
+    if args.benchmark == 'media':
+        result = bench_media(args.commands)
+        return 0 if not result or result['state_tracked'] else 1
+
+    if args.benchmark == 'volume':
+        bench_volume(args.commands, args.server)
+        return 0
+
+    if args.benchmark == 'apps':
+        result = bench_apps(args.executables, args.desktop_files, args.lookups)
+        return 1 if result['unsafe'] else 0
+
+    if args.benchmark == 'screenshots':
+        bench_screenshots(args.width, args.height, args.repeat)
+        return 0
+
+    if args.benchmark == 'html':
+        result = bench_html(args.fixtures, args.repeat)
+        return 1 if not result or result['mismatches'] else 0
+
+    if args.benchmark == 'cache':
+        result = bench_cache(args.lookups, fetch_ms=args.fetch_ms)
+        checks = ('counted', 'isolated', 'batched', 'distinct_keys', 'survived')
+        return 0 if all(result[check] for check in checks) and result['disk_hits'] == result['distinct'] else 1
+
+    if args.benchmark == 'transport':
+        result = bench_transport(args.requests, args.handshake_ms)
+        return 0 if result['retried'] and result['bounded'] and result['stats']['connections'] == 1 else 1
+
+    if args.benchmark == 'wikipedia':
+        result = bench_wikipedia(args.rtt_ms)
+        return 1 if result['wrong'] else 0
+
+    if args.benchmark == 'search':
+        result = bench_search(args.deadline, args.hang)
+        return 1 if result['failed'] or result['workers'] > result['pool'] else 0
+
+    if args.benchmark == 'news':
+        result = bench_news(args.items, args.repeat)
+        return 0 if result['match'] and result['not_modified'] == args.repeat else 1
+
+    if args.benchmark == 'fastpath':
+        result = bench_fastpath(args.repeat)
+        return 0 if result['faster'] and result['fast path']['p99'] < 0.001 and result['network_untouched'] else 1
+
+    if args.benchmark == 'prediction':
+        bench_prediction(args.commands, args.cost_ms)
+        return 0
+
+    if args.benchmark == 'tracing':
+        result = bench_tracing(args.commands)
+        return 0 if result['traces'] == args.commands and not result['incomplete'] and not result['detached'] else 1
+
+    if args.benchmark == 'replay':
+        result = bench_replay(args.fixtures, args.repeat, args.recognizer, args.recognition_ms, args.backend_ms,
+                              args.baseline, args.save, args.tolerance, args.verbose)
+        return 1 if not result or result.get('regressed') else 0
+
+    if args.benchmark == 'startup':
+        result = bench_startup(args.runs, args.top, args.baseline, args.save, args.tolerance)
+        return 1 if result.get('regressed') else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
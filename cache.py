@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import CACHE_DB_PATH, CACHE_MEMORY_ITEMS, CACHE_DISK_ITEMS, CACHE_TTL
+
+class ResultCache:
+    """Two-level answer cache: an in-memory LRU in front of an SQLite store.
+
+    Both levels hold answers JSON-encoded, so every get() returns a fresh
+    copy and callers can't change a cached answer by editing the result.
+    Disk hits note their access time in memory; it is written with the next
+    store, so a read never waits on a commit.
+    """
+
+    # Pending access times are flushed on their own once this many build up
+    TOUCH_BATCH = 64
+
+    def __init__(self, db_path: str = CACHE_DB_PATH, memory_items: int = CACHE_MEMORY_ITEMS,
+                 disk_items: int = CACHE_DISK_ITEMS, ttl: Optional[Dict[str, float]] = None):
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.ttl = dict(CACHE_TTL if ttl is None else ttl)
+
+        self._memory = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        self._db = None
+        if db_path:
+            try:
+                directory = os.path.dirname(db_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS answers ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS answers_accessed ON answers (accessed_at)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Answer cache running in memory only: {e}")
+                self._db = None
+
+    def normalize(self, query: str) -> str:
+        """Normalize a query so case, spacing and a closing ?/!/. share a cache entry.
+
+        Other punctuation is kept: "c++", "c#" and "c" are different questions.
+        """
+        return " ".join(query.lower().split()).rstrip("?!. ")
+
+    def _key(self, source: str, query: str) -> str:
+        return f"{source}:{self.normalize(query)}"
+
+    def get(self, source: str, query: str) -> Optional[Dict]:
+        key = self._key(source, query)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, encoded = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return json.loads(encoded)
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM answers WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and row[1] > now:
+                        self._touch(key, now)
+                        self._remember(key, row[1], row[0])
+                        self._counters['disk_hits'] += 1
+                        return json.loads(row[0])
+                except (sqlite3.Error, ValueError) as e:
+                    # A locked or damaged store is a miss, not a failed search
+                    print(f"⚠️ Couldn't read cached answer: {e}")
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, source: str, query: str, value: Dict):
+        ttl = self.ttl.get(source)
+        if not ttl:
+            return
+
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Couldn't cache answer: {e}")
+            return
+
+        key = self._key(source, query)
+        now = time.time()
+        expires_at = now + ttl
+
+        with self._lock:
+            self._remember(key, expires_at, encoded)
+            self._counters['stores'] += 1
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO answers (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, encoded, expires_at, now)
+                    )
+                    self._flush_touched()
+                    self._evict_disk(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Couldn't persist cached answer: {e}")
+
+    def _touch(self, key: str, now: float):
+        self._touched[key] = now
+        if len(self._touched) >= self.TOUCH_BATCH:
+            self._flush_touched()
+            self._db.commit()
+
+    def _flush_touched(self):
+        """Write the access times of disk hits since the last flush, for LRU eviction"""
+        if self._touched:
+            self._db.executemany("UPDATE answers SET accessed_at = ? WHERE key = ?",
+                                 [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+
+    def _remember(self, key: str, expires_at: float, encoded: str):
+        self._memory[key] = (expires_at, encoded)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then the least recently used ones beyond the size bound"""
+        self._db.execute("DELETE FROM answers WHERE expires_at <= ?", (now,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()
+        overflow = count - self.disk_items
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY accessed_at LIMIT ?)", (overflow,)
+            )
+            self._counters['evictions'] += overflow
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM answers")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Couldn't clear cached answers: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_touched()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Couldn't save cache access times: {e}")
+                self._db.close()
+                self._db = None
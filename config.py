@@ -5,17 +5,52 @@ load_dotenv()
 
 ASSISTANT_NAME = "Aethera"
 WAKE_WORDS = ["aethera", "hey aethera", "ok aethera"]
+
+# Only wake the full recognizer after a wake word. The local spotter can only
+# listen for words its model knows, so sound-alikes of "aethera" are included
+WAKE_WORD_REQUIRED = False
+WAKE_WORD_PHRASES = WAKE_WORDS + ["ether", "hey ether", "ok ether", "okay ether"]
 LISTENING_TIMEOUT = 5
 PHRASE_TIMEOUT = 10
 
+# "google", "vosk", or a chain such as "vosk+google" that only asks the
+# cloud when the local engine is less confident than RECOGNIZER_MIN_CONFIDENCE
+RECOGNIZER_BACKEND = "google"
+RECOGNIZER_MIN_CONFIDENCE = 0.6
+VOSK_MODEL_PATH = os.path.join("models", "vosk-model-small-en-us-0.15")
+
+# Streaming mode feeds microphone frames to the recognizer as they arrive and
+# dispatches short commands once the partial transcript settles
+STREAMING_RECOGNITION = False
+STREAMING_STABLE_SECONDS = 0.3
+
+# Voice activity detection: end an utterance after VAD_HANGOVER_MS of silence
+# instead of the recognizer's fixed 3 second pause
+VAD_ENABLED = True
+VAD_FRAME_MS = 30
+VAD_HANGOVER_MS = 500
+VAD_MIN_SPEECH_MS = 90
+VAD_PREROLL_MS = 300
+VAD_THRESHOLD_DB = 9.0
+VAD_MAX_ZCR = 0.35
+# Lowest noise floor the VAD will learn, in dB above one 16-bit sample step. Without it
+# a single frame of digital silence (e.g. a muted or reopened stream) drags the floor
+# towards -180 dB and every following frame looks like speech
+VAD_MIN_FLOOR_DB = 20.0
+
 TTS_RATE = 200
 TTS_VOLUME = 0.8
 TTS_VOICE_INDEX = 1
+TTS_STREAMING = True
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 
 SCREENSHOTS_DIR = "screenshots"
+SCREENSHOT_FORMAT = "png"
+SCREENSHOT_PNG_LEVEL = 1
+SCREENSHOT_QUALITY = 85
+SCREENSHOT_SCALE = 1.0
 DOWNLOADS_DIR = "downloads"
 
 CONFIRMATION_REQUIRED = [
@@ -23,4 +58,103 @@ CONFIRMATION_REQUIRED = [
 ]
 
 MAX_SEARCH_RESULTS = 3
-SEARCH_SUMMARY_LENGTH = 200
\ No newline at end of file
+SEARCH_SUMMARY_LENGTH = 200
+
+SEARCH_CONCURRENT = True
+SEARCH_DEADLINE = 6.0
+SEARCH_BACKEND_TIMEOUT = 10
+# Shared by every concurrent search. Backend requests never outlive their search's
+# deadline, and one search runs at most SEARCH_PARALLEL backends at a time, so a
+# few stalled searches can't occupy every worker
+SEARCH_WORKERS = 8
+SEARCH_PARALLEL = 2
+
+# One pooled HTTP client serves every search, Wikipedia and news request.
+# Connections to the warmup hosts are opened in the background at startup.
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 8
+HTTP_RETRIES = 2
+HTTP_BACKOFF = 0.3
+HTTP_WARMUP = True
+HTTP_WARMUP_HOSTS = [
+    "www.bing.com", "api.duckduckgo.com", "en.wikipedia.org", "feeds.bbci.co.uk"
+]
+
+WIKIPEDIA_API = "https://en.wikipedia.org/w/api.php"
+# Search results considered when the best match is a disambiguation page
+WIKIPEDIA_CANDIDATES = 5
+
+# Headlines are kept in memory and rechecked with conditional GETs in the background
+NEWS_FEEDS = {
+    'technology': "https://feeds.bbci.co.uk/news/technology/rss.xml",
+    'science': "https://feeds.bbci.co.uk/news/science_and_environment/rss.xml",
+    'business': "https://feeds.bbci.co.uk/news/business/rss.xml",
+    'world': "https://feeds.bbci.co.uk/news/world/rss.xml"
+}
+NEWS_ITEMS = 5
+NEWS_REFRESH_INTERVAL = 10 * 60
+NEWS_BACKGROUND_REFRESH = True
+
+CACHE_ENABLED = True
+CACHE_DB_PATH = os.path.join("cache", "answers.db")
+CACHE_MEMORY_ITEMS = 256
+CACHE_DISK_ITEMS = 5000
+CACHE_TTL = {
+    'web': 6 * 60 * 60,
+    'wikipedia': 7 * 24 * 60 * 60,
+    'wikipedia_article': 7 * 24 * 60 * 60
+}
+
+TELEMETRY_INTERVAL = 2.0
+TELEMETRY_RETENTION = 30 * 60
+TELEMETRY_TREND_SECONDS = 5 * 60
+
+PROCESS_INDEX_REFRESH = 1.0
+
+APP_INDEX_REFRESH = 5.0
+APP_MATCH_CUTOFF = 0.75
+# Never launched by voice, however the name was heard
+APP_BLOCKED_EXECUTABLES = ['shutdown', 'poweroff', 'reboot', 'halt', 'init', 'telinit', 'systemctl',
+                           'loginctl', 'suspend', 'hibernate', 'logoff', 'rundll32']
+
+VOLUME_STEP = 10
+AUDIO_SINK_CACHE_SECONDS = 30.0
+
+MPRIS_PLAYER = "spotify"
+MPRIS_TIMEOUT = 2.0
+
+# Handlers run on a worker pool; the assistant stops waiting after the intent's
+# deadline or as soon as a newer command is recognized
+ACTION_WORKERS = 4
+ACTION_DEADLINE = 10.0
+ACTION_DEADLINES = {
+    'web_search': SEARCH_DEADLINE + 2.0,
+    'wikipedia': 8.0,
+    'open_app': 5.0,
+    'close_app': 8.0,
+    'screenshot': 5.0,
+    'volume_control': 5.0,
+    'spotify_control': 6.0,
+    'system_info': 3.0,
+    'list_processes': 3.0
+}
+
+# Learn which command usually follows which and warm up for it in the background.
+# An intent stops being warmed while more than PREDICTION_MAX_WASTE of its last
+# PREDICTION_WASTE_WINDOW speculations went unused.
+PREDICTION_ENABLED = True
+PREDICTION_HISTORY_PATH = os.path.join("cache", "transitions.json")
+PREDICTION_MIN_SAMPLES = 3
+PREDICTION_MIN_PROBABILITY = 0.4
+PREDICTION_MAX_WASTE = 0.7
+PREDICTION_WASTE_WINDOW = 20
+PREDICTION_SAVE_EVERY = 10
+
+# Per-command latency traces. Spans go to a JSONL file and/or an OpenTelemetry
+# collector's OTLP/HTTP endpoint (e.g. "http://localhost:4318/v1/traces");
+# main.py --trace prints a waterfall for each command as well
+TRACE_JSONL_PATH = None
+TRACE_OTLP_ENDPOINT = None
+
+PIPELINE_QUEUE_SIZE = 4
+PIPELINE_METRICS_WINDOW = 200
\ No newline at end of file
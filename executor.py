@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from config import ACTION_WORKERS, ACTION_DEADLINE, ACTION_DEADLINES
+from pipeline import StageMetrics
+from tracing import get_tracer
+
+class ActionExecutor:
+    """Runs action handlers on a bounded worker pool.
+
+    The caller waits for the result up to the intent's deadline, or until
+    cancel() is called because a newer command arrived. Python threads can't
+    be killed, so a handler that overruns keeps its worker until it returns;
+    its result is then discarded and counted as late. Subprocess timeouts in
+    the handlers bound how long that can take.
+    """
+
+    def __init__(self, workers: int = ACTION_WORKERS, deadlines: Optional[Dict[str, float]] = None,
+                 default_deadline: float = ACTION_DEADLINE):
+        self.deadlines = dict(ACTION_DEADLINES if deadlines is None else deadlines)
+        self.default_deadline = default_deadline
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='action')
+        self._changed = threading.Condition()
+        self._generation = 0
+        self.queued = 0
+        self.running = 0
+        self.counters = {'completed': 0, 'timeouts': 0, 'cancelled': 0, 'late': 0, 'errors': 0}
+        self._latency: Dict[str, StageMetrics] = {}
+
+    def deadline(self, intent: str) -> float:
+        return self.deadlines.get(intent, self.default_deadline)
+
+    def cancel(self):
+        """Abandon every command still being waited on"""
+        with self._changed:
+            self._generation += 1
+            self._changed.notify_all()
+
+    def _call(self, intent: str, handler: Callable[[Dict], Dict], entities: Dict, job: Dict) -> Dict:
+        with self._changed:
+            self.queued -= 1
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            return handler(entities)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._changed:
+                self.running -= 1
+                self._latency.setdefault(intent, StageMetrics()).record(elapsed)
+                if job['abandoned']:
+                    self.counters['late'] += 1
+                job['finished'] = True
+                self._changed.notify_all()
+
+    def run(self, intent: str, handler: Callable[[Dict], Dict], entities: Dict) -> Dict:
+        """Run handler(entities) on the pool and wait for its result, a timeout, or cancellation"""
+        job = {'finished': False, 'abandoned': False}
+        with self._changed:
+            generation = self._generation
+            self.queued += 1
+        # The handler's spans belong to the command that submitted it
+        future = self._pool.submit(get_tracer().wrap(self._call), intent, handler, entities, job)
+
+        deadline = time.monotonic() + self.deadline(intent)
+        with self._changed:
+            while not job['finished'] and generation == self._generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+
+            if not job['finished']:
+                job['abandoned'] = True
+                if future.cancel():
+                    # Never started, so it will never reach _call to update the counts
+                    self.queued -= 1
+                if generation != self._generation:
+                    self.counters['cancelled'] += 1
+                    return {'success': False, 'cancelled': True, 'intent': intent,
+                            'summary': ''}
+                self.counters['timeouts'] += 1
+                return {'success': False, 'error': 'timeout', 'intent': intent,
+                        'summary': "That's taking too long, so I've stopped waiting for it."}
+
+        try:
+            result = future.result()
+        except Exception as e:
+            with self._changed:
+                self.counters['errors'] += 1
+            return {'success': False, 'error': str(e), 'summary': "I encountered an error processing your command."}
+
+        with self._changed:
+            self.counters['completed'] += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._changed:
+            stats = dict(self.counters)
+            stats['queued'] = self.queued
+            stats['running'] = self.running
+            stats['intents'] = {intent: metrics.summary() for intent, metrics in self._latency.items()}
+        return stats
+
+    def report(self) -> str:
+        stats = self.stats()
+        lines = [f"⚙️ Actions: {stats['completed']} completed, {stats['timeouts']} timed out, "
+                 f"{stats['cancelled']} cancelled, {stats['late']} finished late, "
+                 f"{stats['queued']} queued, {stats['running']} running"]
+        for intent, summary in sorted(stats['intents'].items()):
+            lines.append(f"   {intent:<16} n={summary['count']:<4} mean={summary['mean']:.3f} "
+                         f"p95={summary['p95']:.3f} max={summary['max']:.3f}")
+        return "\n".join(lines)
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,87 @@
+import re
+from typing import Dict, List, Optional
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Everything engine-specific lives here. 'region' marks where the useful part of
+# the page starts; the head, inline styles and scripts before it are never parsed.
+SELECTORS = {
+    'bing': {
+        'region': b'id="b_content"',
+        'results': f"//li[{_has_class('b_algo')}]",
+        'title': "(.//h2)[1]",
+        'snippet': "(.//p)[1]",
+        'answer': f"(//div[{_has_class('b_rs')}])[1]",
+    },
+    'google': {
+        'region': b'id="main"',
+        # Alternatives are tried in order until one matches
+        'featured': ["//div[@data-attrid='wa:/description']", "//span[@data-tts='answers']"],
+        'results': f"//*[self::div or self::span][{_has_class('BNeawe')} or {_has_class('VwiC3b')}]",
+    },
+}
+
+_compiled: Dict[str, Dict[str, object]] = {}
+
+def _selectors(engine: str) -> Dict[str, object]:
+    if engine not in _compiled:
+        from lxml import etree
+
+        _compiled[engine] = {
+            name: [etree.XPath(e) for e in (expression if isinstance(expression, list) else [expression])]
+            for name, expression in SELECTORS[engine].items() if name != 'region'
+        }
+    return _compiled[engine]
+
+def slice_region(content: bytes, marker: Optional[bytes]) -> bytes:
+    """Cut the page down to the tag containing marker and everything after it"""
+    if not marker:
+        return content
+    position = content.find(marker)
+    if position < 0:
+        return content
+    start = content.rfind(b'<', 0, position)
+    return content[start:] if start >= 0 else content
+
+class ResultPage:
+    """A parsed results page queried through the named selectors of one engine"""
+
+    def __init__(self, engine: str, root):
+        self.engine = engine
+        self.root = root
+        self._xpaths = _selectors(engine)
+
+    def nodes(self, name: str, context=None) -> List:
+        for xpath in self._xpaths[name]:
+            found = xpath(self.root if context is None else context)
+            if found:
+                return found
+        return []
+
+    def text(self, name: str, context=None) -> Optional[str]:
+        """Stripped text of the first node matching the selector, or None"""
+        found = self.nodes(name, context)
+        return found[0].text_content().strip() if found else None
+
+    @staticmethod
+    def node_text(node) -> str:
+        return node.text_content().strip()
+
+def parse_page(engine: str, content: bytes, encoding: Optional[str] = None) -> ResultPage:
+    """Parse the results region of a page, taking the encoding from its meta charset if not given"""
+    import lxml.html
+
+    if encoding is None:
+        # The <meta charset> is in the head, which slicing throws away
+        declared = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', content[:8192], re.IGNORECASE)
+        encoding = declared.group(1).decode('ascii') if declared else 'utf-8'
+
+    region = slice_region(content, SELECTORS[engine].get('region'))
+    parser = lxml.html.HTMLParser(encoding=encoding)
+    return ResultPage(engine, lxml.html.document_fromstring(region, parser=parser))
+
+def parse_response(engine: str, response) -> ResultPage:
+    # requests reports ISO-8859-1 for any text/html without a charset; only trust a declared one
+    declared = 'charset' in response.headers.get('content-type', '').lower()
+    return parse_page(engine, response.content, response.encoding if declared else None)
@@ -1,18 +1,48 @@
 import sys
 import time
 import signal
-from typing import Dict, Optional
-from speech import SpeechHandler
+import argparse
+from typing import Dict, List, Optional
+from speech import SpeechHandler, StreamingSource
 from actions import ActionHandler
-from config import ASSISTANT_NAME, WAKE_WORDS
+from pipeline import Pipeline, PipelineMetrics, WavFileSource
+from tts import FakeTTSEngine
+from telemetry import get_sampler
+from transport import start_warmup
+from news_feed import get_news_feeds
+from tracing import get_tracer, WaterfallPrinter
+from config import ASSISTANT_NAME, WAKE_WORDS, STREAMING_RECOGNITION, HTTP_WARMUP, NEWS_BACKGROUND_REFRESH
 
 class AetheraAssistant:
-    def __init__(self):
+    def __init__(self, audio_files: Optional[List[str]] = None):
         print(f"🤖 Initializing {ASSISTANT_NAME} AI Assistant...")
         
         try:
-            self.speech = SpeechHandler()
+            # Replaying recordings runs headless: no microphone and no audio output
+            self.headless = audio_files is not None
+            if self.headless:
+                self.speech = SpeechHandler(tts_engine=FakeTTSEngine(), use_microphone=False)
+                source = WavFileSource(audio_files)
+            else:
+                self.speech = SpeechHandler()
+                source = self.speech
+            
             self.actions = ActionHandler()
+            # Start sampling now so "system info" has history to answer from
+            get_sampler()
+            if HTTP_WARMUP:
+                # Connect to the search hosts now so the first question skips the handshakes
+                start_warmup()
+            if NEWS_BACKGROUND_REFRESH:
+                get_news_feeds().start()
+            
+            if not self.headless and STREAMING_RECOGNITION and self.speech.backend.supports_streaming:
+                source = StreamingSource(self.speech, self.actions.nlp.is_complete_command)
+            
+            self.metrics = PipelineMetrics()
+            self.pipeline = Pipeline(source, self.speech.recognize, self._process_text, self.metrics)
+            self.pipeline.on_recognized = self._on_recognized
+            self.speech.output.on_speech_start = lambda delay: self.metrics.record('speech', delay)
             
             self.is_listening = True
             self.awaiting_confirmation = False
@@ -29,9 +59,15 @@ class AetheraAssistant:
         self.speech.speak(f"Hello! {ASSISTANT_NAME} is now active and ready to assist you.")
         
         try:
-            while self.is_listening:
-                self._listen_and_process()
-                time.sleep(0.5)
+            self.pipeline.start()
+            
+            while self.is_listening and self.pipeline.is_running():
+                if self.headless and self.pipeline.is_drained():
+                    self.speech.output.wait_until_done()
+                    break
+                time.sleep(0.1)
+            
+            self._shutdown()
                 
         except KeyboardInterrupt:
             self._shutdown()
@@ -40,22 +76,23 @@ class AetheraAssistant:
             self.speech.speak("I encountered an unexpected error and need to restart.")
             self._shutdown()
     
-    def _listen_and_process(self):
+    def _on_recognized(self, text: str):
+        # A new command cuts off whatever is still being said or done
+        if self.speech.is_speaking():
+            self.speech.interrupt()
+        # Replayed recordings are queued ahead of time, so the next one is not a newer command
+        if getattr(self.pipeline.source, 'realtime', True):
+            self.actions.cancel()
+    
+    def _process_text(self, text: str):
         try:
-            success, text = self.speech.listen()
-            
-            if not success:
-                if "timeout" not in text.lower():
-                    print(f"⚠️ Listening issue: {text}")
-                return
-            
             if self.awaiting_confirmation:
                 self._handle_confirmation(text)
             else:
                 self._handle_command(text)
                 
         except Exception as e:
-            print(f"❌ Error in listen_and_process: {e}")
+            print(f"❌ Error processing command: {e}")
             self.speech.speak("I had trouble processing that command.")
     
     def _handle_command(self, text: str):
@@ -86,7 +123,7 @@ class AetheraAssistant:
                 intent, entities = self.actions.nlp.extract_intent(original_command_text)
                 
                 if intent in self.actions.action_registry:
-                    result = self.actions.action_registry[intent](entities)
+                    result = self.actions.execute(intent, entities)
                     self._handle_action_result(result)
                 else:
                     self.speech.speak("I couldn't process that command.")
@@ -110,9 +147,14 @@ class AetheraAssistant:
                 self.speech.speak(result.get('summary', 'Do you want me to proceed?'))
                 return
             
+            if result.get('cancelled'):
+                print(f"⏹️ Cancelled {result.get('intent', 'command')} for a newer command")
+                return
+            
             if result.get('stop_requested'):
                 self.speech.speak(result.get('summary', 'Goodbye!'))
-                self._shutdown()
+                # The main thread notices this and shuts the pipeline down
+                self.is_listening = False
                 return
             
             summary = result.get('summary', '')
@@ -131,7 +173,27 @@ class AetheraAssistant:
     def _shutdown(self):
         print(f"\n🔥 Shutting down {ASSISTANT_NAME}...")
         self.is_listening = False
-        self.speech.speak("Shutting down. Goodbye!")
+        self.pipeline.stop()
+        print(self.metrics.report())
+        print(self.actions.executor.report())
+        if self.actions.speculator is not None:
+            speculation = self.actions.speculator.stats()
+            if speculation['speculated']:
+                print(f"🔮 Speculation: {speculation['used']} used, {speculation['wasted']} wasted "
+                      f"({speculation['wasted_seconds']:.2f}s), {speculation['skipped']} skipped")
+        self.actions.shutdown()
+        
+        cache_stats = self.actions.cache_stats()
+        if cache_stats:
+            print(f"📦 Answer cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits, "
+                  f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+        
+        transport_stats = self.actions.transport_stats()
+        if transport_stats.get('requests'):
+            print(f"🌐 HTTP: {transport_stats['requests']} requests over {transport_stats['connections']} connections "
+                  f"({transport_stats['reuse_rate']:.0%} reused)")
+        
+        self.speech.speak("Shutting down. Goodbye!", block=True)
         print("👋 Goodbye!")
         sys.exit(0)
 
@@ -140,6 +202,16 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 def main():
+    parser = argparse.ArgumentParser(description=f"{ASSISTANT_NAME} AI desktop assistant")
+    parser.add_argument('--replay', nargs='+', metavar='WAV',
+                        help="Run headless, feeding recorded WAV files (or directories of them) instead of the microphone")
+    parser.add_argument('--trace', action='store_true',
+                        help="Print a latency waterfall of every command's stages")
+    args = parser.parse_args()
+    
+    if args.trace:
+        get_tracer().add_exporter(WaterfallPrinter())
+    
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
@@ -151,7 +223,7 @@ def main():
     print("=" * 50)
     
     try:
-        assistant = AetheraAssistant()
+        assistant = AetheraAssistant(audio_files=args.replay)
         assistant.run()
         
     except Exception as e:
@@ -0,0 +1,191 @@
+import threading
+from typing import Dict, Optional
+from config import MPRIS_PLAYER, MPRIS_TIMEOUT
+
+class MediaPlayerUnavailable(Exception):
+    """The MPRIS player is not on the bus, usually because it is not running"""
+
+class _SignalSink:
+    """Queue stand-in that hands matched signals straight to a callback.
+
+    jeepney's router delivers filter matches with put_nowait() on its receiver
+    thread, so this avoids a second thread just to drain a queue.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def put_nowait(self, message):
+        try:
+            self.callback(message)
+        except Exception as e:
+            print(f"⚠️ Media signal handling failed: {e}")
+
+class MprisController:
+    """Controls an MPRIS media player over one long-lived session-bus connection.
+
+    The connection and signal subscriptions are set up on first use. Playback
+    state and track metadata are kept current from PropertiesChanged signals,
+    and commands are plain method calls with no process spawned per command.
+    """
+
+    OBJECT_PATH = '/org/mpris/MediaPlayer2'
+    PLAYER_INTERFACE = 'org.mpris.MediaPlayer2.Player'
+    COMMANDS = {'play': 'Play', 'pause': 'Pause', 'play_pause': 'PlayPause',
+                'next': 'Next', 'previous': 'Previous', 'stop': 'Stop'}
+
+    def __init__(self, player: str = MPRIS_PLAYER, bus: str = 'SESSION', timeout: float = MPRIS_TIMEOUT):
+        self.bus_name = f"org.mpris.MediaPlayer2.{player}"
+        self.bus = bus
+        self.timeout = timeout
+
+        self.playback_status: Optional[str] = None
+        self.metadata: Dict = {}
+        self.player_present = False
+
+        self._conn = None
+        self._router = None
+        self._bus = None
+        self._player = None
+        self._owner = None
+        self._filters = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        from jeepney import DBusAddress, MatchRule, message_bus
+        from jeepney.io.threading import DBusRouter, Proxy, open_dbus_connection
+
+        self._conn = open_dbus_connection(self.bus)
+        self._router = DBusRouter(self._conn)
+        self._player = DBusAddress(self.OBJECT_PATH, bus_name=self.bus_name, interface=self.PLAYER_INTERFACE)
+
+        properties_changed = MatchRule(type='signal', interface='org.freedesktop.DBus.Properties',
+                                       member='PropertiesChanged', path=self.OBJECT_PATH)
+        owner_changed = MatchRule(type='signal', sender='org.freedesktop.DBus', interface='org.freedesktop.DBus',
+                                  member='NameOwnerChanged', path='/org/freedesktop/DBus')
+        owner_changed.add_arg_condition(0, self.bus_name)
+
+        self._bus = Proxy(message_bus, self._router, timeout=self.timeout)
+        for rule, callback in ((properties_changed, self._on_properties_changed),
+                               (owner_changed, self._on_name_owner_changed)):
+            self._bus.AddMatch(rule)
+            self._filters.append(self._router.filter(rule, queue=_SignalSink(callback)))
+
+        self._load_state()
+
+    def _ensure_connected(self, reconnect: bool = False):
+        with self._lock:
+            if self._router is not None and not reconnect:
+                return
+            self._disconnect()
+            try:
+                self._connect()
+            except Exception:
+                self._disconnect()
+                raise
+
+    def _disconnect(self):
+        for handle in self._filters:
+            handle.close()
+        self._filters = []
+        if self._router is not None:
+            self._router.close()
+        if self._conn is not None:
+            self._conn.close()
+        self._router = None
+        self._conn = None
+        self._bus = None
+        self._player = None
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+    def _player_address(self):
+        player = self._player
+        if player is None:
+            raise MediaPlayerUnavailable(f"Not connected to the bus for {self.bus_name}")
+        return player
+
+    def _call(self, message):
+        from jeepney.wrappers import DBusErrorResponse, unwrap_msg
+
+        router = self._router
+        if router is None:
+            raise MediaPlayerUnavailable(f"Not connected to the bus for {self.bus_name}")
+        reply = router.send_and_get_reply(message, timeout=self.timeout)
+        try:
+            return unwrap_msg(reply)
+        except DBusErrorResponse as e:
+            if e.name in ('org.freedesktop.DBus.Error.ServiceUnknown',
+                          'org.freedesktop.DBus.Error.NameHasNoOwner'):
+                self.player_present = False
+                raise MediaPlayerUnavailable(f"{self.bus_name} is not running")
+            raise
+
+    def _load_state(self):
+        from jeepney import Properties
+        from jeepney.wrappers import DBusErrorResponse
+
+        # Signals carry the sender's unique name, so remember which one owns the player name
+        try:
+            self._owner = self._bus.GetNameOwner(self.bus_name)[0]
+            properties = self._call(Properties(self._player_address()).get_all())[0]
+        except (DBusErrorResponse, MediaPlayerUnavailable):
+            self._owner = None
+            self.player_present = False
+            self.playback_status = None
+            self.metadata = {}
+            return
+        self.player_present = True
+        self._apply_properties(properties)
+
+    def _apply_properties(self, changed: Dict):
+        if 'PlaybackStatus' in changed:
+            self.playback_status = changed['PlaybackStatus'][1]
+        if 'Metadata' in changed:
+            self.metadata = {key: value for key, (_, value) in changed['Metadata'][1].items()}
+
+    def _on_properties_changed(self, message):
+        from jeepney import HeaderFields
+
+        interface, changed, _ = message.body
+        if interface == self.PLAYER_INTERFACE and message.header.fields.get(HeaderFields.sender) == self._owner:
+            self._apply_properties(changed)
+
+    def _on_name_owner_changed(self, message):
+        _, _, new_owner = message.body
+        self._owner = new_owner or None
+        self.player_present = bool(new_owner)
+        if not new_owner:
+            self.playback_status = None
+            self.metadata = {}
+
+    def send(self, action: str):
+        """Run a playback command such as 'play', 'pause', 'next' or 'previous'"""
+        from jeepney import new_method_call
+        from jeepney.io.threading import RouterClosed
+
+        if action not in self.COMMANDS:
+            raise ValueError(f"Unknown media action: {action}")
+
+        self._ensure_connected()
+        try:
+            self._call(new_method_call(self._player_address(), self.COMMANDS[action]))
+        except (RouterClosed, OSError):
+            # The bus connection dropped (e.g. session restart); reconnect once and retry
+            self._ensure_connected(reconnect=True)
+            self._call(new_method_call(self._player_address(), self.COMMANDS[action]))
+
+    def status(self) -> Optional[str]:
+        """Last known PlaybackStatus ('Playing', 'Paused', 'Stopped'), or None if the player is gone"""
+        self._ensure_connected()
+        return self.playback_status
+
+    def current_track(self) -> Optional[str]:
+        self._ensure_connected()
+        title = self.metadata.get('xesam:title')
+        artists = self.metadata.get('xesam:artist') or []
+        if not title:
+            return None
+        return f"{title} by {', '.join(artists)}" if artists else title
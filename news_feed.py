@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from config import NEWS_FEEDS, NEWS_ITEMS, NEWS_REFRESH_INTERVAL
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+def parse_items(stream, limit: int) -> List[Dict[str, str]]:
+    """Title and description of the first `limit` RSS <item> elements, reading no further than needed"""
+    from xml.etree.ElementTree import iterparse
+
+    items = []
+    for _, element in iterparse(stream, events=('end',)):
+        if _local_name(element.tag) != 'item':
+            continue
+        fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+        items.append({'title': fields.get('title') or "No title", 'description': fields.get('description', '')})
+        element.clear()
+        if len(items) >= limit:
+            break
+    return items
+
+class FeedState:
+    def __init__(self, url: str):
+        self.url = url
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.items: List[Dict[str, str]] = []
+        self.checked_at = 0.0
+
+class NewsFeeds:
+    """RSS headlines per topic, kept in memory and refreshed with conditional GETs.
+
+    Each feed remembers its ETag and Last-Modified, so an unchanged feed costs
+    a 304 with no body. Changed feeds are stream-parsed only up to the first
+    NEWS_ITEMS items. A background thread rechecks every configured topic each
+    NEWS_REFRESH_INTERVAL, so news commands are normally answered from memory.
+    """
+
+    def __init__(self, feeds: Optional[Dict[str, str]] = None, transport=None,
+                 items: int = NEWS_ITEMS, refresh_interval: float = NEWS_REFRESH_INTERVAL):
+        self.feeds = {topic: FeedState(url) for topic, url in (feeds or NEWS_FEEDS).items()}
+        self._transport = transport
+        self.items = items
+        self.refresh_interval = refresh_interval
+        self.counters = {'fetched': 0, 'not_modified': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            from transport import get_transport
+
+            self._transport = get_transport()
+        return self._transport
+
+    def topic(self, name: str) -> str:
+        """The configured topic for name; unknown topics fall back to the first feed"""
+        name = name.lower()
+        return name if name in self.feeds else next(iter(self.feeds))
+
+    def refresh(self, topic: str) -> bool:
+        """Recheck one feed; returns True if its items changed"""
+        feed = self.feeds[topic]
+        headers = {}
+        if feed.etag:
+            headers['If-None-Match'] = feed.etag
+        if feed.last_modified:
+            headers['If-Modified-Since'] = feed.last_modified
+
+        try:
+            response = self.transport.get(feed.url, headers=headers, stream=True)
+            if response.status_code == 304:
+                # Reading the empty body hands the connection back to the pool
+                response.content
+                with self._lock:
+                    feed.checked_at = time.monotonic()
+                    self.counters['not_modified'] += 1
+                return False
+
+            try:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                items = parse_items(response.raw, self.items)
+            finally:
+                # Items past the limit are never read; dropping the connection is cheaper than draining it
+                response.close()
+        except Exception:
+            with self._lock:
+                self.counters['errors'] += 1
+            raise
+
+        with self._lock:
+            feed.items = items
+            feed.etag = response.headers.get('ETag')
+            feed.last_modified = response.headers.get('Last-Modified')
+            feed.checked_at = time.monotonic()
+            self.counters['fetched'] += 1
+        return True
+
+    def headlines(self, topic: str) -> List[Dict[str, str]]:
+        """Current items for topic, fetching first only if they are missing or overdue"""
+        topic = self.topic(topic)
+        feed = self.feeds[topic]
+        # The background refresh normally keeps feeds well inside this
+        if not feed.items or time.monotonic() - feed.checked_at > 2 * self.refresh_interval:
+            try:
+                self.refresh(topic)
+            except Exception:
+                # Stale headlines are better than none; with nothing cached, let the caller report it
+                if not feed.items:
+                    raise
+        return list(feed.items)
+
+    def refresh_all(self):
+        for topic in self.feeds:
+            try:
+                self.refresh(topic)
+            except Exception as e:
+                print(f"⚠️ Refreshing {topic} news failed: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='news-refresh', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        self.refresh_all()
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh_all()
+
+_news: Optional[NewsFeeds] = None
+_news_lock = threading.Lock()
+
+def get_news_feeds() -> NewsFeeds:
+    """The process-wide feed store"""
+    global _news
+    with _news_lock:
+        if _news is None:
+            _news = NewsFeeds()
+        return _news
@@ -1,5 +1,87 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Built once at import; "help" is answered straight from this
+HELP_TEXT = "\n".join([
+    "🤖 AETHERA AI ASSISTANT - AVAILABLE COMMANDS",
+    "=" * 50,
+    "",
+    "🔍 WEB SEARCH & INFORMATION:",
+    '• "Search for [topic]" - Search the internet',
+    '• "What is [something]" - Get definitions/info',
+    '• "Tell me about [topic]" - General information',
+    '• "Look up [term]" - Find information online',
+    '• "Google [query]" - Web search',
+    "",
+    "📚 KNOWLEDGE & WIKIPEDIA:",
+    '• "Wikipedia [topic]" - Search Wikipedia',
+    '• "Wiki [subject]" - Wikipedia lookup',
+    '• "Summary of [topic]" - Get topic summary',
+    "",
+    "🎵 SPOTIFY MUSIC CONTROL:",
+    '• "Play Spotify" - Start Spotify playback',
+    '• "Pause Spotify" - Pause Spotify playback',
+    '• "Stop Spotify" - Stop Spotify playback',
+    '• "Resume Spotify" - Resume Spotify playback',
+    '• "Play [song/artist] on Spotify" - Search and play',
+    '• "Next song" - Skip to next track',
+    '• "Previous song" - Go to previous track',
+    '• "Play music" - Start music playback',
+    "",
+    "💻 SYSTEM CONTROL:",
+    '• "Open [app name]" - Launch applications',
+    '• "Close [app name]" - Close applications',
+    '• "Take a screenshot" - Capture screen',
+    '• "System information" - Get system specs',
+    '• "List processes" - Show running programs',
+    "",
+    "🔊 VOLUME CONTROL:",
+    '• "Set volume to [0-100]" - Set specific volume',
+    '• "Volume up" - Increase volume',
+    '• "Volume down" - Decrease volume',
+    '• "Mute" - Mute audio',
+    '• "Unmute" - Unmute audio',
+    "",
+    "⏰ TIME & DATE:",
+    '• "What time is it?" - Current time',
+    '• "What\'s the date?" - Current date',
+    '• "What day is it?" - Current day',
+    "",
+    "🌤️ WEATHER (Coming Soon):",
+    '• "Weather" - Local weather',
+    '• "Weather in [city]" - Weather for location',
+    "",
+    "👋 BASIC INTERACTIONS:",
+    '• "Hello" / "Hi" - Greet Aethera',
+    '• "Help" - Show this command list',
+    '• "What can you do?" - Show capabilities',
+    '• "Goodbye" / "Stop" - Exit Aethera',
+    "",
+    "🎯 EXAMPLE COMMANDS:",
+    '• "Search for Python programming tutorials"',
+    '• "Open Chrome"',
+    '• "Set volume to 75"',
+    '• "Play Spotify"',
+    '• "Pause Spotify"',
+    '• "Play some jazz music on Spotify"',
+    '• "What time is it?"',
+    '• "Take a screenshot"',
+    '• "Wikipedia artificial intelligence"',
+    '• "Close Spotify"',
+    "",
+    "💡 TIPS:",
+    "• Speak clearly and naturally",
+    "• You can use variations of these commands",
+    "• Say 'confirm' when asked for confirmation",
+    "• Say 'help' anytime to see this list",
+    "",
+    "🔧 TROUBLESHOOTING:",
+    "• If volume control doesn't work, try installing 'pycaw'",
+    "• For better Spotify control, install 'pywin32'",
+    "• Make sure apps are installed before opening them",
+    "",
+    "Ready to assist! Just say any command naturally."
+])
 
 class NLPProcessor:
     def __init__(self):
@@ -158,69 +240,155 @@ class NLPProcessor:
                 r'active processes'
             ]
         }
+        
+        self.compile_patterns()
     
-    def extract_intent(self, text: str) -> Tuple[str, Dict]:
-        text = text.lower().strip()
+    def compile_patterns(self):
+        """Precompile intent patterns and index them by their leading literal text"""
+        self._compiled_patterns = []
+        self._prefix_index = {}
+        self._closed_patterns = {}
         
         for intent, patterns in self.intent_patterns.items():
             for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    entities = {}
-                    
-                    if intent in ['web_search', 'wikipedia']:
-                        entities['query'] = match.group(1).strip()
-                    elif intent in ['open_app', 'close_app']:
-                        entities['app_name'] = match.group(1).strip()
-                    elif intent == 'volume_control':
-                        if 'volume to' in text and match.groups():
-                            entities['level'] = int(match.group(1))
-                        elif any(word in text for word in ['volume up', 'increase', 'raise']):
-                            entities['action'] = 'up'
-                        elif any(word in text for word in ['volume down', 'decrease', 'lower']):
-                            entities['action'] = 'down'
-                        elif 'mute' in text and 'unmute' not in text:
-                            entities['action'] = 'mute'
-                        elif 'unmute' in text:
-                            entities['action'] = 'unmute'
-                    elif intent == 'weather':
-                        if match.groups() and match.group(1):
-                            entities['location'] = match.group(1).strip()
-                        else:
-                            entities['location'] = 'current'
-                    elif intent == 'spotify_control':
-                        text_lower = text.lower()
-                        
-                        # Clear play/pause commands
-                        if text_lower in ['play spotify', 'start spotify', 'resume spotify']:
-                            entities['action'] = 'play'
-                        elif text_lower in ['pause spotify', 'stop spotify']:
-                            entities['action'] = 'pause'
-                        elif text_lower == 'play music':
-                            entities['action'] = 'play'
-                        
-                        # Media controls
-                        elif any(word in text_lower for word in ['next song', 'skip song', 'spotify next', 'spotify skip']):
-                            entities['action'] = 'next'
-                        elif any(word in text_lower for word in ['previous song', 'spotify previous']):
-                            entities['action'] = 'previous'
-                        
-                        # Search and play commands
-                        elif any(phrase in text_lower for phrase in ['play', 'search']) and 'spotify' in text_lower:
-                            entities['action'] = 'search_and_play'
-                            if match.groups() and match.group(1):
-                                entities['query'] = match.group(1).strip()
-                        elif 'spotify' in text_lower and match.groups() and match.group(1):
-                            entities['action'] = 'search_and_play'
-                            entities['query'] = match.group(1).strip()
-                        else:
-                            # Default to play action for any unmatched spotify command
-                            entities['action'] = 'play'
-                    
-                    return intent, entities
+                prefix = self._literal_prefix(pattern)
+                compiled = re.compile(pattern, re.IGNORECASE)
+                self._compiled_patterns.append((prefix, intent, compiled))
+                self._prefix_index.setdefault(prefix, []).append(len(self._compiled_patterns) - 1)
+                
+                # Patterns without a free-text slot describe a whole, finished command
+                if not compiled.groups:
+                    self._closed_patterns.setdefault(intent, []).append(compiled)
+        
+        # Utterances that are exactly a fixed phrase skip the pattern scan. The
+        # answer is taken from the scan itself, so earlier patterns still win.
+        self._exact_phrases = {}
+        phrases = [self._literal_phrase(pattern) for patterns in self.intent_patterns.values() for pattern in patterns]
+        for phrase in filter(None, phrases):
+            self._exact_phrases[phrase] = self._match(phrase)
+    
+    def _literal_prefix(self, pattern: str) -> str:
+        """Literal text every match of the pattern must contain ('' if unknown)"""
+        prefix = ''
+        for i, char in enumerate(pattern):
+            if char in '.^$*+?{}[]\\|()':
+                break
+            if i + 1 < len(pattern) and pattern[i + 1] in '?*{':
+                break
+            prefix += char
+        return prefix.lower()
+    
+    def _literal_phrase(self, pattern: str) -> Optional[str]:
+        """The only text a pattern can match in full, or None if it has any regex syntax"""
+        phrase, escaped = '', False
+        for char in pattern:
+            if escaped:
+                if char.isalnum():
+                    return None
+                phrase, escaped = phrase + char, False
+            elif char == '\\':
+                escaped = True
+            elif char in '.^$*+?{}[]|()':
+                return None
+            else:
+                phrase += char
+        return phrase.lower()
+    
+    def extract_intent(self, text: str) -> Tuple[str, Dict]:
+        text = text.lower().strip()
+        
+        exact = self._exact_phrases.get(text)
+        if exact is not None:
+            return exact[0], dict(exact[1])
+        return self._match(text)
+    
+    def _match(self, text: str) -> Tuple[str, Dict]:
+        # A pattern can only match if its literal prefix occurs somewhere in the
+        # text, so each distinct prefix is checked once and the rest are skipped
+        candidates = []
+        for prefix, indices in self._prefix_index.items():
+            if prefix in text:
+                candidates.extend(indices)
+        candidates.sort()
+        
+        for index in candidates:
+            _, intent, compiled = self._compiled_patterns[index]
+            match = compiled.search(text)
+            if match:
+                return intent, self._extract_entities(intent, text, match.groups())
         
         return 'general_query', {'query': text}
     
+    def is_complete_command(self, text: str) -> bool:
+        """Whether a partial transcript is already a full, unambiguous command.
+        
+        The text must exactly match a fixed phrase of its intent, and saying
+        more words must not turn it into a different intent ("stop" could
+        still become "stop spotify").
+        """
+        text = text.lower().strip()
+        intent, _ = self.extract_intent(text)
+        
+        if not any(pattern.fullmatch(text) for pattern in self._closed_patterns.get(intent, [])):
+            return False
+        
+        extended_intent, _ = self.extract_intent(text + " something")
+        return extended_intent == intent
+    
+    def _extract_entities(self, intent: str, text: str, groups: Tuple) -> Dict:
+        entities = {}
+        
+        if intent in ['web_search', 'wikipedia']:
+            entities['query'] = groups[0].strip()
+        elif intent in ['open_app', 'close_app']:
+            entities['app_name'] = groups[0].strip()
+        elif intent == 'volume_control':
+            if 'volume to' in text and groups:
+                entities['level'] = int(groups[0])
+            elif any(word in text for word in ['volume up', 'increase', 'raise']):
+                entities['action'] = 'up'
+            elif any(word in text for word in ['volume down', 'decrease', 'lower']):
+                entities['action'] = 'down'
+            elif 'mute' in text and 'unmute' not in text:
+                entities['action'] = 'mute'
+            elif 'unmute' in text:
+                entities['action'] = 'unmute'
+        elif intent == 'weather':
+            if groups and groups[0]:
+                entities['location'] = groups[0].strip()
+            else:
+                entities['location'] = 'current'
+        elif intent == 'spotify_control':
+            text_lower = text.lower()
+            
+            # Clear play/pause commands
+            if text_lower in ['play spotify', 'start spotify', 'resume spotify']:
+                entities['action'] = 'play'
+            elif text_lower in ['pause spotify', 'stop spotify']:
+                entities['action'] = 'pause'
+            elif text_lower == 'play music':
+                entities['action'] = 'play'
+            
+            # Media controls
+            elif any(word in text_lower for word in ['next song', 'skip song', 'spotify next', 'spotify skip']):
+                entities['action'] = 'next'
+            elif any(word in text_lower for word in ['previous song', 'spotify previous']):
+                entities['action'] = 'previous'
+            
+            # Search and play commands
+            elif any(phrase in text_lower for phrase in ['play', 'search']) and 'spotify' in text_lower:
+                entities['action'] = 'search_and_play'
+                if groups and groups[0]:
+                    entities['query'] = groups[0].strip()
+            elif 'spotify' in text_lower and groups and groups[0]:
+                entities['action'] = 'search_and_play'
+                entities['query'] = groups[0].strip()
+            else:
+                # Default to play action for any unmatched spotify command
+                entities['action'] = 'play'
+        
+        return entities
+    
     def requires_confirmation(self, intent: str, entities: Dict) -> bool:
         dangerous_intents = ['system_shutdown', 'delete_file', 'format_drive']
         
@@ -235,85 +403,4 @@ class NLPProcessor:
         return False
     
     def get_help_text(self) -> str:
-        help_lines = [
-            "🤖 AETHERA AI ASSISTANT - AVAILABLE COMMANDS",
-            "=" * 50,
-            "",
-            "🔍 WEB SEARCH & INFORMATION:",
-            '• "Search for [topic]" - Search the internet',
-            '• "What is [something]" - Get definitions/info',
-            '• "Tell me about [topic]" - General information',
-            '• "Look up [term]" - Find information online',
-            '• "Google [query]" - Web search',
-            "",
-            "📚 KNOWLEDGE & WIKIPEDIA:",
-            '• "Wikipedia [topic]" - Search Wikipedia',
-            '• "Wiki [subject]" - Wikipedia lookup',
-            '• "Summary of [topic]" - Get topic summary',
-            "",
-            "🎵 SPOTIFY MUSIC CONTROL:",
-            '• "Play Spotify" - Start Spotify playback',
-            '• "Pause Spotify" - Pause Spotify playback',
-            '• "Stop Spotify" - Stop Spotify playback',
-            '• "Resume Spotify" - Resume Spotify playback',
-            '• "Play [song/artist] on Spotify" - Search and play',
-            '• "Next song" - Skip to next track',
-            '• "Previous song" - Go to previous track',
-            '• "Play music" - Start music playback',
-            "",
-            "💻 SYSTEM CONTROL:",
-            '• "Open [app name]" - Launch applications',
-            '• "Close [app name]" - Close applications',
-            '• "Take a screenshot" - Capture screen',
-            '• "System information" - Get system specs',
-            '• "List processes" - Show running programs',
-            "",
-            "🔊 VOLUME CONTROL:",
-            '• "Set volume to [0-100]" - Set specific volume',
-            '• "Volume up" - Increase volume',
-            '• "Volume down" - Decrease volume',
-            '• "Mute" - Mute audio',
-            '• "Unmute" - Unmute audio',
-            "",
-            "⏰ TIME & DATE:",
-            '• "What time is it?" - Current time',
-            '• "What\'s the date?" - Current date',
-            '• "What day is it?" - Current day',
-            "",
-            "🌤️ WEATHER (Coming Soon):",
-            '• "Weather" - Local weather',
-            '• "Weather in [city]" - Weather for location',
-            "",
-            "👋 BASIC INTERACTIONS:",
-            '• "Hello" / "Hi" - Greet Aethera',
-            '• "Help" - Show this command list',
-            '• "What can you do?" - Show capabilities',
-            '• "Goodbye" / "Stop" - Exit Aethera',
-            "",
-            "🎯 EXAMPLE COMMANDS:",
-            '• "Search for Python programming tutorials"',
-            '• "Open Chrome"',
-            '• "Set volume to 75"',
-            '• "Play Spotify"',
-            '• "Pause Spotify"',
-            '• "Play some jazz music on Spotify"',
-            '• "What time is it?"',
-            '• "Take a screenshot"',
-            '• "Wikipedia artificial intelligence"',
-            '• "Close Spotify"',
-            "",
-            "💡 TIPS:",
-            "• Speak clearly and naturally",
-            "• You can use variations of these commands",
-            "• Say 'confirm' when asked for confirmation",
-            "• Say 'help' anytime to see this list",
-            "",
-            "🔧 TROUBLESHOOTING:",
-            "• If volume control doesn't work, try installing 'pycaw'",
-            "• For better Spotify control, install 'pywin32'",
-            "• Make sure apps are installed before opening them",
-            "",
-            "Ready to assist! Just say any command naturally."
-        ]
-        
-        return "\n".join(help_lines)
\ No newline at end of file
+        return HELP_TEXT
\ No newline at end of file
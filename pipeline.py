@@ -0,0 +1,297 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from config import PIPELINE_QUEUE_SIZE, PIPELINE_METRICS_WINDOW
+from tracing import get_tracer
+
+class StageMetrics:
+    def __init__(self, window: int = PIPELINE_METRICS_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.drops = 0
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': self.max,
+            'drops': self.drops
+        }
+
+class PipelineMetrics:
+    """Per-stage latency statistics shared by the pipeline workers"""
+
+    STAGES = ['capture', 'recognition', 'dispatch', 'speech', 'to_dispatched']
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {name: StageMetrics() for name in self.STAGES}
+
+    def _stage(self, name: str) -> StageMetrics:
+        if name not in self._stages:
+            self._stages[name] = StageMetrics()
+        return self._stages[name]
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._stage(stage).record(seconds)
+
+    def record_drop(self, stage: str):
+        with self._lock:
+            self._stage(stage).drops += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: stage.summary() for name, stage in self._stages.items()}
+
+    def report(self) -> str:
+        lines = ["📊 Pipeline latency (seconds):"]
+        for name, stats in self.snapshot().items():
+            if not stats['count'] and not stats['drops']:
+                continue
+            lines.append(f"   {name:<14} n={stats['count']:<4} mean={stats['mean']:.3f} "
+                         f"p50={stats['p50']:.3f} p95={stats['p95']:.3f} max={stats['max']:.3f} "
+                         f"dropped={stats['drops']}")
+        return "\n".join(lines)
+
+class WavFileSource:
+    """Headless audio source that replays recorded WAV files instead of a microphone"""
+
+    realtime = False
+
+    def __init__(self, paths: List[str]):
+        import speech_recognition as sr
+
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+        self._paths = deque(self.expand(paths))
+        self.exhausted = not self._paths
+
+    @staticmethod
+    def expand(paths: List[str]) -> List[str]:
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith('.wav'))
+            else:
+                files.append(path)
+        return files
+
+    def capture(self):
+        if not self._paths:
+            self.exhausted = True
+            return None
+
+        path = self._paths.popleft()
+        with self._sr.AudioFile(path) as source:
+            audio = self._recognizer.record(source)
+        self.exhausted = not self._paths
+        return audio
+
+class Pipeline:
+    """Capture, recognition and dispatch stages joined by bounded queues.
+
+    Each stage runs on its own worker thread. Speech output is the fourth
+    stage and runs on the SpeechOutput worker.
+    """
+
+    def __init__(self, source, recognize: Callable[[object], Tuple[bool, str]],
+                 dispatch: Callable[[str], None], metrics: Optional[PipelineMetrics] = None,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.source = source
+        self.recognize = recognize
+        self.dispatch = dispatch
+        self.metrics = metrics or PipelineMetrics()
+        self.tracer = get_tracer()
+
+        self.audio_queue = queue.Queue(maxsize=queue_size)
+        self.text_queue = queue.Queue(maxsize=queue_size)
+
+        self._stop = threading.Event()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._source_done = threading.Event()
+        self._workers = []
+
+        # Called with each recognized text before it is queued, e.g. for barge-in
+        self.on_recognized: Optional[Callable[[str], None]] = None
+
+    def start(self):
+        self._workers = [
+            threading.Thread(target=self._capture_loop, name='pipeline-capture', daemon=True),
+            threading.Thread(target=self._recognition_loop, name='pipeline-recognition', daemon=True),
+            threading.Thread(target=self._dispatch_loop, name='pipeline-dispatch', daemon=True)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout)
+
+    def is_running(self) -> bool:
+        return not self._stop.is_set()
+
+    def is_drained(self) -> bool:
+        """True once a finite source is used up and every queued item is handled"""
+        with self._in_flight_lock:
+            busy = self._in_flight
+        return (self._source_done.is_set() and busy == 0
+                and self.audio_queue.empty() and self.text_queue.empty())
+
+    def _begin(self):
+        with self._in_flight_lock:
+            self._in_flight += 1
+
+    def _end(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def _offer(self, target: queue.Queue, item: Dict, stage: str):
+        """Hand an item downstream; live audio drops the oldest item instead of blocking"""
+        if not getattr(self.source, 'realtime', True):
+            while not self._stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            return
+
+        while True:
+            try:
+                target.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = target.get_nowait()
+                    if dropped.get('trace'):
+                        dropped['trace'].discard()
+                    self._end()
+                    self.metrics.record_drop(stage)
+                except queue.Empty:
+                    pass
+
+    def _take(self, source: queue.Queue) -> Optional[Dict]:
+        try:
+            return source.get(timeout=0.1)
+        except queue.Empty:
+            return None
+
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            if getattr(self.source, 'exhausted', False):
+                self._source_done.set()
+                return
+
+            # Each capture may become a command; its trace follows it through every stage
+            trace = self.tracer.start_trace('command')
+            start = time.perf_counter()
+            try:
+                with self.tracer.activate(trace.root if trace else None), self.tracer.span('capture'):
+                    audio = self.source.capture()
+            except Exception as e:
+                if trace:
+                    trace.discard()
+                print(f"⚠️ Capture error: {e}")
+                time.sleep(0.5)
+                continue
+
+            if audio is None:
+                if trace:
+                    trace.discard()
+                continue
+
+            self.metrics.record('capture', time.perf_counter() - start)
+            self._begin()
+
+            # Streaming sources recognize while capturing and skip the recognition stage
+            if getattr(self.source, 'produces_text', False):
+                if self.on_recognized:
+                    self.on_recognized(audio)
+                self._offer(self.text_queue, {'text': audio, 'captured_at': time.perf_counter(),
+                                              'trace': trace}, 'capture')
+            else:
+                self._offer(self.audio_queue, {'audio': audio, 'captured_at': time.perf_counter(),
+                                               'trace': trace}, 'capture')
+
+    def _recognition_loop(self):
+        while not self._stop.is_set():
+            item = self._take(self.audio_queue)
+            if item is None:
+                continue
+
+            trace = item.get('trace')
+            try:
+                start = time.perf_counter()
+                with self.tracer.activate(trace.root if trace else None), self.tracer.span('recognition') as span:
+                    success, text = self.recognize(item['audio'])
+                    span.set(success=success)
+                self.metrics.record('recognition', time.perf_counter() - start)
+
+                if not success:
+                    if trace:
+                        trace.discard()
+                    if "timeout" not in text.lower():
+                        print(f"⚠️ Listening issue: {text}")
+                    self._end()
+                    continue
+
+                if self.on_recognized:
+                    self.on_recognized(text)
+
+                item['text'] = text
+                self._offer(self.text_queue, item, 'recognition')
+            except Exception as e:
+                print(f"❌ Error in recognition stage: {e}")
+                if trace:
+                    trace.discard()
+                self._end()
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            item = self._take(self.text_queue)
+            if item is None:
+                continue
+
+            trace = item.get('trace')
+            try:
+                start = time.perf_counter()
+                with self.tracer.activate(trace.root if trace else None):
+                    if trace:
+                        trace.root.set(text=item['text'])
+                    self.dispatch(item['text'])
+                finished = time.perf_counter()
+                self.metrics.record('dispatch', finished - start)
+                # Speech output is asynchronous; its start delay is the 'speech' stage
+                self.metrics.record('to_dispatched', finished - item['captured_at'])
+            except Exception as e:
+                print(f"❌ Error in dispatch stage: {e}")
+            finally:
+                if trace:
+                    # Exported now, or once the spoken answer finishes
+                    trace.root.end()
+                self._end()
@@ -0,0 +1,231 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional, Tuple
+from config import (PREDICTION_HISTORY_PATH, PREDICTION_MIN_PROBABILITY, PREDICTION_MIN_SAMPLES,
+                    PREDICTION_MAX_WASTE, PREDICTION_WASTE_WINDOW, PREDICTION_SAVE_EVERY)
+
+def subject_of(entities: Dict) -> Optional[str]:
+    """The part of a command a warmer can act on: the app, the query or the action"""
+    for key in ('app_name', 'query', 'action'):
+        value = entities.get(key)
+        if value:
+            return str(value).lower().strip()
+    return None
+
+class TransitionModel:
+    """Counts of which intent follows which, plus the usual subject of each intent.
+
+    Persisted as JSON so predictions survive restarts. observe() only reports
+    that a save is due; the caller decides which thread pays for the write.
+    """
+
+    def __init__(self, path: Optional[str] = PREDICTION_HISTORY_PATH, min_samples: int = PREDICTION_MIN_SAMPLES,
+                 save_every: int = PREDICTION_SAVE_EVERY):
+        self.path = path
+        self.min_samples = min_samples
+        self.save_every = save_every
+        self.transitions: Dict[str, Counter] = {}
+        self.subjects: Dict[str, Counter] = {}
+        self.last_intent: Optional[str] = None
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.transitions = {intent: Counter(counts) for intent, counts in data.get('transitions', {}).items()}
+            self.subjects = {intent: Counter(counts) for intent, counts in data.get('subjects', {}).items()}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Couldn't load command history: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'transitions': {intent: dict(counts) for intent, counts in self.transitions.items()},
+                'subjects': {intent: dict(counts.most_common(20)) for intent, counts in self.subjects.items()}
+            }
+            self._unsaved = 0
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            partial = self.path + '.part'
+            with open(partial, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(partial, self.path)
+        except OSError as e:
+            print(f"⚠️ Couldn't save command history: {e}")
+
+    def observe(self, intent: str, subject: Optional[str] = None) -> bool:
+        """Count intent as following the previous one; returns True once a save is due"""
+        with self._lock:
+            if self.last_intent is not None:
+                self.transitions.setdefault(self.last_intent, Counter())[intent] += 1
+            if subject:
+                self.subjects.setdefault(intent, Counter())[subject] += 1
+            self.last_intent = intent
+            self._unsaved += 1
+            return bool(self.path) and self._unsaved >= self.save_every
+
+    def predict(self, intent: str, min_probability: float = PREDICTION_MIN_PROBABILITY) -> List[Tuple[str, float]]:
+        """Likely next intents after intent, most likely first"""
+        with self._lock:
+            counts = self.transitions.get(intent)
+            total = sum(counts.values()) if counts else 0
+            if total < self.min_samples:
+                return []
+            return [(following, count / total) for following, count in counts.most_common()
+                    if count / total >= min_probability]
+
+    def usual_subject(self, intent: str) -> Optional[str]:
+        with self._lock:
+            counts = self.subjects.get(intent)
+            return counts.most_common(1)[0][0] if counts else None
+
+class Speculator:
+    """Warms whatever the predicted next command will need, on one long-lived background worker.
+
+    A warmer gets the entities of the command that just ran and returns the
+    subject it prepared for (None if it prepared nothing subject-specific), or
+    False if there was nothing to do. The next real command settles every
+    pending speculation as used or wasted. An intent whose recent speculations
+    were mostly wasted stops being warmed until its record improves.
+
+    The dispatch thread only bumps a command counter and queues a job:
+    learning, predicting, warming and saving the history all happen on the
+    worker, in the order the commands arrived.
+    """
+
+    def __init__(self, model: TransitionModel, warmers: Dict[str, Callable[[Dict], object]],
+                 max_waste: float = PREDICTION_MAX_WASTE, window: int = PREDICTION_WASTE_WINDOW):
+        self.model = model
+        self.warmers = warmers
+        self.max_waste = max_waste
+        self.window = window
+        self._outcomes: Dict[str, deque] = {}
+        self._pending: List[Tuple[str, Optional[str], float]] = []
+        # Only the dispatch thread writes this; the worker compares against it to spot stale work
+        self._commands = 0
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._run, name='speculate', daemon=True)
+        self._worker.start()
+        # Intents that have been followed by something warmable; nothing else is worth predicting after
+        self._leads = {intent for intent, counts in model.transitions.items()
+                       if any(following in warmers for following in counts)}
+        self.counters = {'speculated': 0, 'used': 0, 'wasted': 0, 'skipped': 0, 'wasted_seconds': 0.0}
+
+    def _suppressed(self, intent: str) -> bool:
+        outcomes = self._outcomes.get(intent)
+        # Too few outcomes to judge yet
+        if not outcomes or len(outcomes) < self.window // 2:
+            return False
+        return outcomes.count(False) / len(outcomes) > self.max_waste
+
+    def command(self, intent: str, entities: Dict):
+        """Record a real command; it is settled against pending speculations and learned on the worker"""
+        self._commands += 1
+        self._queue.put(('command', intent, entities))
+
+    def warms_after(self, intent: str) -> bool:
+        """Whether anything warmable has ever followed intent"""
+        return intent in self._leads
+
+    def speculate(self, intent: str, entities: Dict):
+        """Queue warming for the commands likely to follow intent"""
+        self._queue.put(('warm', intent, entities, self._commands))
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every job queued so far has finished"""
+        done = threading.Event()
+        self._queue.put(('mark', done))
+        return done.wait(timeout)
+
+    def stop(self):
+        self._queue.put(None)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                if job[0] == 'command':
+                    self._settle(job[1], job[2])
+                elif job[0] == 'warm':
+                    self._warm(*job[1:])
+                else:
+                    job[1].set()
+            except Exception as e:
+                print(f"⚠️ Speculation failed: {e}")
+
+    def _settle(self, intent: str, entities: Dict):
+        subject = subject_of(entities)
+        with self._lock:
+            for predicted, warmed_subject, cost in self._pending:
+                used = predicted == intent and (warmed_subject is None or warmed_subject == subject)
+                self._outcomes.setdefault(predicted, deque(maxlen=self.window)).append(used)
+                if used:
+                    self.counters['used'] += 1
+                else:
+                    self.counters['wasted'] += 1
+                    self.counters['wasted_seconds'] += cost
+            self._pending = []
+        if intent in self.warmers and self.model.last_intent is not None:
+            self._leads.add(self.model.last_intent)
+        if self.model.observe(intent, subject):
+            self.model.save()
+
+    def _targets(self, intent: str) -> List[str]:
+        targets = []
+        for predicted, _ in self.model.predict(intent):
+            if predicted not in self.warmers:
+                continue
+            with self._lock:
+                if self._suppressed(predicted):
+                    self.counters['skipped'] += 1
+                    # Forget the oldest outcome, so after enough skips the intent is tried again
+                    self._outcomes[predicted].popleft()
+                    continue
+            targets.append(predicted)
+        return targets
+
+    def _warm(self, intent: str, entities: Dict, generation: int):
+        if self._commands != generation:
+            # A newer command arrived while this was queued
+            return
+        for predicted in self._targets(intent):
+            start = time.perf_counter()
+            try:
+                warmed = self.warmers[predicted](entities)
+            except Exception:
+                warmed = False
+            cost = time.perf_counter() - start
+            if warmed is False:
+                continue
+            with self._lock:
+                self.counters['speculated'] += 1
+                if self._commands != generation:
+                    # The next command arrived before this was ready
+                    self._outcomes.setdefault(predicted, deque(maxlen=self.window)).append(False)
+                    self.counters['wasted'] += 1
+                    self.counters['wasted_seconds'] += cost
+                else:
+                    self._pending.append((predicted, warmed, cost))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+        settled = stats['used'] + stats['wasted']
+        stats['hit_rate'] = stats['used'] / settled if settled else 0.0
+        return stats
@@ -0,0 +1,164 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from config import PROCESS_INDEX_REFRESH
+
+class ProcessEntry:
+    def __init__(self, pid: int, name: str, exe: Optional[str], create_time: float, process=None):
+        self.pid = pid
+        self.name = name
+        self.exe = exe
+        self.create_time = create_time
+        self.process = process
+
+    def as_dict(self) -> Dict:
+        return {'name': self.name, 'pid': self.pid, 'exe': self.exe or 'N/A'}
+
+class ProcessIndex:
+    """In-memory table of running processes, refreshed incrementally.
+
+    A refresh lists PIDs only and inspects just the processes that appeared
+    since the last one. Lookups confirm each match's create_time, so a
+    recycled PID is re-read instead of trusted. Names are indexed in lower
+    case so lookups scan the distinct names rather than every process.
+    """
+
+    def __init__(self, min_refresh_interval: float = PROCESS_INDEX_REFRESH):
+        self.min_refresh_interval = min_refresh_interval
+        self._entries: Dict[int, ProcessEntry] = {}
+        self._by_name: Dict[str, set] = {}
+        self._sorted: Optional[List[Dict]] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _add(self, entry: ProcessEntry):
+        self._entries[entry.pid] = entry
+        self._by_name.setdefault(entry.name.lower(), set()).add(entry.pid)
+        self._sorted = None
+
+    def _remove(self, pid: int):
+        entry = self._entries.pop(pid, None)
+        if entry is None:
+            return
+        key = entry.name.lower()
+        pids = self._by_name.get(key)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self._by_name[key]
+        self._sorted = None
+
+    def _inspect(self, pid: int) -> Optional[ProcessEntry]:
+        import psutil
+
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                name = process.name()
+                create_time = process.create_time()
+                try:
+                    exe = process.exe()
+                except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                    exe = None
+            return ProcessEntry(pid, name, exe, create_time, process)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def _create_time(self, pid: int) -> Optional[float]:
+        import psutil
+
+        try:
+            return psutil.Process(pid).create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def refresh(self, force: bool = False):
+        import psutil
+
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.min_refresh_interval:
+                return
+
+            current = set(psutil.pids())
+            for pid in set(self._entries) - current:
+                self._remove(pid)
+
+            for pid in current - set(self._entries):
+                entry = self._inspect(pid)
+                if entry is not None:
+                    self._add(entry)
+
+            self._refreshed_at = time.monotonic()
+
+    def discard(self, pid: int):
+        """Forget a process that is known to have exited"""
+        with self._lock:
+            self._remove(pid)
+
+    def is_current(self, entry: ProcessEntry) -> bool:
+        """Whether the PID still belongs to the process that was indexed"""
+        return self._create_time(entry.pid) == entry.create_time
+
+    def find(self, keyword: str, refresh: bool = True) -> List[ProcessEntry]:
+        """Processes whose name contains keyword, case-insensitively"""
+        if refresh:
+            self.refresh()
+
+        keyword = keyword.lower()
+        with self._lock:
+            matches = [self._entries[pid] for name, pids in self._by_name.items()
+                       if keyword in name for pid in pids]
+        return [entry for entry in self._revalidate(matches) if keyword in entry.name.lower()]
+
+    def _revalidate(self, entries: List[ProcessEntry]) -> List[ProcessEntry]:
+        """Replace entries whose PID has been recycled since they were indexed"""
+        current = []
+        for entry in entries:
+            if self.is_current(entry):
+                current.append(entry)
+                continue
+
+            fresh = self._inspect(entry.pid)
+            with self._lock:
+                self._remove(entry.pid)
+                if fresh is not None:
+                    self._add(fresh)
+            if fresh is not None:
+                current.append(fresh)
+        return current
+
+    def find_exact(self, name: str, refresh: bool = True) -> List[ProcessEntry]:
+        if refresh:
+            self.refresh()
+
+        with self._lock:
+            matches = [self._entries[pid] for pid in self._by_name.get(name.lower(), ())]
+        return [entry for entry in self._revalidate(matches) if entry.name.lower() == name.lower()]
+
+    def is_running(self, keyword: str) -> bool:
+        return bool(self.find(keyword))
+
+    def processes(self, refresh: bool = True) -> List[Dict]:
+        """All processes sorted by name; the sorted list is reused until something changes"""
+        if refresh:
+            self.refresh()
+
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted((entry.as_dict() for entry in self._entries.values()),
+                                      key=lambda p: p['name'].lower())
+            return list(self._sorted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_index: Optional[ProcessIndex] = None
+_index_lock = threading.Lock()
+
+def get_process_index() -> ProcessIndex:
+    """The process-wide index shared by every caller"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ProcessIndex()
+        return _index
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+from typing import Optional
+import speech_recognition as sr
+from config import RECOGNIZER_BACKEND, RECOGNIZER_MIN_CONFIDENCE, VOSK_MODEL_PATH
+
+class RecognitionResult:
+    def __init__(self, text: str, confidence: float, backend: str):
+        self.text = text
+        self.confidence = confidence
+        self.backend = backend
+
+    def __repr__(self):
+        return f"RecognitionResult({self.text!r}, confidence={self.confidence:.2f}, backend={self.backend!r})"
+
+class RecognizerBackend:
+    """Turns captured audio into text.
+
+    Implementations raise sr.UnknownValueError when nothing intelligible was
+    heard and sr.RequestError when the engine itself is unavailable, matching
+    the speech_recognition conventions SpeechHandler already handles.
+    """
+
+    name = 'base'
+    supports_streaming = False
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        raise NotImplementedError
+
+    def start_stream(self, sample_rate: int) -> 'StreamingSession':
+        raise NotImplementedError(f"{self.name} does not support streaming recognition")
+
+class StreamingSession:
+    """Incremental recognition fed with raw 16-bit mono audio frames"""
+
+    def accept(self, frame: bytes) -> str:
+        """Feed one frame and return the transcript heard so far"""
+        raise NotImplementedError
+
+    def is_endpoint(self) -> bool:
+        """Whether the engine has decided the utterance is over"""
+        return False
+
+    def finish(self) -> RecognitionResult:
+        raise NotImplementedError
+
+class GoogleRecognizer(RecognizerBackend):
+    name = 'google'
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None):
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        response = self.recognizer.recognize_google(audio, show_all=True)
+        if not isinstance(response, dict) or not response.get('alternative'):
+            raise sr.UnknownValueError()
+
+        best = response['alternative'][0]
+        # Google only reports a confidence for some responses; treat a missing one as certain
+        return RecognitionResult(best['transcript'], best.get('confidence', 1.0), self.name)
+
+class VoskStreamingSession(StreamingSession):
+    def __init__(self, backend: 'VoskRecognizer', session):
+        self.backend = backend
+        self.session = session
+        self._final = None
+
+    def accept(self, frame: bytes) -> str:
+        if self.session.AcceptWaveform(frame):
+            # Vosk detected the end of a segment; keep its final result
+            raw = self.session.Result()
+            text = json.loads(raw).get('text', '').strip()
+            if text:
+                self._final = raw
+            return text
+
+        return json.loads(self.session.PartialResult()).get('partial', '').strip()
+
+    def is_endpoint(self) -> bool:
+        return self._final is not None
+
+    def finish(self) -> RecognitionResult:
+        return self.backend.parse_result(self._final or self.session.FinalResult())
+
+class VoskRecognizer(RecognizerBackend):
+    """Offline CPU-only recognition; the model is loaded on first use"""
+
+    name = 'vosk'
+    sample_rate = 16000
+    supports_streaming = True
+
+    def __init__(self, model_path: str = VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                try:
+                    import vosk
+                except ImportError:
+                    raise sr.RequestError("vosk is not installed. Install with: pip install vosk")
+
+                if not os.path.isdir(self.model_path):
+                    raise sr.RequestError(f"Vosk model not found at '{self.model_path}'")
+
+                vosk.SetLogLevel(-1)
+                self._model = vosk.Model(self.model_path)
+        return self._model
+
+    def new_session(self, sample_rate: Optional[int] = None, grammar: Optional[list] = None):
+        """Create an incremental Kaldi recognizer, optionally limited to a phrase list"""
+        model = self._get_model()
+        import vosk
+
+        sample_rate = sample_rate or self.sample_rate
+        if grammar is not None:
+            session = vosk.KaldiRecognizer(model, sample_rate, json.dumps(grammar))
+        else:
+            session = vosk.KaldiRecognizer(model, sample_rate)
+        session.SetWords(True)
+        return session
+
+    def start_stream(self, sample_rate: int) -> StreamingSession:
+        return VoskStreamingSession(self, self.new_session(sample_rate))
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        session = self.new_session()
+        session.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        return self.parse_result(session.FinalResult())
+
+    def parse_result(self, raw: str) -> RecognitionResult:
+        result = json.loads(raw)
+        text = result.get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+
+        words = result.get('result', [])
+        confidence = sum(word.get('conf', 0.0) for word in words) / len(words) if words else 0.0
+        return RecognitionResult(text, confidence, self.name)
+
+class FallbackRecognizer(RecognizerBackend):
+    """Use the primary backend, asking the fallback only when it is unsure"""
+
+    def __init__(self, primary: RecognizerBackend, fallback: RecognizerBackend,
+                 min_confidence: float = RECOGNIZER_MIN_CONFIDENCE):
+        self.primary = primary
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.name = f"{primary.name}+{fallback.name}"
+        self.supports_streaming = primary.supports_streaming
+
+    def start_stream(self, sample_rate: int) -> StreamingSession:
+        # Partial results only come from the primary engine
+        return self.primary.start_stream(sample_rate)
+
+    def recognize(self, audio: sr.AudioData) -> RecognitionResult:
+        result = None
+        try:
+            result = self.primary.recognize(audio)
+            if result.confidence >= self.min_confidence:
+                return result
+        except (sr.UnknownValueError, sr.RequestError):
+            pass
+
+        try:
+            return self.fallback.recognize(audio)
+        except (sr.UnknownValueError, sr.RequestError):
+            # Offline or unsure too: a low-confidence local answer beats none
+            if result is not None:
+                return result
+            raise
+
+def create_recognizer(backend: str = RECOGNIZER_BACKEND, recognizer: Optional[sr.Recognizer] = None) -> RecognizerBackend:
+    """Build a backend from a name such as 'google', 'vosk' or 'vosk+google'"""
+    names = [name.strip().lower() for name in backend.split('+')]
+
+    def build(name: str) -> RecognizerBackend:
+        if name == 'google':
+            return GoogleRecognizer(recognizer)
+        if name == 'vosk':
+            return VoskRecognizer()
+        raise ValueError(f"Unknown recognizer backend: {name}")
+
+    result = build(names[0])
+    for name in names[1:]:
+        result = FallbackRecognizer(result, build(name))
+    return result
@@ -0,0 +1,75 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from config import SCREENSHOT_FORMAT, SCREENSHOT_PNG_LEVEL, SCREENSHOT_QUALITY, SCREENSHOT_SCALE
+
+EXTENSIONS = {'png': 'png', 'jpeg': 'jpg', 'webp': 'webp'}
+
+class ScreenshotEncoder:
+    """Encodes captured screenshots to disk on a background worker.
+
+    take_screenshot only grabs the pixels; scaling, compression and the file
+    write happen here so the voice thread is free as soon as the capture is done.
+    Files are written under a temporary name and renamed when complete.
+    """
+
+    def __init__(self, image_format: str = SCREENSHOT_FORMAT, png_level: int = SCREENSHOT_PNG_LEVEL,
+                 quality: int = SCREENSHOT_QUALITY, scale: float = SCREENSHOT_SCALE):
+        image_format = image_format.lower()
+        if image_format == 'jpg':
+            image_format = 'jpeg'
+        if image_format not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+
+        self.image_format = image_format
+        self.png_level = png_level
+        self.quality = quality
+        self.scale = scale
+        # One worker keeps encodes in capture order and off the voice thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshot-encoder')
+        self._lock = threading.Lock()
+        self.pending = 0
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.image_format]
+
+    def encode(self, image, filepath: str) -> str:
+        """Scale and save one image synchronously; returns the path written"""
+        if self.scale != 1.0:
+            from PIL import Image
+
+            size = (max(1, int(image.width * self.scale)), max(1, int(image.height * self.scale)))
+            image = image.resize(size, Image.BILINEAR)
+
+        if self.image_format == 'png':
+            options = {'compress_level': self.png_level}
+        elif self.image_format == 'jpeg':
+            image = image.convert('RGB')
+            options = {'quality': self.quality}
+        else:
+            options = {'quality': self.quality, 'lossless': self.quality >= 100}
+
+        partial = filepath + '.part'
+        image.save(partial, format=self.image_format.upper(), **options)
+        os.replace(partial, filepath)
+        return filepath
+
+    def submit(self, image, filepath: str) -> Future:
+        with self._lock:
+            self.pending += 1
+        future = self._executor.submit(self.encode, image, filepath)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self.pending -= 1
+        error = future.exception()
+        if error is not None:
+            print(f"⚠️ Saving screenshot failed: {error}")
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until every queued screenshot has been written"""
+        self._executor.submit(lambda: None).result(timeout)
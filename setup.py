@@ -45,7 +45,7 @@ def setup_system_dependencies():
     return True
 
 def create_directories():
-    directories = ["screenshots", "downloads", "logs"]
+    directories = ["screenshots", "downloads", "logs", "cache"]
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
@@ -4,52 +4,242 @@ except ModuleNotFoundError:
     import aifc_fix
 
 import speech_recognition as sr
-import pyttsx3
 import threading
 import time
-from config import TTS_RATE, TTS_VOLUME, TTS_VOICE_INDEX, LISTENING_TIMEOUT, PHRASE_TIMEOUT
+from typing import Callable, Optional
+from config import (LISTENING_TIMEOUT, PHRASE_TIMEOUT, TTS_STREAMING, STREAMING_STABLE_SECONDS,
+                    VAD_ENABLED, VAD_FRAME_MS, WAKE_WORDS, WAKE_WORD_PHRASES, WAKE_WORD_REQUIRED)
+from tts import TTSEngine, Pyttsx3Engine, SpeechOutput
+from recognizers import RecognizerBackend, create_recognizer
+from tracing import get_tracer
 
 class SpeechHandler:
-    def __init__(self):
+    def __init__(self, tts_engine: Optional[TTSEngine] = None, use_microphone: bool = True,
+                 backend: Optional[RecognizerBackend] = None):
         self.recognizer = sr.Recognizer()
         self.recognizer.pause_threshold = 3.0
+        self.backend = backend or create_recognizer(recognizer=self.recognizer)
         
-        self.microphone = sr.Microphone()
+        self.microphone = sr.Microphone() if use_microphone else None
         
-        self.tts_engine = pyttsx3.init()
-        self.setup_tts()
+        self.tts_engine = tts_engine or Pyttsx3Engine()
+        self.output = SpeechOutput(self.tts_engine)
         
-        print("Adjusting for ambient noise... Please wait.")
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=2)
-        print("Ready for voice commands!")
-    
-    def setup_tts(self):
-        voices = self.tts_engine.getProperty('voices')
+        # The VAD learns the noise floor as it runs, so it needs no calibration pass
+        self.endpointer = None
+        self.use_vad = VAD_ENABLED and self._vad_available()
         
-        if voices and len(voices) > TTS_VOICE_INDEX:
-            self.tts_engine.setProperty('voice', voices[TTS_VOICE_INDEX].id)
+        # With a local spotter nothing reaches the recognizer until a wake word is heard
+        self.wake_word_spotter = None
+        
+        # Calibration and model loading run in the background; only the microphone waits for them
+        self._ready = threading.Event()
+        if self.microphone is not None:
+            threading.Thread(target=self._prepare_microphone, name='speech-warmup', daemon=True).start()
+        else:
+            self._ready.set()
+    
+    def _prepare_microphone(self):
+        try:
+            if not self.use_vad:
+                print("Adjusting for ambient noise... Please wait.")
+                with self.microphone as source:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=2)
+            
+            if WAKE_WORD_REQUIRED and self.use_vad:
+                from wakeword import create_spotter
+                self.wake_word_spotter = create_spotter(self.backend)
+            print("Ready for voice commands!")
+        except Exception as e:
+            print(f"⚠️ Microphone setup failed: {e}")
+        finally:
+            self._ready.set()
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+    
+    def _vad_available(self) -> bool:
+        try:
+            import vad
+            return True
+        except ImportError:
+            print("⚠️ numpy not available, using fixed pause detection. Install with: pip install numpy")
+            return False
+    
+    def _get_endpointer(self, source):
+        from vad import Endpointer
         
-        self.tts_engine.setProperty('rate', TTS_RATE)
-        self.tts_engine.setProperty('volume', TTS_VOLUME)
+        if self.endpointer is None or self.endpointer.sample_rate != source.SAMPLE_RATE:
+            self.endpointer = Endpointer(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        self.endpointer.reset()
+        return self.endpointer
     
     def listen(self):
+        try:
+            audio = self.capture()
+        except Exception as e:
+            return False, f"Error: {e}"
+        
+        if audio is None:
+            return False, "Listening timeout"
+        
+        return self.recognize(audio)
+    
+    def capture(self):
+        """Record one phrase from the microphone, or None if nobody spoke"""
+        self._ready.wait()
+        if self.wake_word_spotter is not None:
+            return self._capture_after_wake_word()
+        if self.use_vad:
+            return self._capture_with_vad()
+        
         try:
             with self.microphone as source:
                 print("Listening...")
-                audio = self.recognizer.listen(
+                return self.recognizer.listen(
                     source, 
                     timeout=LISTENING_TIMEOUT, 
                     phrase_time_limit=PHRASE_TIMEOUT
                 )
+        except sr.WaitTimeoutError:
+            return None
+    
+    def _capture_with_vad(self):
+        with self.microphone as source:
+            print("Listening...")
+            return self._record_utterance(source)
+    
+    def _record_utterance(self, source):
+        endpointer = self._get_endpointer(source)
+        frame_size = int(source.SAMPLE_RATE * VAD_FRAME_MS / 1000)
+        
+        while endpointer.process(source.stream.read(frame_size)) != 'end':
+            if not endpointer.in_speech and endpointer.elapsed >= LISTENING_TIMEOUT:
+                return None
+            if endpointer.in_speech and endpointer.elapsed - endpointer.speech_start >= PHRASE_TIMEOUT:
+                break
+        
+        self._report_endpoint(endpointer)
+        return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+    
+    def _capture_after_wake_word(self):
+        """Idle on-device until a wake word is spotted, then return the command audio"""
+        with self.microphone as source:
+            endpointer = self._get_endpointer(source)
+            frame_size = int(source.SAMPLE_RATE * VAD_FRAME_MS / 1000)
+            session = None
             
+            while True:
+                frame = source.stream.read(frame_size)
+                event = endpointer.process(frame)
+                
+                if event == 'start':
+                    # Replay the ring buffer so the start of the wake word isn't lost
+                    session = self.wake_word_spotter.start(source.SAMPLE_RATE)
+                    for buffered in endpointer.frames:
+                        session.accept(buffered)
+                    continue
+                
+                if session is None:
+                    if endpointer.elapsed >= LISTENING_TIMEOUT:
+                        return None
+                    continue
+                
+                if event == 'end' or endpointer.elapsed - endpointer.speech_start >= PHRASE_TIMEOUT:
+                    wake_word = session.finish()
+                    if wake_word:
+                        break
+                    # Not addressed to us: drop it without ever calling the recognizer
+                    endpointer.reset()
+                    session = None
+                    continue
+                
+                session.accept(frame)
+            
+            print(f"👂 Wake word detected: {wake_word}")
+            if session.has_command():
+                self._report_endpoint(endpointer)
+                return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            
+            print("Listening...")
+            return self._record_utterance(source)
+    
+    def _report_endpoint(self, endpointer):
+        silence = endpointer.trailing_silence()
+        saved = self.recognizer.pause_threshold - silence
+        # The trailing silence is the time spent deciding the user had finished
+        now = time.perf_counter_ns()
+        get_tracer().record('endpointing', now - int(silence * 1e9), now, silence=round(silence, 3))
+        print(f"⏱️ End of speech after {silence:.2f}s of silence ({saved:.2f}s sooner than a fixed pause)")
+    
+    def listen_streaming(self, is_complete: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """Recognize while the user is still talking.
+        
+        Returns as soon as the recognizer detects the end of the utterance, or
+        earlier when the partial transcript has been stable for
+        STREAMING_STABLE_SECONDS and is_complete() says the command in it,
+        without its wake word, is whole. The transcript is returned with the
+        wake word still in it; callers apply wake_word_gate().
+        """
+        self._ready.wait()
+        with self.microphone as source:
+            print("Listening...")
+            session = self.backend.start_stream(source.SAMPLE_RATE)
+            seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+            endpointer = self._get_endpointer(source) if self.use_vad else None
+            
+            elapsed = 0.0
+            partial = ''
+            stable_for = 0.0
+            
+            while elapsed < PHRASE_TIMEOUT:
+                frame = source.stream.read(source.CHUNK)
+                text = session.accept(frame)
+                elapsed += seconds_per_chunk
+                
+                if session.is_endpoint():
+                    break
+                
+                if endpointer is not None and endpointer.process(frame) == 'end':
+                    self._report_endpoint(endpointer)
+                    break
+                
+                if text != partial:
+                    partial = text
+                    stable_for = 0.0
+                else:
+                    stable_for += seconds_per_chunk
+                
+                if not partial and elapsed >= LISTENING_TIMEOUT:
+                    return None
+                
+                if partial and is_complete and stable_for >= STREAMING_STABLE_SECONDS:
+                    # Judge the command itself; a partial without the wake word is never dispatched early
+                    command = self.wake_word_gate(partial.lower())
+                    if command and is_complete(command):
+                        print(f"⚡ Early dispatch after {elapsed:.1f}s: {partial}")
+                        return partial.lower()
+        
+        try:
+            text = session.finish().text.lower()
+        except sr.UnknownValueError:
+            return None
+        
+        print(f"You said: {text}")
+        return text
+    
+    def recognize(self, audio):
+        try:
             print("Processing...")
-            text = self.recognizer.recognize_google(audio).lower()
-            print(f"You said: {text}")
+            result = self.backend.recognize(audio)
+            text = result.text.lower()
+            print(f"You said: {text} ({result.backend}, confidence {result.confidence:.2f})")
+            
+            text = self.wake_word_gate(text)
+            if text is None:
+                return False, "No wake word heard"
             return True, text
             
-        except sr.WaitTimeoutError:
-            return False, "Listening timeout"
         except sr.UnknownValueError:
             return False, "Could not understand audio"
         except sr.RequestError as e:
@@ -57,18 +247,30 @@ class SpeechHandler:
         except Exception as e:
             return False, f"Error: {e}"
     
-    def speak(self, text):
+    def speak(self, text, block: Optional[bool] = None):
         print(f"Aethera: {text}")
-        self.tts_engine.say(text)
-        self.tts_engine.runAndWait()
+        if block is None:
+            block = not TTS_STREAMING
+        self.output.say(text, block=block)
     
     def speak_async(self, text):
-        def speak_thread():
-            self.speak(text)
-        
-        thread = threading.Thread(target=speak_thread)
-        thread.daemon = True
-        thread.start()
+        self.speak(text, block=False)
+    
+    def interrupt(self):
+        """Barge-in: stop talking so the new command can be handled"""
+        self.output.interrupt()
+    
+    def is_speaking(self) -> bool:
+        return self.output.is_speaking()
+    
+    def wake_word_gate(self, text: str) -> Optional[str]:
+        """The command in a transcript with its wake word removed, or None if it wasn't addressed to us"""
+        if not WAKE_WORD_REQUIRED:
+            return text
+        # Without a local spotter the wake word can only be checked in the transcript
+        if self.wake_word_spotter is None and not self.is_wake_word_detected(text, WAKE_WORDS):
+            return None
+        return self.remove_wake_word(text, sorted(set(WAKE_WORDS + WAKE_WORD_PHRASES), key=len, reverse=True))
     
     def is_wake_word_detected(self, text, wake_words):
         return any(wake_word in text.lower() for wake_word in wake_words)
@@ -78,4 +280,30 @@ class SpeechHandler:
         for wake_word in wake_words:
             if text_lower.startswith(wake_word):
                 return text[len(wake_word):].strip()
-        return text.strip()
\ No newline at end of file
+        return text.strip()
+
+class StreamingSource:
+    """Pipeline source that yields finished transcripts instead of raw audio"""
+    
+    produces_text = True
+    realtime = True
+    
+    def __init__(self, speech: SpeechHandler, is_complete: Callable[[str], bool]):
+        self.speech = speech
+        self.is_complete = is_complete
+        self.streaming = True
+    
+    def capture(self) -> Optional[str]:
+        self.speech.wait_until_ready()
+        # A local spotter has to hear the wake word before anything reaches the recognizer,
+        # which only the non-streaming capture does
+        if self.streaming and not (WAKE_WORD_REQUIRED and self.speech.wake_word_spotter is not None):
+            try:
+                text = self.speech.listen_streaming(self.is_complete)
+                return self.speech.wake_word_gate(text) if text is not None else None
+            except sr.RequestError as e:
+                print(f"⚠️ Streaming recognition unavailable, falling back: {e}")
+                self.streaming = False
+        
+        success, text = self.speech.listen()
+        return text if success else None
@@ -2,31 +2,46 @@ import os
 import sys
 import subprocess
 import platform
-import psutil
 import time
-import comtypes
 from datetime import datetime
-from PIL import ImageGrab
 from typing import Dict, Optional, List
-from config import SCREENSHOTS_DIR
-from ctypes import cast, POINTER
+from config import SCREENSHOTS_DIR, TELEMETRY_TREND_SECONDS, VOLUME_STEP
+from process_index import get_process_index
+from app_index import AppIndex
+from screenshots import ScreenshotEncoder
+from tracing import get_tracer
 
 class SystemController:
     def __init__(self):
         self.os_type = platform.system().lower()
         self.ensure_directories()
         
-        # Initialize Windows volume control interface
+        # The Windows volume interface is set up on the first volume command
         self._volume_interface = None
+        self._volume_initialized = False
+        
+        # Linux media keys go through one persistent D-Bus connection, opened on first use
+        self._media_controller = None
+        self._audio_controller = None
+        self._app_index = None
+        self._screenshot_encoder = None
+
+    @property
+    def volume_is_native(self) -> bool:
+        """Whether volume commands go through an already open in-process interface"""
         if self.os_type == 'windows':
-            self._initialize_volume()
+            return self._volume_interface is not None
+        return bool(self._audio_controller)
 
     def ensure_directories(self):
         os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
 
     def _initialize_volume(self):
         """Initialize Windows volume control interface"""
+        self._volume_initialized = True
         try:
+            import comtypes
+            from ctypes import cast, POINTER
             from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
             from comtypes import CLSCTX_ALL
             
@@ -49,23 +64,34 @@ class SystemController:
             self._volume_interface = None
 
     def get_system_info(self) -> Dict:
+        from telemetry import get_sampler
+        
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_total = self._bytes_to_gb(memory.total)
-            memory_available = self._bytes_to_gb(memory.available)
-            
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
-            disk_total = self._bytes_to_gb(disk.total)
-            disk_free = self._bytes_to_gb(disk.free)
+            # Answer from the background sampler's history; nothing is measured while the user waits
+            sampler = get_sampler()
+            if not sampler.wait_ready(sampler.interval):
+                return {
+                    'success': False,
+                    'summary': "I'm still gathering system statistics. Ask me again in a moment."
+                }
+            sample = sampler.latest()
+            facts = sampler.facts
+            trend = sampler.trend(TELEMETRY_TREND_SECONDS)
+            
+            cpu_percent = sample['cpu']
+            cpu_count = facts.get('cpu_cores')
+            memory_percent = sample['memory']
+            memory_total = self._bytes_to_gb(facts.get('memory_total', 0))
+            memory_available = self._bytes_to_gb(sample['memory_available'])
+            
+            disk_percent = sample['disk']
+            disk_total = self._bytes_to_gb(facts.get('disk_total', 0))
+            disk_free = self._bytes_to_gb(sample['disk_free'])
             
             system_info = {
-                'system': platform.system(),
-                'release': platform.release(),
-                'processor': platform.processor(),
+                'system': facts.get('system', platform.system()),
+                'release': facts.get('release', ''),
+                'processor': facts.get('processor', ''),
                 'cpu_cores': cpu_count,
                 'cpu_usage': f"{cpu_percent}%",
                 'memory_total': f"{memory_total:.1f} GB",
@@ -73,7 +99,11 @@ class SystemController:
                 'memory_available': f"{memory_available:.1f} GB",
                 'disk_total': f"{disk_total:.1f} GB",
                 'disk_used': f"{disk_percent:.1f}%",
-                'disk_free': f"{disk_free:.1f} GB"
+                'disk_free': f"{disk_free:.1f} GB",
+                'cpu_average': f"{trend['cpu']['average']:.1f}%",
+                'cpu_peak': f"{trend['cpu']['peak']:.1f}%",
+                'network_sent': f"{sample['net_sent'] / 1024:.1f} KB/s",
+                'network_received': f"{sample['net_recv'] / 1024:.1f} KB/s"
             }
             
             summary = f"System: {system_info['system']} {system_info['release']}. " \
@@ -81,6 +111,10 @@ class SystemController:
                      f"Memory usage: {system_info['memory_used']}, " \
                      f"Disk usage: {system_info['disk_used']}"
             
+            if trend['seconds'] >= 60:
+                summary += f". Over the last {trend['seconds'] / 60:.0f} minutes CPU averaged " \
+                           f"{system_info['cpu_average']} and peaked at {system_info['cpu_peak']}"
+            
             return {
                 'success': True,
                 'info': system_info,
@@ -94,10 +128,9 @@ class SystemController:
                 'summary': "I couldn't retrieve system information."
             }
 
-    def open_application(self, app_name: str) -> Dict:
-        try:
-            app_name = app_name.lower().strip()
-            
+    @property
+    def app_index(self) -> AppIndex:
+        if self._app_index is None:
             app_mappings = {
                 'notepad': 'notepad.exe' if self.os_type == 'windows' else 'gedit',
                 'calculator': 'calc.exe' if self.os_type == 'windows' else 'gnome-calculator',
@@ -114,17 +147,33 @@ class SystemController:
                 'excel': 'start excel' if self.os_type == 'windows' else 'libreoffice --calc',
                 'powerpoint': 'start powerpnt' if self.os_type == 'windows' else 'libreoffice --impress'
             }
+            self._app_index = AppIndex(aliases=app_mappings, windows=self.os_type == 'windows')
+        return self._app_index
+
+    def prepare_application(self, app_name: str) -> bool:
+        """Resolve an application name ahead of an expected "open" so the command itself is a lookup"""
+        return self.app_index.resolve(app_name.lower().strip()) is not None
+
+    def open_application(self, app_name: str) -> Dict:
+        try:
+            app_name = app_name.lower().strip()
             
-            command = app_mappings.get(app_name, app_name)
+            # Unknown names fail here instead of spawning a process that cannot start
+            entry = self.app_index.resolve(app_name)
+            if entry is None:
+                return {
+                    'success': False,
+                    'summary': f"I couldn't find an application called {app_name}."
+                }
             
-            if self.os_type == 'windows':
-                subprocess.Popen(command, shell=True)
+            if entry.shell:
+                subprocess.Popen(entry.command[0], shell=True)
             else:
-                subprocess.Popen(command.split(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.Popen(entry.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             
             return {
                 'success': True,
-                'summary': f"Opening {app_name}."
+                'summary': f"Opening {entry.name if entry.source == 'desktop' else app_name}."
             }
             
         except Exception as e:
@@ -135,9 +184,10 @@ class SystemController:
             }
 
     def close_application(self, app_name: str) -> Dict:
+        import psutil
+        
         try:
             app_name = app_name.lower().strip()
-            print(f"DEBUG: Trying to close app: '{app_name}'")
             
             app_keywords = {
                 'spotify': 'spotify',
@@ -162,28 +212,31 @@ class SystemController:
             }
             
             search_keyword = app_keywords.get(app_name, app_name)
-            print(f"DEBUG: Searching for processes containing: '{search_keyword}'")
             
             closed_processes = []
             found_processes = []
-            
-            for proc in psutil.process_iter():
-                try:
-                    proc_name = proc.name().lower()
-                    if search_keyword in proc_name:
-                        found_processes.append(proc.name())
-                        print(f"DEBUG: Found matching process: {proc.name()}")
-                        proc.terminate()
-                        closed_processes.append(proc.name())
-                        print(f"DEBUG: Successfully terminated: {proc.name()}")
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-                    print(f"DEBUG: Error with process {proc}: {e}")
-                    continue
-                except Exception as e:
-                    print(f"DEBUG: Unexpected error with process: {e}")
-                    continue
-            
-            print(f"DEBUG: Found {len(found_processes)} processes, closed {len(closed_processes)}")
+            index = get_process_index()
+            
+            with get_tracer().span('close_app.scan', app=app_name, keyword=search_keyword) as span:
+                for entry in index.find(search_keyword):
+                    try:
+                        found_processes.append(entry.name)
+                        # psutil refuses to signal a recycled PID, so a stale entry cannot hit the wrong process
+                        entry.process.terminate()
+                        closed_processes.append(entry.name)
+                        span.event('terminated', process=entry.name, pid=entry.pid)
+                    except psutil.NoSuchProcess as e:
+                        index.discard(entry.pid)
+                        span.event('gone', pid=entry.pid, error=str(e))
+                        continue
+                    except (psutil.AccessDenied, psutil.ZombieProcess) as e:
+                        span.event('denied', pid=entry.pid, error=str(e))
+                        continue
+                    except Exception as e:
+                        span.event('error', pid=entry.pid, error=str(e))
+                        continue
+                
+                span.set(found=len(found_processes), closed=len(closed_processes))
             
             if closed_processes:
                 unique_closed = list(set(closed_processes))
@@ -203,7 +256,6 @@ class SystemController:
                 }
                 
         except Exception as e:
-            print(f"DEBUG: Exception in close_application: {str(e)}")
             return {
                 'success': False,
                 'error': str(e),
@@ -233,7 +285,7 @@ class SystemController:
 
     def _control_spotify_windows(self, action: str, query: str = "") -> Dict:
         try:
-            spotify_running = any('spotify' in proc.name().lower() for proc in psutil.process_iter(['name']))
+            spotify_running = get_process_index().is_running('spotify')
             
             if not spotify_running and action not in ['search_and_play', 'play']:
                 return {
@@ -294,19 +346,19 @@ class SystemController:
             
             try:
                 if action in ['play', 'pause']:
-                    subprocess.run(['nircmd', 'sendkeypress', 'media_play_pause'], check=True, capture_output=True)
+                    subprocess.run(['nircmd', 'sendkeypress', 'media_play_pause'], check=True, capture_output=True, timeout=5)
                     action_text = "Playing" if action == 'play' else "Pausing"
                     return {'success': True, 'summary': f"{action_text} Spotify."}
                     
                 elif action == 'next':
-                    subprocess.run(['nircmd', 'sendkeypress', 'media_next'], check=True, capture_output=True)
+                    subprocess.run(['nircmd', 'sendkeypress', 'media_next'], check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Skipped to next track."}
                     
                 elif action == 'previous':
-                    subprocess.run(['nircmd', 'sendkeypress', 'media_prev'], check=True, capture_output=True)
+                    subprocess.run(['nircmd', 'sendkeypress', 'media_prev'], check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Went to previous track."}
                     
-            except (subprocess.CalledProcessError, FileNotFoundError):
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
                 pass
             
             if self._focus_spotify_and_send_keys(action):
@@ -323,7 +375,7 @@ class SystemController:
                     return {'success': False, 'summary': "What would you like me to search for on Spotify?"}
                     
                 spotify_search_url = f"spotify:search:{query.replace(' ', '%20')}"
-                subprocess.run(['start', '', spotify_search_url], shell=True)
+                subprocess.run(['start', '', spotify_search_url], shell=True, timeout=5)
                 return {'success': True, 'summary': f"Opening Spotify and searching for '{query}'."}
             
             return {
@@ -368,7 +420,58 @@ class SystemController:
         
         return False
 
+    def prepare_media(self) -> bool:
+        """Open the media player connection ahead of an expected playback command"""
+        if self.os_type != 'linux':
+            return False
+        from media_control import MprisController
+        
+        try:
+            if self._media_controller is None:
+                self._media_controller = MprisController()
+            self._media_controller.status()
+            return True
+        except Exception:
+            # Player not running or no session bus; the command reports that itself
+            return False
+
+    def _control_spotify_mpris(self, action: str) -> Optional[Dict]:
+        """Send a playback command over the shared bus connection; None means fall back to dbus-send"""
+        from media_control import MediaPlayerUnavailable, MprisController
+        
+        try:
+            if self._media_controller is None:
+                self._media_controller = MprisController()
+            controller = self._media_controller
+            
+            if action == 'pause' and controller.status() == 'Paused':
+                return {'success': True, 'summary': "Spotify is already paused."}
+            
+            controller.send(action)
+            
+        except MediaPlayerUnavailable:
+            return {
+                'success': False,
+                'summary': "Spotify is not running or dbus control is not available."
+            }
+        except Exception as e:
+            print(f"⚠️ MPRIS control unavailable ({e}), falling back to dbus-send")
+            return None
+        
+        summaries = {
+            'play': "Playing Spotify.",
+            'pause': "Paused Spotify.",
+            'next': "Skipped to next track.",
+            'previous': "Went to previous track."
+        }
+        return {'success': True, 'summary': summaries[action]}
+
     def _control_spotify_linux(self, action: str, query: str = "") -> Dict:
+        if action in ('play', 'pause', 'next', 'previous'):
+            result = self._control_spotify_mpris(action)
+            if result is not None:
+                return result
+        
         try:
             spotify_service = "org.mpris.MediaPlayer2.spotify"
             player_interface = f"{spotify_service}/org/mpris/MediaPlayer2/Player"
@@ -376,25 +479,25 @@ class SystemController:
             if action == 'play':
                 subprocess.run(['dbus-send', '--print-reply', '--dest=' + spotify_service,
                                player_interface, 'org.mpris.MediaPlayer2.Player.Play'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Playing Spotify."}
                 
             elif action == 'pause':
                 subprocess.run(['dbus-send', '--print-reply', '--dest=' + spotify_service,
                                player_interface, 'org.mpris.MediaPlayer2.Player.Pause'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Paused Spotify."}
                 
             elif action == 'next':
                 subprocess.run(['dbus-send', '--print-reply', '--dest=' + spotify_service,
                                player_interface, 'org.mpris.MediaPlayer2.Player.Next'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Skipped to next track."}
                 
             elif action == 'previous':
                 subprocess.run(['dbus-send', '--print-reply', '--dest=' + spotify_service,
                                player_interface, 'org.mpris.MediaPlayer2.Player.Previous'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Went to previous track."}
                 
             elif action == 'search_and_play':
@@ -408,7 +511,7 @@ class SystemController:
             else:
                 return {'success': False, 'summary': f"Unknown Spotify action: {action}"}
                 
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return {
                 'success': False,
                 'summary': "Spotify is not running or dbus control is not available."
@@ -425,22 +528,22 @@ class SystemController:
         try:
             if action == 'play':
                 subprocess.run(['osascript', '-e', 'tell application "Spotify" to play'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Playing Spotify."}
                 
             elif action == 'pause':
                 subprocess.run(['osascript', '-e', 'tell application "Spotify" to pause'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Paused Spotify."}
                 
             elif action == 'next':
                 subprocess.run(['osascript', '-e', 'tell application "Spotify" to next track'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Skipped to next track."}
                 
             elif action == 'previous':
                 subprocess.run(['osascript', '-e', 'tell application "Spotify" to previous track'],
-                               capture_output=True, check=True)
+                               capture_output=True, check=True, timeout=5)
                 return {'success': True, 'summary': "Went to previous track."}
                 
             elif action == 'search_and_play':
@@ -448,13 +551,13 @@ class SystemController:
                     return {'success': False, 'summary': "What would you like me to search for on Spotify?"}
                     
                 spotify_search_url = f"spotify:search:{query.replace(' ', '%20')}"
-                subprocess.run(['open', spotify_search_url])
+                subprocess.run(['open', spotify_search_url], timeout=5)
                 return {'success': True, 'summary': f"Searching for '{query}' on Spotify."}
                 
             else:
                 return {'success': False, 'summary': f"Unknown Spotify action: {action}"}
                 
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             return {
                 'success': False,
                 'summary': "Spotify is not running or AppleScript control failed."
@@ -469,17 +572,23 @@ class SystemController:
 
     def take_screenshot(self) -> Dict:
         try:
+            from PIL import ImageGrab
+            
+            if self._screenshot_encoder is None:
+                self._screenshot_encoder = ScreenshotEncoder()
+            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"screenshot_{timestamp}.png"
+            filename = f"screenshot_{timestamp}.{self._screenshot_encoder.extension}"
             filepath = os.path.join(SCREENSHOTS_DIR, filename)
             
+            # Only the grab happens here; scaling and encoding run on the encoder thread
             screenshot = ImageGrab.grab()
-            screenshot.save(filepath)
+            self._screenshot_encoder.submit(screenshot, filepath)
             
             return {
                 'success': True,
                 'filepath': filepath,
-                'summary': f"Screenshot saved as {filename}."
+                'summary': f"Screenshot taken, saving as {filename}."
             }
             
         except Exception as e:
@@ -513,6 +622,9 @@ class SystemController:
     def _control_volume_windows(self, action: str, level: Optional[int] = None) -> Dict:
         """FIXED Windows volume control with proper pycaw integration"""
         
+        if not self._volume_initialized:
+            self._initialize_volume()
+        
         # Method 1: Use pycaw (most reliable) - CORRECTED
         if self._volume_interface:
             try:
@@ -584,7 +696,7 @@ class SystemController:
                              check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': f"Volume set to {level}%."}
                 
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             print("NirCmd not available")
         except Exception as e:
             print(f"NirCmd error: {e}")
@@ -624,7 +736,7 @@ class SystemController:
                              check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': "Volume decreased."}
                 
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             print(f"PowerShell method failed: {e}")
         except Exception as e:
             print(f"PowerShell method error: {e}")
@@ -662,8 +774,70 @@ class SystemController:
             'summary': "Could not control volume. Try installing: pip install pycaw, or download nircmd.exe"
         }
 
+    def _control_volume_pulse(self, action: str, level: Optional[int] = None) -> Optional[Dict]:
+        """Change volume over a persistent PulseAudio/PipeWire connection; None means fall back to pactl/amixer"""
+        from audio_control import PulseVolumeController
+        
+        try:
+            if self._audio_controller is None:
+                self._audio_controller = PulseVolumeController()
+            controller = self._audio_controller
+            
+            if action == 'mute':
+                muted = controller.set_mute(None)
+                return {'success': True, 'summary': "Volume muted." if muted else "Volume unmuted."}
+            elif action == 'unmute':
+                controller.set_mute(False)
+                return {'success': True, 'summary': "Volume unmuted."}
+            elif action == 'up':
+                new_level = controller.change_volume(VOLUME_STEP)
+                return {'success': True, 'summary': f"Volume increased to {new_level}%."}
+            elif action == 'down':
+                new_level = controller.change_volume(-VOLUME_STEP)
+                return {'success': True, 'summary': f"Volume decreased to {new_level}%."}
+            elif action == 'set' and level is not None:
+                new_level = controller.set_volume(level)
+                return {'success': True, 'summary': f"Volume set to {new_level}%."}
+            return None
+            
+        except (ImportError, OSError) as e:
+            # pulsectl or libpulse is missing; don't try again on every command
+            print(f"⚠️ Native volume control unavailable ({e}), using pactl/amixer")
+            self._audio_controller = False
+            return None
+        except Exception as e:
+            print(f"⚠️ Native volume control failed ({e}), using pactl/amixer")
+            return None
+
+    def prepare_volume(self) -> bool:
+        """Open the native volume interface ahead of an expected volume command"""
+        if self.os_type == 'windows':
+            if not self._volume_initialized:
+                self._initialize_volume()
+            return self._volume_interface is not None
+        if self.os_type != 'linux' or self._audio_controller is False:
+            return False
+        
+        try:
+            from audio_control import PulseVolumeController
+            
+            if self._audio_controller is None:
+                self._audio_controller = PulseVolumeController()
+            self._audio_controller.get_volume()
+            return True
+        except (ImportError, OSError):
+            self._audio_controller = False
+            return False
+        except Exception:
+            return False
+
     def _control_volume_linux(self, action: str, level: Optional[int] = None) -> Dict:
         """Linux volume control using ALSA/PulseAudio"""
+        if self._audio_controller is not False:
+            result = self._control_volume_pulse(action, level)
+            if result is not None:
+                return result
+        
         try:
             # Try PulseAudio first
             if action == 'mute':
@@ -692,35 +866,35 @@ class SystemController:
                               check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': f"Volume set to {level}%."}
                 
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
             # Fallback to ALSA
             try:
                 if action == 'mute':
                     subprocess.run(['amixer', 'set', 'Master', 'toggle'],
-                                  check=True, capture_output=True)
+                                  check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Volume muted/unmuted."}
                     
                 elif action == 'unmute':
                     subprocess.run(['amixer', 'set', 'Master', 'unmute'],
-                                  check=True, capture_output=True)
+                                  check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Volume unmuted."}
                     
                 elif action == 'up':
                     subprocess.run(['amixer', 'set', 'Master', '10%+'],
-                                  check=True, capture_output=True)
+                                  check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Volume increased."}
                     
                 elif action == 'down':
                     subprocess.run(['amixer', 'set', 'Master', '10%-'],
-                                  check=True, capture_output=True)
+                                  check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': "Volume decreased."}
                     
                 elif action == 'set' and level is not None:
                     subprocess.run(['amixer', 'set', 'Master', f'{level}%'],
-                                  check=True, capture_output=True)
+                                  check=True, capture_output=True, timeout=5)
                     return {'success': True, 'summary': f"Volume set to {level}%."}
                     
-            except subprocess.CalledProcessError:
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
                 pass
         
         return {'success': False, 'summary': "Linux volume control failed. Make sure alsa-utils or pulseaudio is installed."}
@@ -730,32 +904,32 @@ class SystemController:
         try:
             if action == 'mute':
                 subprocess.run(['osascript', '-e', 'set volume output muted true'],
-                              check=True, capture_output=True)
+                              check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': "Volume muted."}
                 
             elif action == 'unmute':
                 subprocess.run(['osascript', '-e', 'set volume output muted false'],
-                              check=True, capture_output=True)
+                              check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': "Volume unmuted."}
                 
             elif action == 'up':
                 subprocess.run(['osascript', '-e',
                                'set volume output volume (output volume of (get volume settings) + 10)'],
-                               check=True, capture_output=True)
+                               check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': "Volume increased."}
                 
             elif action == 'down':
                 subprocess.run(['osascript', '-e',
                                'set volume output volume (output volume of (get volume settings) - 10)'],
-                               check=True, capture_output=True)
+                               check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': "Volume decreased."}
                 
             elif action == 'set' and level is not None:
                 subprocess.run(['osascript', '-e', f'set volume output volume {level}'],
-                              check=True, capture_output=True)
+                              check=True, capture_output=True, timeout=5)
                 return {'success': True, 'summary': f"Volume set to {level}%."}
                 
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             return {'success': False, 'summary': f"macOS volume control failed: {e}"}
         
         return {'success': False, 'summary': "Invalid macOS volume action."}
@@ -783,18 +957,7 @@ class SystemController:
     def list_running_processes(self) -> Dict:
         """List all running processes"""
         try:
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    processes.append({
-                        'name': proc.info['name'],
-                        'pid': proc.info['pid'],
-                        'exe': proc.info['exe'] if proc.info['exe'] else 'N/A'
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            processes.sort(key=lambda x: x['name'].lower())
+            processes = get_process_index().processes()
             process_names = [p['name'] for p in processes]
             
             summary = f"Found {len(processes)} running processes. Some common ones: " + \
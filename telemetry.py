@@ -0,0 +1,168 @@
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+from config import TELEMETRY_INTERVAL, TELEMETRY_RETENTION
+
+class RingBuffer:
+    """Fixed-size circular buffer of floats backed by a flat array"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._data = array('d', [0.0]) * self.capacity
+        self._next = 0
+        self.count = 0
+
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last(self, n: Optional[int] = None) -> List[float]:
+        """The newest n values (all of them by default), oldest first"""
+        n = self.count if n is None else min(n, self.count)
+        start = (self._next - n) % self.capacity
+        if start + n <= self.capacity:
+            return self._data[start:start + n].tolist()
+        return self._data[start:].tolist() + self._data[:self._next].tolist()
+
+    def latest(self) -> Optional[float]:
+        return self._data[self._next - 1] if self.count else None
+
+class TelemetrySampler:
+    """Samples CPU, memory, disk and network usage on a background thread.
+
+    Readers get the most recent sample immediately instead of waiting on
+    psutil.cpu_percent(interval=1), plus averages and peaks over the
+    retained history. Facts that never change, such as core count and
+    totals, are read once on the sampling thread, so answering never
+    touches psutil in the foreground.
+    """
+
+    SERIES = ['timestamp', 'cpu', 'memory', 'disk', 'net_sent', 'net_recv', 'memory_available', 'disk_free']
+    # Long enough for the first CPU reading to mean something
+    FIRST_SAMPLE_DELAY = 0.5
+
+    def __init__(self, interval: float = TELEMETRY_INTERVAL, retention: float = TELEMETRY_RETENTION,
+                 disk_path: str = '/'):
+        self.interval = interval
+        self.disk_path = disk_path
+        capacity = int(retention / interval) + 1
+        self._series = {name: RingBuffer(capacity) for name in self.SERIES}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_net = None
+        self._ready = threading.Event()
+        self.facts: Dict = {}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first sample"""
+        return self._ready.wait(timeout)
+
+    def _collect_facts(self):
+        import platform
+        import psutil
+
+        self.facts = {
+            'system': platform.system(),
+            'release': platform.release(),
+            # On Linux this runs `uname -p`
+            'processor': platform.processor(),
+            'cpu_cores': psutil.cpu_count(),
+            'memory_total': psutil.virtual_memory().total,
+            'disk_total': psutil.disk_usage(self.disk_path).total
+        }
+
+    def _run(self):
+        import psutil
+
+        # The first cpu_percent call only sets the reference point
+        psutil.cpu_percent(interval=None)
+        try:
+            self._collect_facts()
+        except Exception as e:
+            print(f"⚠️ Reading system facts failed: {e}")
+        delay = min(self.interval, self.FIRST_SAMPLE_DELAY)
+        while not self._stop.wait(delay):
+            delay = self.interval
+            try:
+                self.sample()
+                self._ready.set()
+            except Exception as e:
+                print(f"⚠️ Telemetry sample failed: {e}")
+
+    def sample(self) -> Dict:
+        """Take one sample now; CPU usage covers the time since the previous sample"""
+        import psutil
+
+        now = time.time()
+        cpu = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        net = psutil.net_io_counters()
+
+        with self._lock:
+            sent_rate = recv_rate = 0.0
+            if self._last_net is not None:
+                last_time, last_sent, last_recv = self._last_net
+                elapsed = max(now - last_time, 1e-6)
+                sent_rate = (net.bytes_sent - last_sent) / elapsed
+                recv_rate = (net.bytes_recv - last_recv) / elapsed
+            self._last_net = (now, net.bytes_sent, net.bytes_recv)
+
+            values = {
+                'timestamp': now,
+                'cpu': cpu,
+                'memory': memory.percent,
+                'disk': disk.used / disk.total * 100,
+                'net_sent': sent_rate,
+                'net_recv': recv_rate,
+                'memory_available': memory.available,
+                'disk_free': disk.free
+            }
+            for name, value in values.items():
+                self._series[name].append(value)
+        return values
+
+    def latest(self) -> Optional[Dict]:
+        with self._lock:
+            if not self._series['timestamp'].count:
+                return None
+            return {name: series.latest() for name, series in self._series.items()}
+
+    def trend(self, seconds: float) -> Dict:
+        """Average and peak of each series over the last `seconds` of samples"""
+        with self._lock:
+            timestamps = self._series['timestamp'].last()
+            cutoff = time.time() - seconds
+            n = sum(1 for stamp in timestamps if stamp >= cutoff)
+            windows = {name: self._series[name].last(n) for name in ('cpu', 'memory', 'disk', 'net_sent', 'net_recv')}
+
+        result = {'samples': n, 'seconds': timestamps[-1] - timestamps[-n] if n else 0.0}
+        for name, values in windows.items():
+            result[name] = {
+                'average': sum(values) / len(values) if values else 0.0,
+                'peak': max(values) if values else 0.0
+            }
+        return result
+
+_sampler: Optional[TelemetrySampler] = None
+_sampler_lock = threading.Lock()
+
+def get_sampler() -> TelemetrySampler:
+    """The process-wide sampler, started on first use"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = TelemetrySampler()
+            _sampler.start()
+        return _sampler
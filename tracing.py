@@ -0,0 +1,315 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from config import ASSISTANT_NAME, TRACE_JSONL_PATH, TRACE_OTLP_ENDPOINT
+
+# Monotonic clocks have no epoch; exporters that need wall-clock time add this offset
+_WALL_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_current: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+class Span:
+    __slots__ = ('name', 'trace', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes', 'events')
+
+    def __init__(self, name: str, trace: 'Trace', parent_id: Optional[str] = None,
+                 start_ns: Optional[int] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes or {})
+        self.events: List[Dict] = []
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def event(self, name: str, **attributes):
+        self.events.append({'name': name, 'time_ns': time.perf_counter_ns(), 'attributes': attributes})
+
+    def end(self, end_ns: Optional[int] = None):
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns() if end_ns is None else end_ns
+            self.trace._span_ended(self)
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round(self.duration * 1000, 3),
+            'attributes': self.attributes,
+            'events': self.events
+        }
+
+class _NoopSpan:
+    """Stands in for a span when nothing is being traced"""
+
+    trace = None
+
+    def set(self, **attributes):
+        pass
+
+    def event(self, name: str, **attributes):
+        pass
+
+    def end(self, end_ns: Optional[int] = None):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class Trace:
+    """The spans of one command, from capture to the end of its spoken answer.
+
+    The trace is exported once its root span has ended and every hold has
+    been released; speech output takes a hold so TTS, which finishes after
+    dispatch returns, is still part of the command.
+    """
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Optional[Dict] = None):
+        self.tracer = tracer
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._holds = 0
+        self._done = False
+        self._lock = threading.Lock()
+        self.root = Span(name, self, attributes=attributes)
+
+    def hold(self):
+        with self._lock:
+            self._holds += 1
+
+    def release(self):
+        with self._lock:
+            self._holds -= 1
+        self._maybe_finish()
+
+    def discard(self):
+        """Drop the trace without exporting it, e.g. when nothing was heard"""
+        with self._lock:
+            self._done = True
+
+    def _span_ended(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+        if span is self.root:
+            self._maybe_finish()
+
+    def _maybe_finish(self):
+        with self._lock:
+            if self._done or self.root.end_ns is None or self._holds > 0:
+                return
+            self._done = True
+        self.tracer._export(self)
+
+class Tracer:
+    def __init__(self, exporters: Optional[List] = None):
+        self.exporters = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def start_trace(self, name: str, **attributes) -> Optional[Trace]:
+        """A new trace whose root span is running, or None when tracing is off"""
+        return Trace(self, name, attributes) if self.enabled else None
+
+    def current(self) -> Optional[Span]:
+        return _current.get()
+
+    @contextmanager
+    def activate(self, span: Optional[Span]):
+        """Make span the parent of spans opened in this block, e.g. on another pipeline thread"""
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            _current.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Child span of the current span; a no-op outside a traced command"""
+        parent = _current.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+
+        span = Span(name, parent.trace, parent.span_id, attributes=attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=repr(e))
+            raise
+        finally:
+            _current.reset(token)
+            span.end()
+
+    def record(self, name: str, start_ns: int, end_ns: int, parent: Optional[Span] = None, **attributes):
+        """Add an already finished child span to parent (default: the current span)"""
+        parent = parent if parent is not None else _current.get()
+        if parent is not None:
+            Span(name, parent.trace, parent.span_id, start_ns, attributes).end(end_ns)
+
+    def wrap(self, function):
+        """Bind function to the current trace context, for running it on another thread"""
+        return _bind(contextvars.copy_context(), function)
+
+    def _export(self, trace: Trace):
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception as e:
+                print(f"⚠️ Trace export failed: {e}")
+
+def _bind(context: contextvars.Context, function):
+    def run(*args, **kwargs):
+        return context.run(function, *args, **kwargs)
+    return run
+
+def _ordered(trace: Trace) -> List[tuple]:
+    """(depth, span) pairs depth-first from the root, children in start order"""
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in list(trace.spans):
+        children.setdefault(span.parent_id, []).append(span)
+
+    ordered = []
+
+    def visit(span: Span, depth: int):
+        ordered.append((depth, span))
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.start_ns):
+            visit(child, depth + 1)
+
+    visit(trace.root, 0)
+    return ordered
+
+class JsonlExporter:
+    """Appends every span as one JSON line"""
+
+    def __init__(self, path: str = TRACE_JSONL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, trace: Trace):
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for _, span in _ordered(trace))
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+def otlp_payload(trace: Trace, service_name: str = ASSISTANT_NAME) -> Dict:
+    """The trace as an OTLP/HTTP JSON ExportTraceServiceRequest"""
+    spans = []
+    for _, span in _ordered(trace):
+        entry = {
+            'traceId': trace.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start_ns + _WALL_OFFSET_NS),
+            'endTimeUnixNano': str(span.end_ns + _WALL_OFFSET_NS),
+            'attributes': _otlp_attributes(span.attributes),
+            'events': [{'name': event['name'], 'timeUnixNano': str(event['time_ns'] + _WALL_OFFSET_NS),
+                        'attributes': _otlp_attributes(event['attributes'])} for event in span.events]
+        }
+        if span.parent_id:
+            entry['parentSpanId'] = span.parent_id
+        if 'error' in span.attributes:
+            entry['status'] = {'code': 2, 'message': str(span.attributes['error'])}
+        spans.append(entry)
+
+    return {'resourceSpans': [{
+        'resource': {'attributes': _otlp_attributes({'service.name': service_name.lower()})},
+        'scopeSpans': [{'scope': {'name': 'tracing'}, 'spans': spans}]
+    }]}
+
+class OtlpExporter:
+    """Posts each finished trace to an OpenTelemetry collector's OTLP/HTTP JSON endpoint"""
+
+    def __init__(self, endpoint: str = TRACE_OTLP_ENDPOINT, timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, trace: Trace):
+        # Posting can be slow; the trace is finished, so do it off the command's thread
+        threading.Thread(target=self._post, args=(otlp_payload(trace),), name='otlp-export', daemon=True).start()
+
+    def _post(self, payload: Dict):
+        from transport import get_transport
+
+        try:
+            response = get_transport().session.post(self.endpoint, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"⚠️ Couldn't send trace to {self.endpoint}: {e}")
+
+class WaterfallPrinter:
+    """Prints each command's spans as a latency waterfall"""
+
+    def __init__(self, width: int = 40):
+        self.width = width
+
+    def format(self, trace: Trace) -> str:
+        ordered = _ordered(trace)
+        # Speech usually ends after the root span, so scale to whichever finished last
+        finish = max(span.end_ns for _, span in ordered if span.end_ns is not None)
+        total = max(finish - trace.root.start_ns, 1)
+        command = trace.root.attributes.get('text', '')
+        lines = [f"🧭 {trace.root.name}{': ' + command if command else ''} ({total / 1e6:.1f}ms)"]
+        for depth, span in ordered:
+            end_ns = span.end_ns if span.end_ns is not None else trace.root.end_ns
+            offset = span.start_ns - trace.root.start_ns
+            start_col = min(self.width - 1, max(0, int(offset / total * self.width)))
+            length = max(1, int(round((end_ns - span.start_ns) / total * self.width)))
+            bar = ' ' * start_col + '█' * min(length, self.width - start_col)
+            label = '  ' * depth + span.name
+            lines.append(f"   {label:<28} {offset / 1e6:8.1f}ms {(end_ns - span.start_ns) / 1e6:8.1f}ms  |{bar:<{self.width}}|")
+        return "\n".join(lines)
+
+    def export(self, trace: Trace):
+        print(self.format(trace))
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, with the exporters configured in config.py"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters = []
+            if TRACE_JSONL_PATH:
+                exporters.append(JsonlExporter(TRACE_JSONL_PATH))
+            if TRACE_OTLP_ENDPOINT:
+                exporters.append(OtlpExporter(TRACE_OTLP_ENDPOINT))
+            _tracer = Tracer(exporters)
+        return _tracer
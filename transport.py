@@ -0,0 +1,112 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRIES, HTTP_BACKOFF,
+                    HTTP_WARMUP_HOSTS, SEARCH_BACKEND_TIMEOUT)
+
+# time.monotonic() by which requests made in the current context must be done
+_deadline: contextvars.ContextVar = contextvars.ContextVar('request_deadline', default=None)
+
+@contextmanager
+def request_deadline(deadline: float):
+    """Cap the timeout of requests made in this block, or on threads bound to its context, at deadline"""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+class HttpTransport:
+    """The one HTTP client every search, Wikipedia and RSS request goes through.
+
+    A single requests.Session with a sized connection pool keeps TLS
+    connections alive between commands, retries transient failures with
+    backoff, and can open connections to the known hosts ahead of time.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 retries: int = HTTP_RETRIES, backoff: float = HTTP_BACKOFF, timeout: float = SEARCH_BACKEND_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+
+        # Only failures that return quickly are retried: a read timeout has already spent the
+        # whole timeout, and a 429's Retry-After could exceed the search deadline many times over
+        retry = Retry(total=retries, connect=retries, read=0, status=retries, backoff_factor=backoff,
+                      status_forcelist=[502, 503, 504], allowed_methods=['GET', 'HEAD'],
+                      respect_retry_after_header=False, raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   max_retries=retry)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def get(self, url: str, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        deadline = _deadline.get()
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                import requests
+                raise requests.Timeout(f"Deadline passed before requesting {url}")
+            kwargs['timeout'] = remaining if kwargs['timeout'] is None else min(kwargs['timeout'], remaining)
+        return self.session.get(url, **kwargs)
+
+    def warmup(self, hosts: Optional[List[str]] = None, timeout: float = 3.0):
+        """Open a pooled connection to each host so the first real request skips DNS, TCP and TLS setup"""
+        for host in hosts if hosts is not None else HTTP_WARMUP_HOSTS:
+            url = host if '://' in host else f"https://{host}/"
+            try:
+                self.session.head(url, timeout=timeout, allow_redirects=False)
+            except Exception:
+                # Offline or slow host: the real request will simply connect itself
+                pass
+
+    def stats(self) -> Dict:
+        """Requests made vs connections opened, overall and per host"""
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{pool.host}:{pool.port}"] = {'requests': pool.num_requests, 'connections': pool.num_connections}
+
+        requests_made = sum(host['requests'] for host in hosts.values())
+        connections = sum(host['connections'] for host in hosts.values())
+        return {
+            'requests': requests_made,
+            'connections': connections,
+            'reused': max(0, requests_made - connections),
+            'reuse_rate': (requests_made - connections) / requests_made if requests_made else 0.0,
+            'hosts': hosts
+        }
+
+    def close(self):
+        self.session.close()
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> HttpTransport:
+    """The process-wide transport, created on first use"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
+
+def start_warmup():
+    """Create the transport and connect to the known hosts without blocking the caller"""
+    threading.Thread(target=lambda: get_transport().warmup(), name='http-warmup', daemon=True).start()
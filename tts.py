@@ -0,0 +1,192 @@
+import re
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+from config import TTS_RATE, TTS_VOLUME, TTS_VOICE_INDEX
+from tracing import get_tracer
+
+class TTSEngine:
+    """Interface for speech engines driven by SpeechOutput"""
+
+    def say(self, text: str):
+        """Speak one chunk of text, blocking until it finishes or stop() is called"""
+        raise NotImplementedError
+
+    def stop(self):
+        """Cut off the chunk being spoken, and any say() that starts before reset()"""
+        pass
+
+    def reset(self):
+        """Allow speaking again after stop(); called before the first chunk of each new utterance generation"""
+        pass
+
+class Pyttsx3Engine(TTSEngine):
+    def __init__(self):
+        # pyttsx3 is created on first use so it lives on the speech worker thread
+        self._engine = None
+        self._stopped = threading.Event()
+
+    def _get_engine(self):
+        if self._engine is None:
+            import pyttsx3
+
+            self._engine = pyttsx3.init()
+
+            voices = self._engine.getProperty('voices')
+            if voices and len(voices) > TTS_VOICE_INDEX:
+                self._engine.setProperty('voice', voices[TTS_VOICE_INDEX].id)
+
+            self._engine.setProperty('rate', TTS_RATE)
+            self._engine.setProperty('volume', TTS_VOLUME)
+
+        return self._engine
+
+    def say(self, text: str):
+        if self._stopped.is_set():
+            return
+        engine = self._get_engine()
+        engine.say(text)
+        engine.runAndWait()
+
+    def stop(self):
+        self._stopped.set()
+        if self._engine is not None:
+            self._engine.stop()
+
+    def reset(self):
+        self._stopped.clear()
+
+class FakeTTSEngine(TTSEngine):
+    """Audio-free engine that records chunks and simulates speaking time"""
+
+    def __init__(self, seconds_per_char: float = 0.0):
+        self.seconds_per_char = seconds_per_char
+        self.spoken: List[str] = []
+        self._stopped = threading.Event()
+
+    def say(self, text: str):
+        if self._stopped.is_set():
+            return
+        self.spoken.append(text)
+        if self.seconds_per_char:
+            self._stopped.wait(len(text) * self.seconds_per_char)
+
+    def stop(self):
+        self._stopped.set()
+
+    def reset(self):
+        self._stopped.clear()
+
+class SpeechOutput:
+    """Speaks queued text sentence by sentence on a dedicated worker thread"""
+
+    def __init__(self, engine: TTSEngine):
+        self.engine = engine
+        self._queue = queue.Queue()
+        self._generation = 0
+        self._spoken_generation = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+        # Called with the queueing delay whenever an utterance starts playing
+        self.on_speech_start: Optional[Callable[[float], None]] = None
+
+        self._worker = threading.Thread(target=self._run, name='speech-output', daemon=True)
+        self._worker.start()
+
+    def split_sentences(self, text: str) -> List[str]:
+        chunks = re.split(r'(?<=[.!?])\s+|\n+', text)
+        # Skip decorative lines such as "=====" that carry nothing to say
+        return [chunk.strip() for chunk in chunks if re.search(r'\w', chunk)]
+
+    def say(self, text: str, block: bool = False):
+        chunks = self.split_sentences(text)
+        if not chunks:
+            return
+
+        done = threading.Event()
+        # Speaking outlives the command's dispatch; hold its trace open until the last sentence
+        parent = get_tracer().current()
+        traced = None
+        if parent is not None:
+            parent.trace.hold()
+            traced = (parent, time.perf_counter_ns(), len(chunks))
+        with self._lock:
+            self._idle.clear()
+            generation = self._generation
+            queued_at = time.perf_counter()
+            for index, chunk in enumerate(chunks):
+                self._queue.put((generation, chunk, None, queued_at if index == 0 else None, None))
+            self._queue.put((generation, None, done, None, traced))
+
+        if block:
+            done.wait()
+
+    def interrupt(self):
+        """Drop everything queued and stop the sentence being spoken"""
+        with self._lock:
+            self._generation += 1
+            pending = []
+            while True:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # Under the lock, so it can't land after the next generation's reset()
+            self.engine.stop()
+
+        # Wake anyone blocked on an utterance that will now never be spoken
+        for _, _, done, _, traced in pending:
+            if done is not None:
+                done.set()
+            self._finish_trace(traced, interrupted=True)
+
+        self._update_idle()
+
+    def is_speaking(self) -> bool:
+        return not self._idle.is_set()
+
+    def wait_until_done(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+
+    def _update_idle(self):
+        with self._lock:
+            if self._queue.empty():
+                self._idle.set()
+
+    def _finish_trace(self, traced, interrupted: bool = False):
+        if traced is not None:
+            parent, queued_ns, chunks = traced
+            get_tracer().record('tts', queued_ns, time.perf_counter_ns(), parent=parent,
+                                sentences=chunks, interrupted=interrupted)
+            parent.trace.release()
+
+    def _run(self):
+        while True:
+            generation, chunk, done, queued_at, traced = self._queue.get()
+
+            if done is not None:
+                done.set()
+                self._finish_trace(traced, interrupted=generation != self._generation)
+                self._update_idle()
+                continue
+
+            with self._lock:
+                current = generation == self._generation
+                # Only the first chunk of a newer generation clears a stop; an interrupt() landing
+                # after this check bumps the generation and its stop() holds until the next one
+                if current and generation != self._spoken_generation:
+                    self._spoken_generation = generation
+                    self.engine.reset()
+
+            if current:
+                if queued_at is not None and self.on_speech_start:
+                    self.on_speech_start(time.perf_counter() - queued_at)
+                try:
+                    self.engine.say(chunk)
+                except Exception as e:
+                    print(f"⚠️ Speech output error: {e}")
+
+            self._update_idle()
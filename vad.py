@@ -0,0 +1,136 @@
+import collections
+from typing import Deque, Iterable, List, Optional
+import numpy as np
+from config import (VAD_FRAME_MS, VAD_HANGOVER_MS, VAD_MIN_SPEECH_MS, VAD_PREROLL_MS,
+                    VAD_THRESHOLD_DB, VAD_MAX_ZCR, VAD_MIN_FLOOR_DB)
+
+class VoiceActivityDetector:
+    """Frame-based speech detector using energy and zero-crossing rate.
+
+    The noise floor is tracked continuously: it falls quickly towards quieter
+    frames, follows non-speech frames with a moving average and creeps up
+    slowly during speech so a permanently louder room is learned too. It
+    never goes below min_floor_db, so a burst of digital silence can't make
+    ordinary room noise look like speech.
+    """
+
+    DROP_ALPHA = 0.3
+    FAST_ALPHA = 0.05
+    SLOW_ALPHA = 0.002
+
+    def __init__(self, sample_rate: int, sample_width: int = 2,
+                 threshold_db: float = VAD_THRESHOLD_DB, max_zcr: float = VAD_MAX_ZCR,
+                 min_floor_db: float = VAD_MIN_FLOOR_DB):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.threshold_db = threshold_db
+        self.max_zcr = max_zcr
+        self.min_floor_db = min_floor_db
+        self.noise_floor_db: Optional[float] = None
+
+    def frame_features(self, frame: bytes):
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return -100.0, 0.0
+
+        rms = np.sqrt(np.mean(samples * samples))
+        energy_db = 20.0 * np.log10(rms + 1e-9)
+        zcr = np.count_nonzero(np.diff(np.signbit(samples))) / samples.size
+        return float(energy_db), float(zcr)
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy_db, zcr = self.frame_features(frame)
+
+        level = max(energy_db, self.min_floor_db)
+        if self.noise_floor_db is None:
+            self.noise_floor_db = level
+
+        margin = energy_db - self.noise_floor_db
+        # High zero-crossing frames are hiss unless they are clearly loud (fricatives)
+        speech = margin > self.threshold_db and (zcr < self.max_zcr or margin > 2 * self.threshold_db)
+
+        if level < self.noise_floor_db:
+            self.noise_floor_db += self.DROP_ALPHA * (level - self.noise_floor_db)
+        elif not speech:
+            self.noise_floor_db += self.FAST_ALPHA * (level - self.noise_floor_db)
+        else:
+            self.noise_floor_db += self.SLOW_ALPHA * (level - self.noise_floor_db)
+
+        return speech
+
+class Endpointer:
+    """Finds where an utterance starts and ends in a stream of audio frames"""
+
+    def __init__(self, sample_rate: int, sample_width: int = 2, hangover_ms: int = VAD_HANGOVER_MS,
+                 min_speech_ms: int = VAD_MIN_SPEECH_MS, preroll_ms: int = VAD_PREROLL_MS,
+                 vad: Optional[VoiceActivityDetector] = None):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.hangover = hangover_ms / 1000.0
+        self.min_speech = min_speech_ms / 1000.0
+        self.preroll = preroll_ms / 1000.0
+        self.vad = vad or VoiceActivityDetector(sample_rate, sample_width)
+        self.reset()
+
+    def reset(self):
+        """Prepare for the next utterance, keeping the learned noise floor"""
+        self.in_speech = False
+        self.ended = False
+        self.elapsed = 0.0
+        self.speech_start: Optional[float] = None
+        self.last_speech: Optional[float] = None
+        self._speech_run = 0.0
+        self._silence_run = 0.0
+        self._preroll: Deque[bytes] = collections.deque()
+        self._preroll_seconds = 0.0
+        self.frames: List[bytes] = []
+
+    def frame_seconds(self, frame: bytes) -> float:
+        return len(frame) / (self.sample_width * self.sample_rate)
+
+    def process(self, frame: bytes) -> Optional[str]:
+        """Feed one frame; returns 'start' or 'end' when the utterance changes state"""
+        duration = self.frame_seconds(frame)
+        self.elapsed += duration
+        speech = self.vad.is_speech(frame)
+
+        if not self.in_speech:
+            self._preroll.append(frame)
+            self._preroll_seconds += duration
+            while self._preroll_seconds > self.preroll + self.min_speech and len(self._preroll) > 1:
+                self._preroll_seconds -= self.frame_seconds(self._preroll.popleft())
+
+            self._speech_run = self._speech_run + duration if speech else 0.0
+            if self._speech_run >= self.min_speech:
+                self.in_speech = True
+                self.speech_start = self.elapsed - self._speech_run
+                self.last_speech = self.elapsed
+                self.frames = list(self._preroll)
+                self._preroll.clear()
+                return 'start'
+            return None
+
+        self.frames.append(frame)
+        if speech:
+            self.last_speech = self.elapsed
+            self._silence_run = 0.0
+            return None
+
+        self._silence_run += duration
+        if self._silence_run >= self.hangover:
+            self.in_speech = False
+            self.ended = True
+            return 'end'
+        return None
+
+    def trailing_silence(self) -> float:
+        return self.elapsed - self.last_speech if self.last_speech is not None else 0.0
+
+    def audio(self) -> bytes:
+        return b''.join(self.frames)
+
+def split_frames(data: bytes, sample_rate: int, sample_width: int = 2,
+                 frame_ms: int = VAD_FRAME_MS) -> Iterable[bytes]:
+    size = int(sample_rate * frame_ms / 1000) * sample_width
+    for offset in range(0, len(data) - size + 1, size):
+        yield data[offset:offset + size]
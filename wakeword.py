@@ -0,0 +1,70 @@
+import json
+from typing import List, Optional
+import speech_recognition as sr
+from config import WAKE_WORD_PHRASES
+from recognizers import VoskRecognizer
+
+class WakeWordSession:
+    """Spots wake phrases in one utterance, fed frame by frame"""
+
+    def __init__(self, spotter: 'WakeWordSpotter', session):
+        self.spotter = spotter
+        self.session = session
+        self.transcript = ''
+
+    def accept(self, frame: bytes) -> Optional[str]:
+        if self.session.AcceptWaveform(frame):
+            self.transcript = (self.transcript + ' ' + json.loads(self.session.Result()).get('text', '')).strip()
+            return self.spotter.match(self.transcript)
+        partial = json.loads(self.session.PartialResult()).get('partial', '')
+        return self.spotter.match((self.transcript + ' ' + partial).strip())
+
+    def finish(self) -> Optional[str]:
+        self.transcript = (self.transcript + ' ' + json.loads(self.session.FinalResult()).get('text', '')).strip()
+        return self.spotter.match(self.transcript)
+
+    def has_command(self) -> bool:
+        """Whether anything besides the wake phrase was said in this utterance"""
+        wake = self.spotter.match(self.transcript) or ''
+        return len(self.transcript.split()) > len(wake.split())
+
+class WakeWordSpotter:
+    """On-device keyword spotter that gates the full recognizer.
+
+    Uses a Vosk recognizer restricted to the wake phrases plus "[unk]", which
+    is far cheaper than open-vocabulary recognition and never leaves the machine.
+    """
+
+    def __init__(self, backend: Optional[VoskRecognizer] = None, phrases: List[str] = WAKE_WORD_PHRASES):
+        self.backend = backend or VoskRecognizer()
+        self.phrases = sorted({phrase.lower() for phrase in phrases}, key=len, reverse=True)
+
+    def check_available(self):
+        """Load the model now; raises sr.RequestError if vosk or the model is missing"""
+        self.backend.new_session(grammar=self.phrases + ['[unk]'])
+
+    def match(self, transcript: str) -> Optional[str]:
+        padded = f" {transcript.lower()} "
+        for phrase in self.phrases:
+            if f" {phrase} " in padded:
+                return phrase
+        return None
+
+    def start(self, sample_rate: int) -> WakeWordSession:
+        return WakeWordSession(self, self.backend.new_session(sample_rate, grammar=self.phrases + ['[unk]']))
+
+def create_spotter(backend) -> Optional[WakeWordSpotter]:
+    """Build a spotter, sharing the Vosk model with the main recognizer when possible"""
+    vosk_backend = None
+    for candidate in (backend, getattr(backend, 'primary', None), getattr(backend, 'fallback', None)):
+        if isinstance(candidate, VoskRecognizer):
+            vosk_backend = candidate
+            break
+
+    spotter = WakeWordSpotter(vosk_backend)
+    try:
+        spotter.check_available()
+    except sr.RequestError as e:
+        print(f"⚠️ Wake word spotting unavailable ({e}); checking wake words after recognition instead")
+        return None
+    return spotter
@@ -1,37 +1,82 @@
-import requests
-from bs4 import BeautifulSoup
-import wikipedia
 import json
-from typing import List, Dict
-from config import MAX_SEARCH_RESULTS, SEARCH_SUMMARY_LENGTH
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional
+from config import (MAX_SEARCH_RESULTS, SEARCH_SUMMARY_LENGTH, SEARCH_CONCURRENT,
+                    SEARCH_DEADLINE, SEARCH_WORKERS, SEARCH_PARALLEL, CACHE_ENABLED)
+from cache import ResultCache
+from html_extract import parse_response
+from transport import get_transport, request_deadline
+from wikipedia_client import WikipediaClient
+from news_feed import get_news_feeds
+from tracing import get_tracer
+
+_search_pool: Optional[ThreadPoolExecutor] = None
+_search_pool_lock = threading.Lock()
+
+def get_search_pool() -> ThreadPoolExecutor:
+    """The process-wide pool concurrent searches run their backends on"""
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None:
+            _search_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='search')
+        return _search_pool
 
 class WebSearcher:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.transport = get_transport()
+        
+        self.cache = ResultCache() if CACHE_ENABLED else None
+        self.wikipedia = WikipediaClient(self.transport, self.cache)
+        self.news = get_news_feeds()
+    
+    def _cached(self, source: str, query: str, fetch) -> Dict:
+        """Serve a lookup from the answer cache, storing fresh successful results"""
+        if self.cache is None:
+            return fetch(query)
+        
+        result = self.cache.get(source, query)
+        if result is not None:
+            return result
+        
+        result = fetch(query)
+        if result.get('success'):
+            self.cache.put(source, query, result)
+        return result
+    
+    def cache_stats(self) -> Dict:
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def transport_stats(self) -> Dict:
+        return self.transport.stats()
     
     def search_web(self, query: str) -> Dict:
         """Primary web search function with multiple fallbacks"""
+        return self._cached('web', query, self._search_web)
+    
+    def _search_web(self, query: str) -> Dict:
+        if SEARCH_CONCURRENT:
+            return self._search_web_concurrent(query)
+        
         try:
             # Method 1: Try Bing Search API (more reliable)
-            result = self._bing_search(query)
+            result = self._attempt(self._bing_search, query)
             if result['success'] and result.get('summary'):
                 return result
                 
             # Method 2: Try DuckDuckGo Instant Answer
-            result = self._duckduckgo_search(query)
+            result = self._attempt(self._duckduckgo_search, query)
             if result['success'] and result.get('summary'):
                 return result
                 
             # Method 3: Try Google search scraping as fallback
-            result = self._google_search_fallback(query)
+            result = self._attempt(self._google_search_fallback, query)
             if result['success']:
                 return result
                 
             # Method 4: Try Wikipedia as last resort
-            return self._wikipedia_fallback(query)
+            return self._attempt(self._wikipedia_fallback, query)
             
         except Exception as e:
             return {
@@ -41,6 +86,92 @@ class WebSearcher:
                 'summary': f"I couldn't search for '{query}' right now. Please check your internet connection."
             }
     
+    def _attempt(self, backend, query: str) -> Dict:
+        """Run one search backend inside its own trace span"""
+        name = backend.__name__.strip('_').replace('_search', '').replace('_fallback', '')
+        with get_tracer().span(f"search.{name}", query=query) as span:
+            result = backend(query)
+            span.set(success=bool(result.get('success')), answered=bool(result.get('summary')))
+            return result
+    
+    def _search_backends(self):
+        """Search backends in priority order, with their acceptance check"""
+        return [
+            (self._bing_search, lambda r: r['success'] and r.get('summary')),
+            (self._duckduckgo_search, lambda r: r['success'] and r.get('summary')),
+            (self._google_search_fallback, lambda r: r['success']),
+            (self._wikipedia_fallback, lambda r: r['success'])
+        ]
+    
+    def _search_web_concurrent(self, query: str) -> Dict:
+        """Query the backends in parallel and return the best acceptable result in priority order"""
+        backends = self._search_backends()
+        deadline = time.monotonic() + SEARCH_DEADLINE
+        executor = get_search_pool()
+        
+        tracer = get_tracer()
+        futures = [None] * len(backends)
+        
+        def launch():
+            # Start backends in priority order while this search has fewer than SEARCH_PARALLEL running
+            running = sum(1 for future in futures if future is not None and not future.done())
+            for index, (backend, _) in enumerate(backends):
+                if running >= SEARCH_PARALLEL:
+                    break
+                if futures[index] is None:
+                    # Every request the backend makes is cut off at the deadline, so an
+                    # abandoned backend hands its worker back when the search gives up on it
+                    with request_deadline(deadline):
+                        futures[index] = executor.submit(tracer.wrap(self._attempt), backend, query)
+                    running += 1
+        
+        try:
+            launch()
+            
+            # Walk the backends in priority order: a result is only returned once
+            # every higher-priority backend has finished without an acceptable answer
+            for index, (_, accept) in enumerate(backends):
+                while futures[index] is None or not futures[index].done():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    running = {future for future in futures if future is not None and not future.done()}
+                    wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                    launch()
+                
+                future = futures[index]
+                if future is None or not future.done():
+                    break
+                
+                result = self._future_result(future)
+                if result and accept(result):
+                    return result
+            
+            # Deadline reached: settle for the best answer that has already arrived
+            for future, (_, accept) in zip(futures, backends):
+                if future is not None and future.done():
+                    result = self._future_result(future)
+                    if result and accept(result):
+                        return result
+                
+        finally:
+            for future in futures:
+                if future is not None:
+                    future.cancel()
+        
+        return {
+            'success': False,
+            'error': 'No information found',
+            'query': query,
+            'summary': f"I couldn't find reliable information about '{query}'. Please try rephrasing your search."
+        }
+    
+    def _future_result(self, future) -> Dict:
+        try:
+            return future.result()
+        except Exception:
+            return {}
+    
     def _bing_search(self, query: str) -> Dict:
         """Try Bing search using their web interface"""
         try:
@@ -51,21 +182,18 @@ class WebSearcher:
                 'setlang': 'en'
             }
             
-            response = self.session.get(url, params=params, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.transport.get(url, params=params)
+            page = parse_response('bing', response)
             
             results = []
             
             # Look for search results
-            for result in soup.find_all('li', class_='b_algo')[:MAX_SEARCH_RESULTS]:
+            for result in page.nodes('results')[:MAX_SEARCH_RESULTS]:
                 try:
-                    title_elem = result.find('h2')
-                    snippet_elem = result.find('p')
+                    title = page.text('title', result)
+                    snippet = page.text('snippet', result)
                     
-                    if title_elem and snippet_elem:
-                        title = title_elem.get_text().strip()
-                        snippet = snippet_elem.get_text().strip()
-                        
+                    if title is not None and snippet is not None:
                         results.append({
                             'title': title,
                             'snippet': self._truncate_text(snippet, 100)
@@ -74,9 +202,8 @@ class WebSearcher:
                     continue
             
             # Look for answer box or featured snippet
-            answer_box = soup.find('div', class_='b_rs')
-            if answer_box:
-                answer_text = answer_box.get_text().strip()
+            answer_text = page.text('answer')
+            if answer_text is not None:
                 if answer_text:
                     return {
                         'success': True,
@@ -112,7 +239,7 @@ class WebSearcher:
                 'skip_disambig': '1'
             }
             
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.transport.get(url, params=params)
             data = response.json()
             
             result = {
@@ -157,18 +284,14 @@ class WebSearcher:
         try:
             url = f"https://www.google.com/search"
             params = {'q': query, 'num': MAX_SEARCH_RESULTS}
-            response = self.session.get(url, params=params, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.transport.get(url, params=params)
+            page = parse_response('google', response)
             
             results = []
             
             # Look for featured snippet first
-            featured_snippet = soup.find('div', {'data-attrid': 'wa:/description'})
-            if not featured_snippet:
-                featured_snippet = soup.find('span', {'data-tts': 'answers'})
-            
-            if featured_snippet:
-                snippet_text = featured_snippet.get_text().strip()
+            snippet_text = page.text('featured')
+            if snippet_text is not None:
                 if snippet_text:
                     return {
                         'success': True,
@@ -179,11 +302,11 @@ class WebSearcher:
                     }
             
             # Look for regular search results
-            search_results = soup.find_all(['div', 'span'], class_=['BNeawe', 'VwiC3b'])
+            search_results = page.nodes('results')
             
             current_title = None
             for elem in search_results:
-                text = elem.get_text().strip()
+                text = page.node_text(elem)
                 if not text:
                     continue
                     
@@ -218,30 +341,18 @@ class WebSearcher:
     def _wikipedia_fallback(self, query: str) -> Dict:
         """Use Wikipedia as final fallback"""
         try:
-            wikipedia.set_lang("en")
-            summary = wikipedia.summary(query, sentences=2)
-            
-            return {
-                'success': True,
-                'query': query,
-                'abstract': summary,
-                'sources': [{'title': 'Wikipedia', 'snippet': summary}],
-                'summary': self._truncate_text(summary, SEARCH_SUMMARY_LENGTH)
-            }
-            
-        except wikipedia.exceptions.DisambiguationError as e:
-            try:
-                summary = wikipedia.summary(e.options[0], sentences=2)
+            article = self.wikipedia.lookup(query, sentences=2)
+            if article is not None:
+                summary = article['extract']
                 return {
                     'success': True,
                     'query': query,
                     'abstract': summary,
-                    'sources': [{'title': f'Wikipedia - {e.options[0]}', 'snippet': summary}],
+                    'sources': [{'title': 'Wikipedia' if article['exact'] else f"Wikipedia - {article['title']}",
+                                 'snippet': summary}],
                     'summary': self._truncate_text(summary, SEARCH_SUMMARY_LENGTH)
                 }
-            except:
-                pass
-        except:
+        except Exception:
             pass
             
         return {
@@ -252,47 +363,30 @@ class WebSearcher:
     
     def search_wikipedia(self, query: str) -> Dict:
         """Dedicated Wikipedia search"""
+        return self._cached('wikipedia', query, self._search_wikipedia)
+    
+    def _search_wikipedia(self, query: str) -> Dict:
         try:
-            wikipedia.set_lang("en")
-            
-            summary = wikipedia.summary(query, sentences=3)
+            article = self.wikipedia.lookup(query, sentences=3)
+            if article is None:
+                return {
+                    'success': False,
+                    'error': 'Page not found',
+                    'summary': f"I couldn't find a Wikipedia page for '{query}'."
+                }
             
-            page = wikipedia.page(query)
-            url = page.url
+            summary = article['extract']
+            if not article['exact']:
+                summary = f"Found information about {article['title']}: {summary}"
             
             return {
                 'success': True,
                 'query': query,
                 'summary': summary,
-                'url': url,
+                'url': article['url'],
                 'source': 'Wikipedia'
             }
             
-        except wikipedia.exceptions.DisambiguationError as e:
-            try:
-                summary = wikipedia.summary(e.options[0], sentences=2)
-                page = wikipedia.page(e.options[0])
-                return {
-                    'success': True,
-                    'query': query,
-                    'summary': f"Found information about {e.options[0]}: {summary}",
-                    'url': page.url,
-                    'source': 'Wikipedia'
-                }
-            except:
-                return {
-                    'success': False,
-                    'error': 'Multiple topics found',
-                    'summary': f"I found multiple topics for '{query}'. Could you be more specific?"
-                }
-                
-        except wikipedia.exceptions.PageError:
-            return {
-                'success': False,
-                'error': 'Page not found',
-                'summary': f"I couldn't find a Wikipedia page for '{query}'."
-            }
-            
         except Exception as e:
             return {
                 'success': False,
@@ -301,29 +395,12 @@ class WebSearcher:
             }
     
     def get_news_headlines(self, topic: str = "technology") -> Dict:
-        """Get news headlines from RSS feeds"""
+        """Get news headlines from RSS feeds, normally already in memory"""
         try:
-            rss_feeds = {
-                'technology': 'https://feeds.bbci.co.uk/news/technology/rss.xml',
-                'science': 'https://feeds.bbci.co.uk/news/science_and_environment/rss.xml',
-                'business': 'https://feeds.bbci.co.uk/news/business/rss.xml',
-                'world': 'https://feeds.bbci.co.uk/news/world/rss.xml'
-            }
-            
-            feed_url = rss_feeds.get(topic.lower(), rss_feeds['technology'])
-            
-            response = self.session.get(feed_url, timeout=10)
-            soup = BeautifulSoup(response.content, 'xml')
-            
-            headlines = []
-            for item in soup.find_all('item')[:5]:
-                title = item.title.text if item.title else "No title"
-                description = item.description.text if item.description else ""
-                
-                headlines.append({
-                    'title': title,
-                    'description': self._truncate_text(description, 100)
-                })
+            headlines = [
+                {'title': item['title'], 'description': self._truncate_text(item['description'], 100)}
+                for item in self.news.headlines(topic)
+            ]
             
             if headlines:
                 summary = f"Here are the latest {topic} headlines: " + \
@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+from config import WIKIPEDIA_API, WIKIPEDIA_CANDIDATES
+
+class WikipediaClient:
+    """Wikipedia article lookups in a single MediaWiki API request.
+
+    A search generator feeds the top candidate titles straight into the
+    extracts, info and pageprops modules, so one response holds the intro
+    text, canonical URL and disambiguation flag of every candidate. The
+    best-ranked real article wins; found articles go in the answer cache.
+    """
+
+    def __init__(self, transport=None, cache=None, api_url: str = WIKIPEDIA_API,
+                 candidates: int = WIKIPEDIA_CANDIDATES):
+        if transport is None:
+            from transport import get_transport
+
+            transport = get_transport()
+        self.transport = transport
+        self.cache = cache
+        self.api_url = api_url
+        self.candidates = candidates
+        self.requests = 0
+
+    def _query(self, query: str, sentences: int) -> List[Dict]:
+        """Candidate pages for query, in search rank order"""
+        self.requests += 1
+        response = self.transport.get(self.api_url, params={
+            'action': 'query', 'format': 'json', 'formatversion': 2,
+            'generator': 'search', 'gsrsearch': query, 'gsrlimit': self.candidates,
+            'prop': 'extracts|info|pageprops', 'exintro': 1, 'explaintext': 1,
+            'exsentences': sentences, 'exlimit': 'max',
+            'inprop': 'url', 'ppprop': 'disambiguation', 'redirects': 1
+        })
+        response.raise_for_status()
+        pages = response.json().get('query', {}).get('pages', [])
+        # Generator results come back keyed by page, not rank; 'index' is the search position
+        return sorted(pages, key=lambda page: page.get('index', len(pages)))
+
+    def lookup(self, query: str, sentences: int = 3) -> Optional[Dict]:
+        """Best article for query as {'title', 'extract', 'url', 'exact', 'candidates'}, or None"""
+        cache_key = f"{sentences} {query}"
+        if self.cache is not None:
+            cached = self.cache.get('wikipedia_article', cache_key)
+            if cached is not None:
+                return cached
+
+        pages = self._query(query, sentences)
+        article = None
+        for rank, page in enumerate(pages):
+            if page.get('missing') or 'disambiguation' in page.get('pageprops', {}):
+                continue
+            if page.get('extract'):
+                article = {
+                    'title': page['title'],
+                    'extract': page['extract'].strip(),
+                    'url': page.get('fullurl'),
+                    'exact': rank == 0,
+                    'candidates': [p['title'] for p in pages]
+                }
+                break
+
+        if article is not None and self.cache is not None:
+            self.cache.put('wikipedia_article', cache_key, article)
+        return article